@@ -0,0 +1,86 @@
+"""
+Description: Compare validation time with and without flattened schemas
+
+Validates every v1.0.0 and v1.1.0 item in `tests/test_data` against its core and
+extension schemas, once resolving `$ref`s through the registry, once against the
+flattened schemas and once with the compiled engine. Schemas are fetched (and validators compiled) before timing,
+so only validation itself is measured. Requires network access on the first run.
+
+Usage: python benchmarks/flatten_benchmark.py [--rounds N]
+"""
+
+import argparse
+import glob
+import json
+import time
+from typing import Dict, List, Tuple
+
+from stac_validator.utilities import (
+    VALIDATOR_CACHE,
+    get_stac_type,
+    set_schema_addr,
+    validate_with_ref_resolver,
+)
+
+
+def load_items() -> List[Tuple[Dict, List[str]]]:
+    items = []
+    for path in sorted(glob.glob("tests/test_data/v1[01]0/*.json")):
+        with open(path) as f:
+            try:
+                content = json.load(f)
+            except ValueError:
+                continue
+        if not isinstance(content, dict) or "stac_version" not in content:
+            continue
+        if get_stac_type(content).lower() != "item":
+            continue
+        schemas = [set_schema_addr(content["stac_version"], "item")]
+        schemas += [
+            ext for ext in content.get("stac_extensions", []) if ext.startswith("http")
+        ]
+        items.append((content, schemas))
+    return items
+
+
+def run(
+    items: List[Tuple[Dict, List[str]]],
+    rounds: int,
+    flatten: bool,
+    engine: str = "jsonschema",
+) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content, schemas in items:
+            for schema in schemas:
+                try:
+                    validate_with_ref_resolver(
+                        schema, content, flatten=flatten, engine=engine
+                    )
+                except Exception:
+                    pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    items = load_items()
+    # Warm up: fetch schemas and build both kinds of validators
+    run(items, 1, flatten=False)
+    run(items, 1, flatten=True)
+    run(items, 1, flatten=False, engine="compiled")
+    print(f"{len(items)} items, {VALIDATOR_CACHE.info().currsize} validators")
+
+    resolved = run(items, args.rounds, flatten=False)
+    flattened = run(items, args.rounds, flatten=True)
+    compiled = run(items, args.rounds, flatten=False, engine="compiled")
+    print(f"resolving $refs: {resolved:.3f}s")
+    print(f"flattened:       {flattened:.3f}s ({resolved / flattened:.2f}x)")
+    print(f"compiled engine: {compiled:.3f}s ({resolved / compiled:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
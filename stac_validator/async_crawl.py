@@ -0,0 +1,133 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Dict, Optional
+
+import requests  # type: ignore
+
+from .request_scheduler import SCHEDULER
+from .utilities import fetch_and_parse_file, is_url
+
+# Maximum number of fetches in flight at once
+DEFAULT_CONCURRENCY = 100
+
+
+def run_coroutine(coroutine: Coroutine) -> Any:
+    """Run a coroutine to completion from synchronous code.
+
+    Uses `asyncio.run`, or a separate thread when called from a running event loop
+    (in a notebook for instance), where `asyncio.run` is not allowed.
+
+    Args:
+        coroutine (Coroutine): The coroutine to run.
+
+    Returns:
+        Any: The result of the coroutine.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+class AsyncFetcher:
+    """Fetches STAC objects concurrently over one pooled aiohttp session.
+
+    At most `concurrency` fetches are in flight at once, and the connections of the
+    session are reused across requests. Requests follow the per-host limits,
+    timeouts and `Retry-After` handling of the request scheduler. Local files are
+    read in the default executor. Failed requests raise the same `requests` exceptions as
+    `fetch_and_parse_file`, so errors are reported the same way by both engines.
+
+    Must be used as an async context manager. Requires the optional `aiohttp`
+    dependency (`pip install stac-validator[async]`).
+
+    Args:
+        headers (dict): HTTP headers to include in the requests.
+        concurrency (int): Maximum number of fetches in flight at once.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        self.headers = headers or {}
+        self.concurrency = concurrency
+        self._aiohttp: Any = None
+        self._session: Any = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        try:
+            import aiohttp  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "The async crawl engine requires aiohttp. "
+                "Install it with `pip install stac-validator[async]`."
+            ) from e
+        self._aiohttp = aiohttp
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=SCHEDULER.max_connections or 0,
+            ),
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=SCHEDULER.connect_timeout,
+                sock_read=SCHEDULER.read_timeout,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._session.close()
+
+    async def fetch(self, input_path: str) -> Dict:
+        """Fetch and parse a STAC object from a URL or local file.
+
+        Args:
+            input_path (str): URL or local path of the object.
+
+        Returns:
+            dict: The parsed object.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+            ValueError: If the response is not valid JSON.
+            OSError: If a local file cannot be read.
+        """
+        async with self._semaphore:  # type: ignore
+            if not is_url(input_path):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    None, fetch_and_parse_file, input_path
+                )
+            try:
+                attempt = 0
+                while True:
+                    attempt += 1
+                    await asyncio.sleep(SCHEDULER.delay(input_path))
+                    async with self._session.get(input_path) as response:
+                        body = await response.read()
+                        status, reason = response.status, response.reason
+                        wait = SCHEDULER.retry_delay(
+                            input_path, response.headers, status, attempt
+                        )
+                    if wait is None:
+                        break
+            except asyncio.TimeoutError as e:
+                raise requests.exceptions.Timeout(
+                    f"Request timed out for url: {input_path}"
+                ) from e
+            except self._aiohttp.ClientError as e:
+                raise requests.exceptions.ConnectionError(str(e)) from e
+        if status >= 400:
+            kind = "Client" if status < 500 else "Server"
+            raise requests.exceptions.HTTPError(
+                f"{status} {kind} Error: {reason} for url: {input_path}"
+            )
+        return json.loads(body)
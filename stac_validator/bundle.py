@@ -0,0 +1,290 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin
+
+from .utilities import (
+    fetch_and_parse_file,
+    fetch_schema_bytes,
+    get_schema_bundle,
+    get_stac_type,
+    is_url,
+    is_valid_url,
+    schema_refs,
+    set_schema_addr,
+    set_schema_bundle,
+)
+
+BUNDLE_MAGIC = b"STACBNDL\x01"
+_HEADER = struct.Struct("<Q")
+
+
+_load_lock = threading.Lock()
+
+
+def _file_identity(stat: os.stat_result) -> Tuple[int, int, int, int]:
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _bundle_key(uri: str) -> str:
+    """Normalise a schema URI for lookups in a bundle (drop the fragment)."""
+    return urldefrag(uri)[0]
+
+
+class SchemaBundle:
+    """Read-only, memory-mapped collection of schema documents.
+
+    A bundle file starts with `BUNDLE_MAGIC`, followed by the length of a JSON index
+    mapping each schema URI to the offset and length of its raw bytes, followed by the
+    index and the concatenated schema documents. Opening a bundle only parses the
+    index; each schema is sliced out of the memory map and parsed when it is first
+    requested.
+
+    Args:
+        path (str): Path to the bundle file.
+
+    Raises:
+        ValueError: If the file is not a schema bundle.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # The memory map keeps its own handle on the file
+        with open(path, "rb") as f:
+            self._identity = _file_identity(os.fstat(f.fileno()))
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Schema bundle is empty: {path}")
+        magic_end = len(BUNDLE_MAGIC)
+        header_end = magic_end + _HEADER.size
+        if self._mmap[:magic_end] != BUNDLE_MAGIC:
+            self.close()
+            raise ValueError(f"Not a stac-validator schema bundle: {path}")
+        (index_length,) = _HEADER.unpack(self._mmap[magic_end:header_end])
+        index_end = header_end + index_length
+        self._index: Dict[str, List[int]] = json.loads(self._mmap[header_end:index_end])
+        self._data_start = index_end
+
+    def __contains__(self, uri: str) -> bool:
+        return _bundle_key(uri) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def uris(self) -> List[str]:
+        """Return the URIs of every schema in the bundle."""
+        return list(self._index)
+
+    def get_bytes(self, uri: str) -> Optional[bytes]:
+        """Return the raw bytes of a schema, or None if it is not in the bundle.
+
+        Args:
+            uri (str): The URI of the schema.
+        """
+        location = self._index.get(_bundle_key(uri))
+        if location is None:
+            return None
+        offset, length = location
+        start = self._data_start + offset
+        end = start + length
+        return self._mmap[start:end]
+
+    def get(self, uri: str) -> Optional[Dict]:
+        """Return a parsed schema, or None if it is not in the bundle.
+
+        Args:
+            uri (str): The URI of the schema.
+        """
+        raw = self.get_bytes(uri)
+        return None if raw is None else json.loads(raw)
+
+    def is_current(self, path: str) -> bool:
+        """Return whether the bundle is the file currently at a path."""
+        try:
+            return _file_identity(os.stat(path)) == self._identity
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        """Release the memory map, which is otherwise released with the bundle."""
+        self._mmap.close()
+
+
+def write_schema_bundle(schemas: Dict[str, bytes], output: str) -> None:
+    """Write schema documents to a bundle file.
+
+    Args:
+        schemas (dict): Mapping of schema URI to the raw schema document.
+        output (str): Path of the bundle file to write.
+    """
+    index = {}
+    offset = 0
+    for uri, raw in schemas.items():
+        index[_bundle_key(uri)] = [offset, len(raw)]
+        offset += len(raw)
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+
+    tmp_output = f"{output}.tmp"
+    with open(tmp_output, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(_HEADER.pack(len(index_bytes)))
+        f.write(index_bytes)
+        for raw in schemas.values():
+            f.write(raw)
+    os.replace(tmp_output, output)
+
+
+def load_schema_bundle(path: str) -> SchemaBundle:
+    """Load a schema bundle and serve schemas from it instead of the network.
+
+    The bundle already loaded is kept if it is the same file. A replaced bundle is
+    not closed, since other threads may still be reading from it, and is released
+    once no longer used.
+
+    Args:
+        path (str): Path to the bundle file.
+
+    Returns:
+        SchemaBundle: The loaded bundle.
+    """
+    with _load_lock:
+        current = get_schema_bundle()
+        if current is not None and current.is_current(path):
+            return current
+        bundle = SchemaBundle(path)
+        set_schema_bundle(bundle)
+    return bundle
+
+
+def _extension_schema_uri(extension: str, version: str, stac_path: str) -> str:
+    """Return the schema URI for an entry of `stac_extensions`."""
+    if is_valid_url(extension) or os.path.isabs(extension):
+        return extension
+    if extension.endswith(".json"):
+        # Relative schema paths are resolved against the STAC file, as in validation
+        file_directory = os.path.dirname(os.path.abspath(stac_path))
+        return os.path.abspath(
+            os.path.realpath(os.path.join(file_directory, extension))
+        )
+    if extension == "proj":
+        extension = "projection"
+    if version == "1.0.0-beta.2":
+        version = "1.0.0-beta.1"
+    return f"https://cdn.staclint.com/v{version}/extension/{extension}.json"
+
+
+def _resolve_href(base: str, href: str) -> str:
+    """Resolve a link href against the location of the document containing it."""
+    if is_url(href):
+        return href
+    if is_url(base):
+        return urljoin(base, href)
+    return os.path.normpath(os.path.join(os.path.dirname(base), href))
+
+
+def _is_stac_object(content: Dict) -> bool:
+    return any(key in content for key in ("stac_version", "features", "collections"))
+
+
+def discover_schema_uris(
+    sources: List[str], headers: Optional[Dict] = None, max_depth: Optional[int] = None
+) -> List[str]:
+    """Find the core and extension schemas used by STAC objects.
+
+    Each source is either a STAC object (catalog, collection, item, item collection or
+    /collections response), whose child and item links are followed, or a schema URL,
+    which is included as is.
+
+    Args:
+        sources (List[str]): Paths or URLs of STAC objects or schemas.
+        headers (dict): HTTP headers to include in the requests.
+        max_depth (int): Maximum number of links to follow from each source.
+
+    Returns:
+        List[str]: The schema URIs, in discovery order.
+    """
+    schema_uris: Dict[str, None] = {}
+    for source in sources:
+        content = fetch_and_parse_file(source, headers)
+        if not _is_stac_object(content):
+            schema_uris[source] = None
+            continue
+
+        seen: Set[str] = {source}
+        stack: List[Tuple[str, Optional[Dict], int]] = [(source, content, 0)]
+        while stack:
+            path, stac_content, depth = stack.pop()
+            if stac_content is None:
+                stac_content = fetch_and_parse_file(path, headers)
+            objects = stac_content.get("features") or stac_content.get("collections")
+            for stac_object in objects or [stac_content]:
+                version = stac_object.get("stac_version", "")
+                if not version:
+                    continue
+                stac_type = get_stac_type(stac_object).lower()
+                schema_uris[set_schema_addr(version, stac_type)] = None
+                for extension in stac_object.get("stac_extensions") or []:
+                    schema_uris[_extension_schema_uri(extension, version, path)] = None
+
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for link in stac_content.get("links", []):
+                if link.get("rel") not in ("child", "item"):
+                    continue
+                href = _resolve_href(path, link["href"])
+                if href in seen:
+                    continue
+                seen.add(href)
+                stack.append((href, None, depth + 1))
+    return list(schema_uris)
+
+
+def resolve_schema_refs(schema_uris: List[str]) -> Dict[str, bytes]:
+    """Fetch schemas together with every schema they transitively `$ref`.
+
+    Args:
+        schema_uris (List[str]): URIs of the schemas to fetch.
+
+    Returns:
+        dict: Mapping of schema URI to the raw schema document.
+    """
+    schemas: Dict[str, bytes] = {}
+    pending = [_bundle_key(uri) for uri in schema_uris]
+    while pending:
+        uri = pending.pop()
+        if uri in schemas:
+            continue
+        raw = fetch_schema_bytes(uri)
+        schemas[uri] = raw
+        for ref in schema_refs(json.loads(raw), uri):
+            if ref and ref not in schemas:
+                pending.append(ref)
+    return schemas
+
+
+def build_schema_bundle(
+    sources: List[str],
+    output: str,
+    headers: Optional[Dict] = None,
+    max_depth: Optional[int] = None,
+) -> List[str]:
+    """Crawl STAC objects or schema URLs and write every schema they need to a bundle.
+
+    Args:
+        sources (List[str]): Paths or URLs of STAC objects or schemas.
+        output (str): Path of the bundle file to write.
+        headers (dict): HTTP headers to include in the requests.
+        max_depth (int): Maximum number of links to follow from each source.
+
+    Returns:
+        List[str]: The URIs of the bundled schemas.
+    """
+    schemas = resolve_schema_refs(
+        discover_schema_uris(sources, headers=headers, max_depth=max_depth)
+    )
+    write_schema_bundle(schemas, output)
+    return list(schemas)
@@ -0,0 +1,115 @@
+import collections
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, List, Tuple
+
+# Bumped when the saved state changes shape, so that older checkpoints are refused
+CHECKPOINT_FORMAT = 2
+
+# Seconds between two checkpoints of a crawl
+DEFAULT_CHECKPOINT_INTERVAL = 60
+
+
+class CrawlFrame:
+    """A catalog or collection of a recursive validation whose links are followed.
+
+    Args:
+        href (str): Path or URL of the catalog or collection.
+        links (Iterable[tuple]): The relation and path of its child and item links
+            that are still to be followed, in order.
+        valid (bool): Whether it and the children followed so far are valid.
+    """
+
+    __slots__ = ("href", "links", "valid")
+
+    def __init__(self, href: str, links: Iterable[Tuple[str, str]], valid: bool = True):
+        self.href = href
+        self.links = collections.deque(links)
+        self.valid = valid
+
+    def dump(self) -> Dict:
+        return {
+            "href": self.href,
+            "links": [list(link) for link in self.links],
+            "valid": self.valid,
+        }
+
+    @classmethod
+    def load(cls, data: Dict) -> "CrawlFrame":
+        return cls(data["href"], [tuple(link) for link in data["links"]], data["valid"])
+
+
+class CrawlCheckpoint:
+    """Saves the state of a recursive validation to a file at intervals.
+
+    The state holds the crawl frontier, as the stack of catalogs and collections
+    whose links are being followed with the links still to follow, the set of links
+    already visited and the results reported so far (with a JSON Lines log, their
+    counts and the size of the log), so that a crawl that stopped can continue
+    where it was.
+    Checkpoints are replaced atomically, so a crawl killed while saving one leaves
+    the previous checkpoint intact.
+
+    Args:
+        path (str): Path of the checkpoint file.
+        interval (float): Minimum number of seconds between two checkpoints.
+    """
+
+    def __init__(self, path: str, interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._saved_at = time.monotonic()
+
+    def due(self) -> bool:
+        """Return True if the last checkpoint is older than the interval."""
+        return time.monotonic() - self._saved_at >= self.interval
+
+    def save(self, state: Dict, frames: List[CrawlFrame]) -> None:
+        """Write a checkpoint.
+
+        Args:
+            state (dict): The state of the crawl besides its frontier.
+            frames (list): The frontier of the crawl, outermost frame first.
+        """
+        data = dict(
+            state,
+            format=CHECKPOINT_FORMAT,
+            frames=[frame.dump() for frame in frames],
+        )
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._saved_at = time.monotonic()
+
+    def load(self) -> Tuple[Dict, List[CrawlFrame]]:
+        """Read the last checkpoint.
+
+        Returns:
+            tuple: The state of the crawl and its frontier.
+
+        Raises:
+            FileNotFoundError: If there is no checkpoint.
+            ValueError: If the file is not a checkpoint of this version.
+        """
+        with open(self.path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("format") != CHECKPOINT_FORMAT:
+            raise ValueError(f"{self.path} is not a supported crawl checkpoint")
+        frames = [CrawlFrame.load(frame) for frame in data.pop("frames")]
+        return data, frames
+
+    def remove(self) -> None:
+        """Delete the checkpoint, once the crawl is complete."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
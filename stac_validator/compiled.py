@@ -0,0 +1,647 @@
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import tempfile
+from fractions import Fraction
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jsonschema import (  # type: ignore
+    Draft6Validator,
+    Draft7Validator,
+    Draft201909Validator,
+    Draft202012Validator,
+    validators,
+)
+
+from .flatten import flattened_schema_uri
+
+# Bump whenever the generated code changes, so stale compiled schemas are ignored
+COMPILER_VERSION = 1
+
+ENGINES = ("jsonschema", "compiled")
+
+# Secret key authenticating the generated code cached in a directory
+_KEY_FILE = "compiled.key"
+_KEY_SIZE = 32
+
+# Dialects whose keywords share the semantics the compiler implements
+_COMPILABLE_DIALECTS = (
+    Draft6Validator,
+    Draft7Validator,
+    Draft201909Validator,
+    Draft202012Validator,
+)
+# Keywords the compiler implements. Any other keyword known to the dialect makes the
+# schema node fall back to jsonschema, unknown keywords are ignored as jsonschema does
+_COMPILED_KEYWORDS = frozenset(
+    [
+        "$ref",
+        "additionalProperties",
+        "allOf",
+        "anyOf",
+        "const",
+        "contains",
+        "dependentRequired",
+        "dependentSchemas",
+        "enum",
+        "exclusiveMaximum",
+        "exclusiveMinimum",
+        "format",
+        "if",
+        "items",
+        "maxItems",
+        "maxLength",
+        "maxProperties",
+        "maximum",
+        "minItems",
+        "minLength",
+        "minProperties",
+        "minimum",
+        "multipleOf",
+        "not",
+        "oneOf",
+        "pattern",
+        "patternProperties",
+        "properties",
+        "propertyNames",
+        "required",
+        "type",
+        "uniqueItems",
+    ]
+)
+# Dialects in which `$ref` does not override its sibling keywords
+_SIBLING_REF_DIALECTS = (Draft201909Validator, Draft202012Validator)
+# Keywords that only take effect through another keyword (`if`, `contains`)
+_DEPENDENT_KEYWORDS = ("then", "else", "minContains", "maxContains")
+_TYPE_CHECKS = {
+    "array": "isinstance(data, list)",
+    "boolean": "isinstance(data, bool)",
+    "integer": (
+        "(isinstance(data, int) and not isinstance(data, bool)"
+        " or isinstance(data, float) and data.is_integer())"
+    ),
+    "null": "data is None",
+    "number": "(isinstance(data, (int, float)) and not isinstance(data, bool))",
+    "object": "isinstance(data, dict)",
+    "string": "isinstance(data, str)",
+}
+
+
+def _equal(one: Any, two: Any) -> bool:
+    """Compare JSON values the way JSON Schema does (`True` is not `1`)."""
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(_equal(a, b) for a, b in zip(one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(_equal(one[k], two[k]) for k in one)
+    if isinstance(one, bool) or isinstance(two, bool):
+        return False
+    return one == two
+
+
+def _unique(items: List) -> bool:
+    for following, item in enumerate(items, start=1):
+        for other in items[following:]:
+            if _equal(item, other):
+                return False
+    return True
+
+
+def _not_multiple(value: Any, divisor: Any) -> bool:
+    if isinstance(divisor, float):
+        quotient = value / divisor
+        try:
+            return int(quotient) != quotient
+        except OverflowError:
+            return (Fraction(value) / Fraction(divisor)).denominator != 1
+    return bool(value % divisor)
+
+
+def _dialect_class(dialect: str):
+    if not dialect:
+        return Draft202012Validator
+    return validators.validator_for({"$schema": dialect}, default=Draft202012Validator)
+
+
+def _fallback_schema(parent: str, node: Any) -> Dict:
+    wrapper: Dict[str, Any] = {"allOf": [node]}
+    if parent:
+        wrapper["$schema"] = parent
+    return wrapper
+
+
+class _Compiler:
+    """Generate the source of a Python module checking instances against a schema.
+
+    Every schema node becomes a function returning whether the instance is valid.
+    Nodes using keywords the compiler does not implement are delegated to
+    jsonschema through the `_fallbacks` list of the generated module.
+    """
+
+    def __init__(self, schema: Any, schema_path: str):
+        self.schema = schema
+        self.defs_prefix = f"{flattened_schema_uri(schema_path)}#/$defs/"
+        self.functions: List[List[str]] = []
+        self.constants: List[str] = []
+        self.fallbacks: List[Tuple[str, Any]] = []
+        self._names: Dict[Tuple[int, str], str] = {}
+
+    def compile(self) -> str:
+        root = self.function_for(self.schema, "", is_root=True)
+        lines = [f"# stac-validator compiled schema (compiler v{COMPILER_VERSION})"]
+        lines += self.constants
+        for function in self.functions:
+            lines.append("")
+            lines += function
+        lines += ["", f"validate = {root}", ""]
+        return "\n".join(lines)
+
+    def constant(self, expression: str) -> str:
+        name = f"_c{len(self.constants)}"
+        self.constants.append(f"{name} = {expression}")
+        return name
+
+    def fallback(self, node: Any, parent: str) -> str:
+        self.fallbacks.append((parent, node))
+        return f"_fallbacks[{len(self.fallbacks) - 1}]"
+
+    def function_for(self, node: Any, parent: str, is_root: bool = False) -> str:
+        """Return the name of the function checking a schema node.
+
+        As in jsonschema, the dialect of the parent (the validator descending into
+        the node) decides whether `$ref` siblings apply, and the node's own
+        `$schema` (defaulting to the parent's dialect) which keywords exist.
+        """
+        if node is True or node == {}:
+            return "_true"
+        if node is False:
+            return "_false"
+        if not isinstance(node, dict):
+            return self.fallback(node, parent)
+        key = (id(node), parent)
+        if key in self._names:
+            return self._names[key]
+
+        dialect = parent
+        if isinstance(node.get("$schema"), str):
+            if is_root:
+                # The root is validated by the Draft 2020-12 validator itself
+                node = {k: v for k, v in node.items() if k != "$schema"}
+            else:
+                dialect = node["$schema"]
+        cls = _dialect_class(dialect)
+        if "$ref" in node and _dialect_class(parent) not in _SIBLING_REF_DIALECTS:
+            # Up to draft 7, `$ref` overrides every sibling keyword
+            keywords = {"$ref": node["$ref"]}
+        else:
+            keywords = {
+                keyword: value
+                for keyword, value in node.items()
+                if keyword in cls.VALIDATORS or keyword in _DEPENDENT_KEYWORDS
+            }
+        if cls not in _COMPILABLE_DIALECTS or any(
+            keyword not in _COMPILED_KEYWORDS and keyword not in _DEPENDENT_KEYWORDS
+            for keyword in keywords
+        ):
+            name = self._names[key] = self.fallback(node, parent)
+            return name
+
+        name = self._names[key] = f"_v{len(self.functions)}"
+        function = [f"def {name}(data):"]
+        self.functions.append(function)
+        body = self.body(keywords, dialect)
+        if body is None:
+            # Recursive references may already call this function by name
+            body = [f"return {self.fallback(node, parent)}(data)"]
+        else:
+            body.append("return True")
+        function += [f"    {line}" for line in body]
+        return name
+
+    def body(self, node: Dict, dialect: str) -> Optional[List[str]]:
+        """Return the statements of a node's function, or None to fall back."""
+        lines: List[str] = []
+        groups: Dict[str, List[str]] = {
+            "string": [],
+            "number": [],
+            "object": [],
+            "array": [],
+        }
+
+        if "type" in node:
+            types = node["type"] if isinstance(node["type"], list) else [node["type"]]
+            if not all(t in _TYPE_CHECKS for t in types):
+                return None
+            checks = " or ".join(_TYPE_CHECKS[t] for t in types) or "False"
+            lines += [f"if not ({checks}):", "    return False"]
+
+        if "enum" in node:
+            values = node["enum"]
+            if not isinstance(values, list):
+                return None
+            if values and all(isinstance(v, str) for v in values):
+                choices = self.constant(f"frozenset({sorted(values)!r})")
+                check = f"isinstance(data, str) and data in {choices}"
+            else:
+                choices = self.constant(repr(values))
+                check = f"any(_equal(data, value) for value in {choices})"
+            lines += [f"if not ({check}):", "    return False"]
+        if "const" in node:
+            const = self.constant(repr(node["const"]))
+            if isinstance(node["const"], str):
+                lines += [f"if data != {const}:", "    return False"]
+            else:
+                lines += [f"if not _equal(data, {const}):", "    return False"]
+
+        if "$ref" in node:
+            ref = node["$ref"]
+            if not isinstance(ref, str) or not ref.startswith(self.defs_prefix):
+                return None
+            name = ref.partition(self.defs_prefix)[2]
+            definition = self.schema.get("$defs", {}).get(name)
+            if definition is None:
+                return None
+            target = self.function_for(definition, dialect)
+            lines += [f"if not {target}(data):", "    return False"]
+
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if keyword not in node:
+                continue
+            if not isinstance(node[keyword], list) or not node[keyword]:
+                return None
+            calls = [
+                f"{self.function_for(subschema, dialect)}(data)"
+                for subschema in node[keyword]
+            ]
+            if keyword == "allOf":
+                for call in calls:
+                    lines += [f"if not {call}:", "    return False"]
+            elif keyword == "anyOf":
+                lines += [f"if not ({' or '.join(calls)}):", "    return False"]
+            else:
+                lines += [f"if ({' + '.join(calls)}) != 1:", "    return False"]
+        if "not" in node:
+            call = f"{self.function_for(node['not'], dialect)}(data)"
+            lines += [f"if {call}:", "    return False"]
+        if "if" in node:
+            condition = f"{self.function_for(node['if'], dialect)}(data)"
+            then_call = (
+                f"{self.function_for(node['then'], dialect)}(data)"
+                if "then" in node
+                else "True"
+            )
+            else_call = (
+                f"{self.function_for(node['else'], dialect)}(data)"
+                if "else" in node
+                else "True"
+            )
+            lines += [
+                f"if not ({then_call} if {condition} else {else_call}):",
+                "    return False",
+            ]
+
+        string = groups["string"]
+        for keyword, operator in (("minLength", "<"), ("maxLength", ">")):
+            if keyword in node:
+                string += [
+                    f"if len(data) {operator} {node[keyword]!r}:",
+                    "    return False",
+                ]
+        if "pattern" in node:
+            if not isinstance(node["pattern"], str):
+                return None
+            pattern = self.constant(f"re.compile({node['pattern']!r})")
+            string += [f"if not {pattern}.search(data):", "    return False"]
+
+        number = groups["number"]
+        for keyword, operator in (
+            ("minimum", "<"),
+            ("maximum", ">"),
+            ("exclusiveMinimum", "<="),
+            ("exclusiveMaximum", ">="),
+        ):
+            if keyword in node:
+                value = node[keyword]
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return None
+                number += [f"if data {operator} {value!r}:", "    return False"]
+        if "multipleOf" in node:
+            number += [
+                f"if _not_multiple(data, {node['multipleOf']!r}):",
+                "    return False",
+            ]
+
+        obj = groups["object"]
+        required = node.get("required", [])
+        if not isinstance(required, list) or not all(
+            isinstance(node.get(keyword, {}), dict)
+            for keyword in (
+                "properties",
+                "patternProperties",
+                "dependentRequired",
+                "dependentSchemas",
+            )
+        ):
+            return None
+        if required:
+            missing = " or ".join(f"{name!r} not in data" for name in required)
+            obj += [f"if {missing}:", "    return False"]
+        for keyword, operator in (("minProperties", "<"), ("maxProperties", ">")):
+            if keyword in node:
+                obj += [
+                    f"if len(data) {operator} {node[keyword]!r}:",
+                    "    return False",
+                ]
+        properties = node.get("properties", {})
+        for name, subschema in properties.items():
+            check = self.function_for(subschema, dialect)
+            if check == "_true":
+                continue
+            obj += [
+                f"if {name!r} in data and not {check}(data[{name!r}]):",
+                "    return False",
+            ]
+        patterns = []
+        for pattern, subschema in node.get("patternProperties", {}).items():
+            regex = self.constant(f"re.compile({pattern!r})")
+            patterns.append(regex)
+            check = self.function_for(subschema, dialect)
+            if check != "_true":
+                obj += [
+                    "for key, value in data.items():",
+                    f"    if {regex}.search(key) and not {check}(value):",
+                    "        return False",
+                ]
+        if "additionalProperties" in node:
+            check = self.function_for(node["additionalProperties"], dialect)
+            if check != "_true":
+                known = self.constant(f"frozenset({sorted(properties)!r})")
+                conditions = [f"key not in {known}"]
+                conditions += [f"not {regex}.search(key)" for regex in patterns]
+                if check != "_false":
+                    conditions.append(f"not {check}(value)")
+                obj += [
+                    "for key, value in data.items():",
+                    f"    if {' and '.join(conditions)}:",
+                    "        return False",
+                ]
+        if "propertyNames" in node:
+            check = self.function_for(node["propertyNames"], dialect)
+            obj += [
+                "for key in data:",
+                f"    if not {check}(key):",
+                "        return False",
+            ]
+        for name, names in node.get("dependentRequired", {}).items():
+            missing = " or ".join(f"{other!r} not in data" for other in names)
+            if missing:
+                obj += [f"if {name!r} in data and ({missing}):", "    return False"]
+        for name, subschema in node.get("dependentSchemas", {}).items():
+            check = self.function_for(subschema, dialect)
+            obj += [f"if {name!r} in data and not {check}(data):", "    return False"]
+
+        array = groups["array"]
+        if "items" in node:
+            if isinstance(node["items"], list):
+                return None
+            check = self.function_for(node["items"], dialect)
+            if check != "_true":
+                array += [
+                    "for item in data:",
+                    f"    if not {check}(item):",
+                    "        return False",
+                ]
+        for keyword, operator in (("minItems", "<"), ("maxItems", ">")):
+            if keyword in node:
+                array += [
+                    f"if len(data) {operator} {node[keyword]!r}:",
+                    "    return False",
+                ]
+        if node.get("uniqueItems") is True:
+            array += ["if not _unique(data):", "    return False"]
+        if "contains" in node:
+            if "minContains" in node or "maxContains" in node:
+                return None
+            check = self.function_for(node["contains"], dialect)
+            array += [
+                f"if not any({check}(item) for item in data):",
+                "    return False",
+            ]
+
+        for group, statements in groups.items():
+            if statements:
+                guard = _TYPE_CHECKS["number" if group == "number" else group]
+                lines += [f"if {guard}:"] + [f"    {line}" for line in statements]
+        return lines
+
+
+def compile_schema_source(schema: Dict, schema_path: str) -> Tuple[str, List]:
+    """Generate Python source code checking instances against a schema.
+
+    Args:
+        schema (dict): The schema to compile, ideally in flattened form (see
+            `flatten.flatten_schema`), since only `$ref`s into its flattened `$defs`
+            are compiled.
+        schema_path (str): Path or URI the schema was loaded from.
+
+    Returns:
+        tuple: The module source, defining a `validate(data) -> bool` function, and
+            the (parent dialect, sub-schema) pairs it delegates to jsonschema.
+    """
+    compiler = _Compiler(schema, schema_path)
+    source = compiler.compile()
+    return source, compiler.fallbacks
+
+
+def compiled_schema_key(schema: Dict) -> str:
+    """Return the hash identifying the compiled form of a schema on disk."""
+    digest = hashlib.sha256(f"v{COMPILER_VERSION}:".encode("utf-8"))
+    digest.update(json.dumps(schema, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CompiledValidator:
+    """Validator running generated Python code, with jsonschema for error reports.
+
+    The generated code only decides whether an instance is valid. Valid instances,
+    the bulk of any catalog, never reach jsonschema. Invalid instances are validated
+    again by the wrapped jsonschema validator so that errors (and `best_match`) are
+    exactly those of the jsonschema engine.
+
+    Args:
+        validator (Draft202012Validator): The jsonschema validator of the schema,
+            which also resolves the `$ref`s of the fallback sub-schemas.
+        source (str): The generated module source.
+        fallbacks (list): The (parent dialect, sub-schema) pairs delegated to
+            jsonschema.
+    """
+
+    def __init__(self, validator, source: str, fallbacks: List):
+        self.validator = validator
+        self.schema = validator.schema
+        self.source = source
+        self.fallbacks = fallbacks
+        namespace: Dict[str, Any] = {
+            "re": re,
+            "_equal": _equal,
+            "_unique": _unique,
+            "_not_multiple": _not_multiple,
+            "_true": lambda data: True,
+            "_false": lambda data: False,
+            "_fallbacks": [
+                # Descending from a validator of the parent's dialect applies
+                # exactly the keywords the node would get in the whole schema
+                validator.evolve(schema=_fallback_schema(parent, node)).is_valid
+                for parent, node in fallbacks
+            ],
+        }
+        exec(compile(source, "<stac-validator compiled schema>", "exec"), namespace)
+        self._check: Callable[[Any], bool] = namespace["validate"]
+
+    def is_valid(self, instance: Any) -> bool:
+        """Return whether an instance is valid against the schema."""
+        return self._check(instance)
+
+    def iter_errors(self, instance: Any):
+        """Yield the validation errors of an instance, as jsonschema does."""
+        if self._check(instance):
+            return iter(())
+        return self.validator.iter_errors(instance)
+
+    def validate(self, instance: Any) -> None:
+        """Validate an instance.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the instance is invalid.
+        """
+        if not self._check(instance):
+            self.validator.validate(instance)
+
+
+def _private(stat: os.stat_result) -> bool:
+    """Return whether a file is owned, and only readable, by the current user."""
+    if not hasattr(os, "getuid"):
+        return True
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+def _cache_key(cache_dir: str) -> Optional[bytes]:
+    """Return the key authenticating the code cached in a directory.
+
+    The key is created on first use, readable by the current user only. A key that
+    other users could have written or read is not used, so nothing is cached.
+    """
+    path = os.path.join(cache_dir, _KEY_FILE)
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, "wb") as f:
+                f.write(secrets.token_bytes(_KEY_SIZE))
+        with open(path, "rb") as f:
+            if not _private(os.fstat(f.fileno())):
+                return None
+            key = f.read()
+    except OSError:
+        return None
+    # Another process may still be writing the key
+    return key if len(key) == _KEY_SIZE else None
+
+
+def _signature(key: bytes, name: str, source: str, fallbacks: List) -> str:
+    message = json.dumps([name, source, fallbacks]).encode("utf-8")
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def _load_compiled(cache_dir: str, name: str) -> Optional[Tuple[str, List]]:
+    key = _cache_key(cache_dir)
+    if key is None:
+        return None
+    try:
+        with open(os.path.join(cache_dir, f"{name}.json"), "rb") as f:
+            entry = json.load(f)
+        source, fallbacks = entry["source"], entry["fallbacks"]
+        signature = entry["signature"]
+        if not isinstance(signature, str) or not hmac.compare_digest(
+            signature, _signature(key, name, source, fallbacks)
+        ):
+            # Not written by this user: never run it
+            return None
+        return source, [tuple(fallback) for fallback in fallbacks]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_compiled(cache_dir: str, name: str, source: str, fallbacks: List) -> None:
+    key = _cache_key(cache_dir)
+    if key is None:
+        return
+    data = json.dumps(
+        {
+            "source": source,
+            "fallbacks": fallbacks,
+            "signature": _signature(key, name, source, fallbacks),
+        }
+    ).encode("utf-8")
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(cache_dir, f"{name}.json"))
+    except OSError:
+        pass
+
+
+def compile_validator(
+    validator,
+    schema_path: str,
+    cache_dir: Optional[str] = None,
+) -> CompiledValidator:
+    """Compile a jsonschema validator into a `CompiledValidator`.
+
+    Args:
+        validator (Draft202012Validator): Validator of the (flattened) schema.
+        schema_path (str): Path or URI the schema was loaded from.
+        cache_dir (str): Directory in which generated code is cached, keyed by the
+            hash of the schema. Nothing is cached on disk if None. Cached code is
+            signed with a key private to the user, and code whose signature does
+            not match is compiled again instead of being run.
+
+    Returns:
+        CompiledValidator: The compiled validator.
+    """
+    key = compiled_schema_key({"path": schema_path, "schema": validator.schema})
+    compiled = _load_compiled(cache_dir, key) if cache_dir else None
+    if compiled is None:
+        compiled = compile_schema_source(validator.schema, schema_path)
+        if cache_dir:
+            _save_compiled(cache_dir, key, *compiled)
+    return CompiledValidator(validator, *compiled)
+
+
+_compiled_cache_dir: Optional[str] = None
+
+
+def configure_compiled_cache(cache_dir: Optional[str] = None) -> None:
+    """Set the directory in which the compiled engine caches generated code.
+
+    Args:
+        cache_dir (Optional[str]): The directory, or None to compile schemas again
+            in every process.
+    """
+    global _compiled_cache_dir
+    _compiled_cache_dir = cache_dir
+
+
+def get_compiled_cache_dir() -> Optional[str]:
+    """Return the directory in which generated code is cached, if any."""
+    return _compiled_cache_dir
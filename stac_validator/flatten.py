@@ -0,0 +1,197 @@
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import unquote, urldefrag, urljoin
+
+# Keywords whose values are not subschemas and must not be rewritten
+_LITERAL_KEYWORDS = ("enum", "const", "examples", "default")
+# Keywords that only annotate a schema and can be merged next to an inlined `$ref`
+_ANNOTATION_KEYWORDS = ("title", "description", "$comment", "examples", "default")
+# Definition containers are copied as they are, since every `$ref` into them is inlined
+_DEFINITION_KEYWORDS = ("definitions", "$defs")
+# Keywords whose values map names (not keywords) to subschemas
+_NAMED_SUBSCHEMA_KEYWORDS = (
+    "properties",
+    "patternProperties",
+    "dependencies",
+    "dependentSchemas",
+)
+
+
+def _ignores_ref_siblings(dialect: str) -> bool:
+    """Whether `$ref` overrides its sibling keywords, as up to JSON Schema draft 7."""
+    return "draft-0" in dialect
+
+
+def flattened_schema_uri(schema_path: str) -> str:
+    """Return the URI under which the flattened form of a schema is registered.
+
+    Recursive references in a flattened schema point into its `$defs` through this
+    URI, which stays valid whatever `$id` the inlined sub-schemas declare.
+
+    Args:
+        schema_path (str): Path or URI of the original JSON Schema.
+
+    Returns:
+        str: The URI of the flattened schema.
+    """
+    return f"urn:stac-validator:flattened:{schema_path}"
+
+
+class _Flattener:
+    """Inline every resolvable `$ref` of a schema into one self-contained document."""
+
+    def __init__(self, schema_path: str, loader: Callable[[str], Any]):
+        self.schema_path = schema_path
+        self.loader = loader
+        self._documents: Dict[str, Any] = {}
+        self._memo: Dict[Tuple[str, str, str], Any] = {}
+        self._stack: List[Tuple[str, str, str]] = []
+        self._recursive: Dict[Tuple[str, str, str], str] = {}
+        self.defs: Dict[str, Any] = {}
+        self.defs_uri = flattened_schema_uri(schema_path)
+        self.root_base = ""
+
+    def _document(self, uri: str) -> Any:
+        if uri not in self._documents:
+            self._documents[uri] = self.loader(uri)
+        return self._documents[uri]
+
+    @staticmethod
+    def _base_uri(uri: str, document: Any) -> str:
+        if isinstance(document, dict) and isinstance(document.get("$id"), str):
+            return urldefrag(urljoin(uri, document["$id"]))[0]
+        return uri
+
+    def flatten(self) -> Dict:
+        root = self._document(self.schema_path)
+        # As in validation, references in the root resolve against its `$id` only
+        if isinstance(root, dict) and isinstance(root.get("$id"), str):
+            self.root_base = urldefrag(root["$id"])[0]
+        self._documents[self.root_base] = root
+        # The root is always validated as draft 2020-12, whatever `$schema` it declares
+        flattened = self._expand(root, self.root_base, "", is_root=True)
+        if self.defs:
+            flattened = dict(flattened)
+            flattened["$defs"] = {**flattened.get("$defs", {}), **self.defs}
+        return flattened
+
+    def _resolve(self, uri: str, fragment: str) -> Tuple[Any, str]:
+        node = self._document(uri)
+        base = self._base_uri(uri, node)
+        for token in fragment.lstrip("/").split("/") if fragment else []:
+            token = unquote(token).replace("~1", "/").replace("~0", "~")
+            node = node[int(token)] if isinstance(node, list) else node[token]
+            if isinstance(node, dict) and isinstance(node.get("$id"), str):
+                base = urldefrag(urljoin(base, node["$id"]))[0]
+        return node, base
+
+    def _expand_ref(self, ref: str, base: str, dialect: str) -> Any:
+        uri, fragment = urldefrag(urljoin(base, ref))
+        if fragment and not fragment.startswith("/"):
+            # Plain-name anchors are left for the registry to resolve
+            return {"$ref": urljoin(base, ref)}
+        # A target without `$schema` is validated in the dialect of the referrer
+        key = (uri, fragment, dialect)
+
+        if key in self._memo:
+            return self._memo[key]
+        if key in self._stack:
+            # Recursive reference: point at a local definition instead of inlining
+            name = self._recursive.setdefault(key, f"flattened_{len(self._recursive)}")
+            return {"$ref": f"{self.defs_uri}#/$defs/{name}"}
+
+        try:
+            target, target_base = self._resolve(uri, fragment)
+        except (OSError, ValueError, LookupError, TypeError):
+            # Unreachable documents are left for the registry to resolve lazily,
+            # exactly as without flattening
+            return {"$ref": urljoin(base, ref)}
+        self._stack.append(key)
+        try:
+            expanded = self._expand(target, target_base, dialect)
+        finally:
+            self._stack.pop()
+
+        if key in self._recursive:
+            name = self._recursive[key]
+            self.defs[name] = expanded
+            expanded = {"$ref": f"{self.defs_uri}#/$defs/{name}"}
+        self._memo[key] = expanded
+        return expanded
+
+    def _expand(self, node: Any, base: str, dialect: str, is_root: bool = False) -> Any:
+        if isinstance(node, list):
+            return [self._expand(value, base, dialect) for value in node]
+        if not isinstance(node, dict):
+            return node
+
+        if isinstance(node.get("$id"), str):
+            base = urldefrag(urljoin(base, node["$id"]))[0]
+        # `$schema` is kept so that validation switches dialect exactly where the
+        # original documents do. As in jsonschema, the dialect of the parent decides
+        # whether `$ref` siblings apply, the node's own dialect everything else
+        own_dialect = dialect
+        if isinstance(node.get("$schema"), str) and not is_root:
+            own_dialect = node["$schema"]
+        ref = node.get("$ref")
+        if isinstance(ref, str) and _ignores_ref_siblings(dialect):
+            target = self._expand_ref(ref, base, own_dialect)
+            if own_dialect != dialect and isinstance(target, dict):
+                target = {"$schema": own_dialect, **target}
+            return target
+        dialect = own_dialect
+
+        result: Dict[str, Any] = {}
+        for key, value in node.items():
+            if key == "$ref" and isinstance(value, str):
+                # Reserve the position of the reference: keywords are checked in
+                # order, and `validate` raises the first error found
+                result["allOf"] = []
+                continue
+            if key in _LITERAL_KEYWORDS or key in _DEFINITION_KEYWORDS:
+                result[key] = value
+            elif key in _NAMED_SUBSCHEMA_KEYWORDS and isinstance(value, dict):
+                result[key] = {
+                    name: self._expand(subschema, base, dialect)
+                    for name, subschema in value.items()
+                }
+            else:
+                result[key] = self._expand(value, base, dialect)
+
+        if not isinstance(ref, str):
+            return result
+
+        target = self._expand_ref(ref, base, dialect)
+        siblings = {k: v for k, v in result.items() if k != "allOf" or v}
+        if not siblings:
+            return target
+        if isinstance(target, dict) and all(
+            key in _ANNOTATION_KEYWORDS for key in siblings
+        ):
+            return {**target, **{k: v for k, v in siblings.items() if k not in target}}
+        result["allOf"] = [target] + list(result["allOf"])
+        return result
+
+
+def flatten_schema(schema_path: str, loader: Callable[[str], Any]) -> Dict:
+    """Return a fully dereferenced, self-contained form of a schema.
+
+    Every `$ref` that can be resolved is replaced by the schema it points to, loading
+    remote documents as needed. Recursive references are kept as local references
+    into a `$defs` section of the flattened schema (see `flattened_schema_uri`), so
+    the result has no remote references left and validating against it gives the
+    same errors as validating against the original schema, without resolving
+    references during validation.
+
+    Args:
+        schema_path (str): Path or URI of the JSON Schema.
+        loader (Callable[[str], Any]): Function returning the parsed schema document
+            for a path or URI.
+
+    Returns:
+        dict: The flattened schema.
+
+    Raises:
+        requests.RequestException: If fetching a remote schema fails.
+        FileNotFoundError: If a local schema file is not found.
+    """
+    return _Flattener(schema_path, loader).flatten()
@@ -0,0 +1,438 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.exceptions import InsecureRequestWarning  # type: ignore
+
+from .request_scheduler import SCHEDULER
+from .utilities import is_url
+
+# Number of links and assets checked at the same time
+DEFAULT_LINK_WORKERS = 16
+
+# Seconds during which a link found valid by a previous run is not checked again
+DEFAULT_LINK_CACHE_TTL = 24 * 60 * 60
+
+# Statuses of HEAD requests that servers not supporting them answer with. S3
+# presigned URLs are signed for GET only, so HEAD requests get a 403
+_HEAD_UNSUPPORTED = frozenset((400, 403, 405, 501))
+
+# S3 hrefs are checked without certificate verification, as bucket names with dots
+# do not match the wildcard certificate of the S3 endpoints
+warnings.filterwarnings(
+    "ignore",
+    message="Unverified HTTPS request is being made to host '[^']*s3",
+    category=InsecureRequestWarning,
+)
+
+
+class LinkCache:
+    """Results of link checks, kept on disk for the next runs.
+
+    Only hrefs that were opened successfully are recorded, so failing links are
+    checked again by every run. Results are keyed by href and by a hash of the HTTP
+    headers they were checked with, and expire after `ttl` seconds.
+
+    Args:
+        path (str): Path of the cache file (an SQLite database), created if needed.
+        ttl (float): Seconds before a recorded result expires.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(
+        self, path: str, ttl: float = DEFAULT_LINK_CACHE_TTL, timeout: float = 30.0
+    ):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS links ("
+                "href TEXT NOT NULL, headers_hash TEXT NOT NULL, "
+                "valid INTEGER NOT NULL, checked_at REAL NOT NULL, "
+                "PRIMARY KEY (href, headers_hash))"
+            )
+
+    @staticmethod
+    def headers_hash(headers: Optional[Dict] = None) -> str:
+        """Return the hash of HTTP headers that results are recorded under."""
+        canonical = json.dumps(headers or {}, sort_keys=True)
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+    def get(self, href: str, headers_hash: str = "") -> Optional[Tuple[Optional[bool]]]:
+        """Return the recorded result of a link.
+
+        Args:
+            href (str): The URL of the link.
+            headers_hash (str): Hash of the HTTP headers of the check.
+
+        Returns:
+            Optional[tuple]: The result, as returned by `LinkChecker.check`, in a
+                tuple, or None if it is not recorded or has expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT valid FROM links "
+                "WHERE href = ? AND headers_hash = ? AND checked_at > ?",
+                (href, headers_hash, time.time() - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        return (True if row[0] else None,)
+
+    def put(self, href: str, result: Optional[bool], headers_hash: str = "") -> None:
+        """Record the result of a link that was opened successfully.
+
+        Args:
+            href (str): The URL of the link.
+            result (Optional[bool]): True for a 200 response, None for other
+                successful responses.
+            headers_hash (str): Hash of the HTTP headers of the check.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?)",
+                (href, headers_hash, int(bool(result)), time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class DirectoryListings:
+    """Listings of local directories, each read once with `os.scandir`.
+
+    Checking the local assets of a catalog looks their names up in the listing of
+    their directory, so a directory of 100k assets is listed once instead of being
+    stat'ed 100k times. Sizes are only read, from the cached directory entries, for
+    assets that declare a `file:size`.
+
+    Args:
+        maxsize (int): Maximum number of listings to keep before evicting the least
+            recently used one.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.scanned = 0
+        self._listings: "OrderedDict[str, Optional[Dict[str, os.DirEntry]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _listing(self, directory: str) -> Optional[Dict[str, os.DirEntry]]:
+        with self._lock:
+            if directory in self._listings:
+                self._listings.move_to_end(directory)
+                return self._listings[directory]
+        listing: Optional[Dict[str, os.DirEntry]]
+        try:
+            with os.scandir(directory) as entries:
+                listing = {entry.name: entry for entry in entries}
+        except OSError:
+            listing = None
+        with self._lock:
+            if directory not in self._listings:
+                self.scanned += 1
+                self._listings[directory] = listing
+            self._listings.move_to_end(directory)
+            while len(self._listings) > self.maxsize:
+                self._listings.popitem(last=False)
+            return self._listings[directory]
+
+    def entry(self, path: str) -> Optional[os.DirEntry]:
+        """Return the directory entry of a local path.
+
+        Args:
+            path (str): The path of a file or directory.
+
+        Returns:
+            Optional[os.DirEntry]: The entry, or None if the path does not exist.
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        listing = self._listing(directory)
+        return None if listing is None else listing.get(name)
+
+
+def local_path(href: str, base: Optional[str] = None) -> Optional[str]:
+    """Return the local path of a `file://`, absolute or relative href.
+
+    Absolute and relative paths are only local when the document they come from is
+    a local file, since in a remote document they are relative to its server.
+
+    Args:
+        href (str): The href of a link or asset.
+        base (Optional[str]): Path or `file://` URI of the STAC document the href
+            is relative to.
+
+    Returns:
+        Optional[str]: The path, or None if the href is not local.
+    """
+    parsed = urlparse(href)
+    if parsed.scheme == "file":
+        if parsed.netloc not in ("", "localhost"):
+            return None
+        return url2pathname(unquote(parsed.path))
+    if parsed.scheme or parsed.netloc or not base:
+        return None
+    if base.startswith("file:"):
+        base = local_path(base)
+        if base is None:
+            return None
+    elif is_url(base):
+        return None
+    if os.path.isabs(href):
+        return href
+    return os.path.join(os.path.dirname(base), href)
+
+
+def _is_remote(href: str) -> bool:
+    """Return whether an href is opened with an HTTP request."""
+    return is_url(href) and not href.startswith("file:")
+
+
+class LinkChecker:
+    """Checks that the links and assets of STAC objects can be opened.
+
+    Requests go through one `requests.Session`, whose connection pools keep the
+    connections to each host alive between checks, so checking the assets of the
+    items of a catalog costs one TLS handshake per host and worker rather than one
+    per href. The hrefs of an object are checked concurrently by up to
+    `max_workers` threads, each href once.
+
+    Hrefs are probed with a HEAD request, or with a GET request for their first
+    byte (`Range: bytes=0-0`) on servers that do not support HEAD. The body of a
+    response is never read, so checking a multi-gigabyte asset takes one round trip.
+
+    Each distinct href is checked once during the life of the checker, and
+    concurrent checks of the same href wait for the first one. With a `LinkCache`,
+    hrefs found valid by a previous run are not checked again until they expire.
+    The `requested`, `reused` and `cached` counters report how many hrefs were
+    requested, reused from an earlier check and read from the cache.
+
+    Relative and `file://` hrefs of local documents are checked against the
+    `DirectoryListings` of the checker, and counted by `local`.
+
+    Args:
+        headers (dict): HTTP headers to include in the requests.
+        max_workers (int): Maximum number of hrefs checked at the same time.
+        cache (Optional[LinkCache]): Results of previous runs.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict] = None,
+        max_workers: int = DEFAULT_LINK_WORKERS,
+        cache: Optional[LinkCache] = None,
+    ):
+        self.max_workers = max_workers
+        self.cache = cache
+        self._headers_hash = LinkCache.headers_hash(headers)
+        self.requested = 0
+        self.reused = 0
+        self.cached = 0
+        self.local = 0
+        self.listings = DirectoryListings()
+        self._results: Dict[str, Future] = {}
+        self._session = requests.Session()
+        self._session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _probe(self, href: str) -> int:
+        verify = "s3" not in href
+        with SCHEDULER.request(
+            "HEAD", href, session=self._session, allow_redirects=True, verify=verify
+        ) as r:
+            if r.status_code not in _HEAD_UNSUPPORTED:
+                return r.status_code
+        # The streamed response is closed unread, which drops its connection
+        with SCHEDULER.request(
+            "GET",
+            href,
+            session=self._session,
+            headers={"Range": "bytes=0-0"},
+            stream=True,
+            verify=verify,
+        ) as r:
+            # Servers ignoring the range answer with the whole object
+            return 200 if r.status_code == 206 else r.status_code
+
+    def _open(self, href: str) -> Optional[bool]:
+        try:
+            status_code = self._probe(href)
+        except Exception:
+            return False
+        if status_code == 200:
+            return True
+        # Like urlopen, only error statuses make a request invalid
+        return False if status_code >= 400 else None
+
+    def _resolve(self, href: str, future: Future) -> None:
+        try:
+            cached = None
+            if self.cache is not None:
+                cached = self.cache.get(href, self._headers_hash)
+            if cached is not None:
+                with self._lock:
+                    self.cached += 1
+                result = cached[0]
+            else:
+                with self._lock:
+                    self.requested += 1
+                result = self._open(href)
+                if self.cache is not None and result is not False:
+                    self.cache.put(href, result, self._headers_hash)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+
+    def check(self, hrefs: Iterable[str]) -> Dict[str, Optional[bool]]:
+        """Open URLs concurrently.
+
+        Args:
+            hrefs (Iterable[str]): The URLs to open.
+
+        Returns:
+            dict: For each URL, True if it was opened with a 200 response, False if
+                the request failed, or None for other successful responses.
+        """
+        futures: Dict[str, Future] = {}
+        pending: List[Tuple[str, Future]] = []
+        with self._lock:
+            for href in dict.fromkeys(hrefs):
+                future = self._results.get(href)
+                if future is None:
+                    future = self._results[href] = Future()
+                    pending.append((href, future))
+                else:
+                    self.reused += 1
+                futures[href] = future
+            executor = None
+            if len(pending) > 1 and self.max_workers > 1:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="link-checker"
+                    )
+                executor = self._executor
+        if executor is not None:
+            list(executor.map(lambda entry: self._resolve(*entry), pending))
+        else:
+            for href, future in pending:
+                self._resolve(href, future)
+        # Hrefs checked by another thread at the same time are waited for
+        return {href: future.result() for href, future in futures.items()}
+
+    @property
+    def saved(self) -> int:
+        """Number of checks saved by reusing results."""
+        return self.reused + self.cached
+
+    def check_local(self, path: str, size: Optional[int] = None) -> bool:
+        """Check that a local file or directory exists.
+
+        Args:
+            path (str): The path to check.
+            size (Optional[int]): Expected size of the file in bytes, if known.
+
+        Returns:
+            bool: True if the path exists with the expected size.
+        """
+        with self._lock:
+            self.local += 1
+        entry = self.listings.entry(path)
+        if entry is None:
+            return False
+        try:
+            if entry.is_dir():
+                return True
+            if not entry.is_file():
+                # Broken symbolic links
+                return False
+            return size is None or entry.stat().st_size == size
+        except OSError:
+            return False
+
+    def check_links(
+        self,
+        links: Iterable[Dict],
+        initial_message: Dict,
+        open_urls: bool = True,
+        base: Optional[str] = None,
+    ) -> None:
+        """Check links or assets and append their hrefs to the fields of a message.
+
+        URLs are opened concurrently, and count as valid when they answer with a
+        200. Relative and `file://` hrefs are resolved against `base` and checked on
+        the local filesystem, along with the `file:size` of assets.
+
+        Args:
+            links (Iterable[dict]): Links or assets, with an "href" key.
+            initial_message (dict): A dictionary containing lists for
+                "request_valid", "request_invalid", "format_valid", and
+                "format_invalid" URLs.
+            open_urls (bool): Whether to open the URLs and local files.
+            base (Optional[str]): Path of the STAC document of the links.
+        """
+        links = list(links)
+        results: Dict[str, Optional[bool]] = {}
+        if open_urls:
+            results = self.check(
+                link["href"] for link in links if _is_remote(link["href"])
+            )
+        for link in links:
+            href = link["href"]
+            if _is_remote(href):
+                if results.get(href) is True:
+                    initial_message["request_valid"].append(href)
+                elif results.get(href) is False:
+                    initial_message["request_invalid"].append(href)
+                initial_message["format_valid"].append(href)
+                continue
+            path = local_path(href, base)
+            if path is None:
+                initial_message["request_invalid"].append(href)
+                initial_message["format_invalid"].append(href)
+                continue
+            if open_urls:
+                size = link.get("file:size")
+                if not isinstance(size, int) or isinstance(size, bool):
+                    size = None
+                if self.check_local(path, size):
+                    initial_message["request_valid"].append(href)
+                else:
+                    initial_message["request_invalid"].append(href)
+            initial_message["format_valid"].append(href)
+
+    def close(self) -> None:
+        """Stop the worker threads and close the pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        self._session.close()
+        if self.cache is not None:
+            self.cache.close()
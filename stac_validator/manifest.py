@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from importlib import metadata
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from .utilities import is_url
+from .visited import normalize_href
+
+# Bumped when the stored results change shape, which invalidates older manifests
+MANIFEST_FORMAT = 1
+
+# Number of results written before they are committed
+_COMMIT_INTERVAL = 256
+
+# Files modified more recently than this (in nanoseconds) may still be changing
+# within the resolution of their modification time, so they are always hashed
+_RACY_MTIME_WINDOW = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER,
+    size INTEGER,
+    content_hash TEXT NOT NULL,
+    schema_hash TEXT NOT NULL,
+    schema TEXT NOT NULL,
+    message TEXT NOT NULL
+)
+"""
+
+
+def content_hash(stac_content: Dict) -> str:
+    """Return a hash of a STAC object that ignores key order and formatting.
+
+    Args:
+        stac_content (dict): The STAC object.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    canonical = json.dumps(stac_content, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def schema_set_hash(settings: Dict[str, Any], schema_map: Dict[str, str]) -> str:
+    """Return a hash of what decides validation results besides the objects.
+
+    Args:
+        settings (dict): Validator options that change results, such as the engine.
+        schema_map (dict): Schema replacements. Mapped local schema files are hashed
+            by content, so that editing them invalidates previous results.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    state: Dict[str, Any] = dict(settings)
+    for package in ("stac-validator", "jsonschema"):
+        try:
+            state[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            state[package] = None
+    mapped = {}
+    for url, path in sorted(schema_map.items()):
+        if is_url(path):
+            mapped[url] = path
+            continue
+        try:
+            with open(path, "rb") as f:
+                mapped[url] = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        except OSError:
+            mapped[url] = path
+    state["schema_map"] = mapped
+    canonical = json.dumps(state, sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class _FileState(NamedTuple):
+    mtime: Optional[int]
+    size: Optional[int]
+
+
+class ValidationManifest:
+    """Results of a recursive validation, kept for the next run to carry over.
+
+    Records, for each validated object, its modification time and size (for local
+    files), a hash of its content, the hash of the schema set it was validated
+    against and the validation message. A later run skips validating an object
+    whose content and schema set are unchanged and reuses its previous message.
+    Local files whose modification time and size are unchanged are not hashed.
+
+    The schema set hash (`schema_hash`) covers everything besides the object that
+    decides its result: the validator version, the engine and the schema map with
+    the content of mapped local schema files. Results recorded under another
+    schema set hash are ignored.
+
+    The manifest is an SQLite database, so results are looked up without loading
+    the whole manifest. Threads share one connection, through which results are
+    committed in batches, since SQLite only lets one connection write at a time.
+
+    Args:
+        path (str): Path of the manifest file, created if needed.
+        schema_hash (str): Hash of the schema set of the run.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(self, path: str, schema_hash: str = "", timeout: float = 30.0):
+        self.path = path
+        self.schema_hash = f"{MANIFEST_FORMAT}:{schema_hash}"
+        self.timeout = timeout
+        self.reused = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(_SCHEMA)
+
+    @staticmethod
+    def _file_state(stac_file: str) -> _FileState:
+        if is_url(stac_file):
+            return _FileState(None, None)
+        try:
+            stat = os.stat(stac_file)
+        except OSError:
+            return _FileState(None, None)
+        if time.time_ns() - stat.st_mtime_ns < _RACY_MTIME_WINDOW:
+            return _FileState(None, None)
+        return _FileState(stat.st_mtime_ns, stat.st_size)
+
+    def get(self, stac_file: str, stac_content: Dict) -> Optional[Tuple[Dict, str]]:
+        """Return the previous result of an unchanged object.
+
+        Args:
+            stac_file (str): Path or URL of the object.
+            stac_content (dict): The object.
+
+        Returns:
+            Optional[tuple]: The validation message and the schema the object was
+                last validated against, or None if the object or its schema set
+                changed since it was recorded.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime, size, content_hash, schema, message FROM results "
+                "WHERE path = ? AND schema_hash = ?",
+                (normalize_href(stac_file), self.schema_hash),
+            ).fetchone()
+        if row is None:
+            return None
+        mtime, size, stored_hash, schema, message = row
+        state = self._file_state(stac_file)
+        unchanged_file = state.mtime is not None and state == (mtime, size)
+        if not unchanged_file and stored_hash != content_hash(stac_content):
+            return None
+        with self._lock:
+            self.reused += 1
+        return json.loads(message), schema
+
+    def put(self, stac_file: str, stac_content: Dict, message: Dict, schema: str):
+        """Record the result of an object for the next run.
+
+        Args:
+            stac_file (str): Path or URL of the object.
+            stac_content (dict): The object.
+            message (dict): Its validation message.
+            schema (str): The schema it was last validated against.
+        """
+        state = self._file_state(stac_file)
+        row = (
+            normalize_href(stac_file),
+            state.mtime,
+            state.size,
+            content_hash(stac_content),
+            self.schema_hash,
+            schema,
+            json.dumps(message),
+        )
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", row
+            )
+            self.recorded += 1
+            self._pending += 1
+            if self._pending >= _COMMIT_INTERVAL:
+                self._connection.commit()
+                self._pending = 0
+
+    def flush(self) -> None:
+        """Commit the results recorded since the last commit."""
+        with self._lock:
+            self._connection.commit()
+            self._pending = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[
+                0
+            ]
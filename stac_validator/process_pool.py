@@ -0,0 +1,173 @@
+import functools
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utilities import SCHEMA_STORE
+
+# Maximum number of documents sent to a worker process at once
+DEFAULT_BATCH_SIZE = 32
+
+# The validator of a worker process, created once by `_initialize_worker`
+_worker_validator: Any = None
+
+
+class ReportedError(Exception):
+    """An error raised in a worker process, with the message it is reported with.
+
+    Validation errors hold references to the validator and schema that raised them
+    and cannot be sent back from a worker process, so workers format the error
+    message like the parent process would and send that instead.
+
+    Args:
+        message (dict): The error message, as created by `StacValidate.create_err_msg`.
+    """
+
+    def __init__(self, message: Dict):
+        super().__init__(message.get("error_message", ""))
+        self.message = message
+
+    def __reduce__(self):
+        return type(self), (self.message,)
+
+
+def _initialize_worker(options: Dict, schemas: List[Tuple[str, Dict, int]]) -> None:
+    global _worker_validator
+    from .validate import StacValidate
+
+    _worker_validator = StacValidate(**options)
+    for schema_path, schema, size in schemas:
+        SCHEMA_STORE.put(schema_path, schema, size)
+
+
+def _run_batch(tasks: List[Tuple[str, str, Tuple]]) -> List[Any]:
+    return [
+        _worker_validator._process_task(method, version, args)
+        for method, version, args in tasks
+    ]
+
+
+class ProcessValidationPool:
+    """Validates already fetched STAC documents on a pool of worker processes.
+
+    Each worker process is initialised once with a validator built from the same
+    options as the parent's (schema map, schema caches, engine...) and with the
+    schemas already parsed by the parent, so that workers start with a warm schema
+    store. Documents are sent to the workers in batches of up to `batch_size`: a
+    dispatcher thread groups every request waiting when a batch is sent, so batches
+    fill up under load without delaying requests when idle.
+
+    `submit` returns a future per document, so callers collect results in any
+    order they need, usually the order the documents were submitted in.
+
+    Args:
+        processes (int): Number of worker processes.
+        options (dict): Keyword arguments of the `StacValidate` of each worker.
+        batch_size (int): Maximum number of documents sent to a worker at once.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        options: Dict,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.batch_size = batch_size
+        # Worker processes are spawned rather than forked, since the parent runs
+        # fetching threads that a fork could copy in the middle of their work
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(options, SCHEMA_STORE.snapshot()),
+        )
+        self._queue: "queue.Queue[Optional[Tuple[Future, Tuple]]]" = queue.Queue()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, method: str, version: str, *args) -> Future:
+        """Validate a document in a worker process.
+
+        Args:
+            method (str): Name of the `StacValidate` method the worker calls.
+            version (str): STAC version of the crawl the document belongs to.
+            *args: Arguments of the method, including the document.
+
+        Returns:
+            Future: The future result of the method.
+        """
+        future: Future = Future()
+        self._queue.put((future, (method, version, args)))
+        return future
+
+    def _dispatch(self) -> None:
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            while len(batch) < self.batch_size:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._queue.put(None)
+                    break
+                batch.append(request)
+            batch = [(future, task) for future, task in batch if not future.cancelled()]
+            if not batch:
+                continue
+            futures = [future for future, _ in batch]
+            try:
+                batch_future = self._executor.submit(
+                    _run_batch, [task for _, task in batch]
+                )
+            except Exception as e:
+                self._resolve_error(futures, e)
+                continue
+            batch_future.add_done_callback(functools.partial(self._resolve, futures))
+
+    @staticmethod
+    def _resolve_error(futures: List[Future], error: BaseException) -> None:
+        for future in futures:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    @classmethod
+    def _resolve(cls, futures: List[Future], batch_future: Future) -> None:
+        try:
+            results = batch_future.result()
+        except BaseException as e:
+            cls._resolve_error(futures, e)
+            return
+        for future, result in zip(futures, results):
+            if future.set_running_or_notify_cancel():
+                future.set_result(result)
+
+    def cancel_pending(self) -> None:
+        """Cancel the documents that were not sent to a worker process yet."""
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is None:
+                self._queue.put(None)
+                return
+            request[0].cancel()
+
+    def close(self) -> None:
+        """Cancel the documents not sent yet and stop the worker processes."""
+        self.cancel_pending()
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ProcessValidationPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
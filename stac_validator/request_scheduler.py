@@ -0,0 +1,365 @@
+import contextlib
+import email.utils
+import threading
+import time
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests  # type: ignore
+
+# Seconds to wait for a connection to a host, and for data once connected
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+# Number of times a request answered with 429 or 503 is sent again
+DEFAULT_MAX_RETRIES = 3
+
+# Longest `Retry-After` waited for, in seconds; longer waits fail the request
+MAX_RETRY_AFTER = 300.0
+
+_RETRY_STATUSES = frozenset((429, 503))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the number of seconds to wait from a `Retry-After` header.
+
+    Args:
+        value (Optional[str]): The header, as a number of seconds or an HTTP date.
+
+    Returns:
+        Optional[float]: The seconds to wait, or None if the header is missing or
+            invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second, in bursts of `burst`.
+
+    Args:
+        rate (float): Requests per second.
+        burst (float): Number of requests allowed at once after a pause.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token, and return the seconds to wait before using it.
+
+        Not thread-safe, callers hold the lock of the host.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class _Host:
+    def __init__(
+        self, rate: Optional[float], burst: float, max_connections: Optional[int]
+    ):
+        self.lock = threading.Lock()
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.connections = (
+            threading.BoundedSemaphore(max_connections) if max_connections else None
+        )
+        # Monotonic time before which requests wait, after a `Retry-After`
+        self.blocked_until = 0.0
+
+
+def _release_on_close(
+    response: requests.Response, connections: threading.BoundedSemaphore
+) -> None:
+    """Release a connection slot of a host when a response is closed, once."""
+    close = response.close
+    released = threading.Lock()
+
+    def close_and_release() -> None:
+        try:
+            close()
+        finally:
+            if released.acquire(blocking=False):
+                connections.release()
+
+    response.close = close_and_release  # type: ignore
+
+
+class RequestScheduler:
+    """Schedules the outbound HTTP requests of the validator, per host.
+
+    Requests to each host are limited to `rate` per second (with bursts of
+    `burst`) by a token bucket, and to `max_connections` at the same time. Requests
+    answered with 429 Too Many Requests or 503 Service Unavailable are sent again
+    after the `Retry-After` delay of the response, during which every request to
+    the host waits, up to `max_retries` times. Every request has connect and read
+    timeouts, so that a stalled host fails its requests instead of hanging the
+    validation.
+
+    Args:
+        rate (Optional[float]): Maximum requests per second to each host, or None
+            for no limit.
+        burst (Optional[float]): Requests allowed at once after a pause. Defaults to
+            `rate`.
+        max_connections (Optional[int]): Maximum requests in flight to each host, or
+            None for no limit.
+        connect_timeout (float): Seconds to wait for a connection.
+        read_timeout (float): Seconds to wait for data once connected.
+        max_retries (int): Number of times a throttled request is sent again.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.retries = 0
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """The connect and read timeouts of requests, as taken by `requests`."""
+        return self.connect_timeout, self.read_timeout
+
+    def _host(self, url: str) -> _Host:
+        netloc = urlparse(url).netloc
+        with self._lock:
+            host = self._hosts.get(netloc)
+            if host is None:
+                burst = self.burst if self.burst is not None else self.rate or 1.0
+                host = self._hosts[netloc] = _Host(
+                    self.rate, burst, self.max_connections
+                )
+            return host
+
+    def delay(self, url: str) -> float:
+        """Reserve the next request to the host of a URL.
+
+        Args:
+            url (str): The URL about to be requested.
+
+        Returns:
+            float: The seconds to wait before sending the request.
+        """
+        host = self._host(url)
+        with host.lock:
+            wait = host.blocked_until - time.monotonic()
+            if host.bucket is not None:
+                wait = max(wait, host.bucket.reserve())
+        return max(0.0, wait)
+
+    def retry_delay(
+        self, url: str, response_headers: Mapping[str, str], status: int, attempt: int
+    ) -> Optional[float]:
+        """Return the seconds to wait before sending a throttled request again.
+
+        Every request to the host waits as long, since the server throttles them
+        all. Without a `Retry-After`, 429 responses are retried after an
+        exponential backoff.
+
+        Args:
+            url (str): The URL of the request.
+            response_headers (Mapping): The headers of the response.
+            status (int): The status of the response.
+            attempt (int): Number of times the request was sent so far.
+
+        Returns:
+            Optional[float]: The seconds to wait, or None if the request should
+                not be sent again.
+        """
+        if status not in _RETRY_STATUSES or attempt > self.max_retries:
+            return None
+        wait = parse_retry_after(response_headers.get("Retry-After"))
+        if wait is None:
+            if status != 429:
+                return None
+            wait = float(2 ** (attempt - 1))
+        if wait > MAX_RETRY_AFTER:
+            return None
+        host = self._host(url)
+        with host.lock:
+            host.blocked_until = max(host.blocked_until, time.monotonic() + wait)
+        with self._lock:
+            self.retries += 1
+        return wait
+
+    def _acquire(self, url: str) -> Optional[threading.BoundedSemaphore]:
+        """Wait for a free connection of the host of a URL and for its rate limit.
+
+        Returns:
+            Optional[threading.BoundedSemaphore]: The connections of the host to
+                release once the request is done, or None if they are not limited.
+        """
+        connections = self._host(url).connections
+        if connections is not None:
+            connections.acquire()
+        try:
+            wait = self.delay(url)
+            if wait:
+                time.sleep(wait)
+        except BaseException:
+            if connections is not None:
+                connections.release()
+            raise
+        return connections
+
+    @contextlib.contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold a connection slot of the host of a URL for the duration of a request.
+
+        Waits for a free connection of the host and for its rate limit.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        connections = self._acquire(url)
+        try:
+            yield
+        finally:
+            if connections is not None:
+                connections.release()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request within the limits of its host.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL.
+            session (Optional[requests.Session]): Session to send the request with.
+                Defaults to a session shared by the whole process.
+            **kwargs: Arguments of `requests.Session.request`. The timeouts of the
+                scheduler are used unless `timeout` is given.
+
+        Returns:
+            requests.Response: The response, which may still be a 429 or 503 once
+                the retries are exhausted. A streamed response holds its connection
+                slot until it is closed.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        session = session or self._session
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            attempt += 1
+            connections = self._acquire(url)
+            try:
+                response = session.request(method, url, **kwargs)
+            except BaseException:
+                if connections is not None:
+                    connections.release()
+                raise
+            if connections is not None:
+                if kwargs.get("stream"):
+                    # The body is still to be read from the connection
+                    _release_on_close(response, connections)
+                else:
+                    connections.release()
+            wait = self.retry_delay(
+                url, response.headers, response.status_code, attempt
+            )
+            if wait is None:
+                return response
+            response.close()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request within the limits of its host."""
+        return self.request("GET", url, **kwargs)
+
+    def configure(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
+        """Replace the limits of the scheduler.
+
+        Takes the arguments of the constructor. Arguments left out return to their
+        defaults.
+        """
+        with self._lock:
+            limits = (rate, burst, max_connections)
+            if limits != (self.rate, self.burst, self.max_connections):
+                # Hosts get the new limits on their next request
+                self._hosts.clear()
+            self.rate, self.burst, self.max_connections = limits
+            self.connect_timeout = connect_timeout
+            self.read_timeout = read_timeout
+            self.max_retries = max_retries
+
+
+SCHEDULER = RequestScheduler()
+
+
+def configure_request_scheduler(
+    rate: Optional[float] = None,
+    burst: Optional[float] = None,
+    max_connections: Optional[int] = None,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> RequestScheduler:
+    """Set the per-host limits and timeouts of the process-wide request scheduler.
+
+    Every setting is replaced, so that a setting left out returns to its default
+    instead of keeping the value of an earlier validator.
+
+    Args:
+        rate (Optional[float]): Maximum requests per second to each host, or None
+            for no limit.
+        burst (Optional[float]): Requests allowed at once after a pause. Defaults to
+            `rate`.
+        max_connections (Optional[int]): Maximum requests in flight to each host, or
+            None for no limit.
+        connect_timeout (float): Seconds to wait for a connection.
+        read_timeout (float): Seconds to wait for data once connected.
+        max_retries (int): Number of times a throttled request is sent again.
+
+    Returns:
+        RequestScheduler: The process-wide request scheduler.
+    """
+    SCHEDULER.configure(
+        rate=rate,
+        burst=burst,
+        max_connections=max_connections,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        max_retries=max_retries,
+    )
+    return SCHEDULER
@@ -0,0 +1,135 @@
+import json
+import time
+from typing import Any, Dict
+
+# Formats of the log file of a validation
+LOG_FORMATS = ("json", "jsonl")
+
+# Seconds between two flushes of a JSON Lines log
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+class JsonArrayLog:
+    """Writes messages to a log file as they come, as one indented JSON array.
+
+    The file is the same as `json.dumps(messages, indent=4)` once closed.
+
+    Args:
+        path (str): Path of the log file.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "w")
+        self._count = 0
+
+    def write(self, message: Dict) -> None:
+        lines = json.dumps(message, indent=4).splitlines()
+        self._file.write(",\n" if self._count else "[\n")
+        self._file.write("\n".join(f"    {line}" for line in lines))
+        self._count += 1
+
+    def close(self) -> None:
+        self._file.write("\n]" if self._count else "[]")
+        self._file.close()
+
+    def __enter__(self) -> "JsonArrayLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JsonLinesLog(JsonArrayLog):
+    """Appends messages to a log file as they come, one JSON document per line.
+
+    Lines are flushed to the file at least every `flush_interval` seconds, so the
+    log of a long validation can be followed, and survives it being killed.
+
+    Args:
+        path (str): Path of the log file.
+        flush_interval (float): Maximum number of seconds a line stays buffered.
+        append (bool): Whether to continue an existing log instead of replacing it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        append: bool = False,
+    ):
+        self._file = open(path, "a" if append else "w")
+        self.flush_interval = flush_interval
+        self._flushed_at = time.monotonic()
+
+    def write(self, message: Dict) -> None:
+        self._file.write(json.dumps(message))
+        self._file.write("\n")
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self._file.flush()
+            self._flushed_at = time.monotonic()
+
+    def tell(self) -> int:
+        """Flush the log and return its size, to save it in a checkpoint."""
+        self._file.flush()
+        self._flushed_at = time.monotonic()
+        return self._file.tell()
+
+    def truncate(self, size: int) -> None:
+        """Drop the lines written after the log had a size returned by `tell`."""
+        self._file.truncate(min(size, self.tell()))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def open_result_log(path: str, log_format: str = "json") -> JsonArrayLog:
+    """Open a log file to write validation messages to as they come.
+
+    Args:
+        path (str): Path of the log file.
+        log_format (str): "json" for one JSON array, "jsonl" for JSON Lines.
+
+    Returns:
+        JsonArrayLog: The log, to close once every message is written.
+    """
+    if log_format == "jsonl":
+        return JsonLinesLog(path)
+    return JsonArrayLog(path)
+
+
+class ResultCounter:
+    """Counts validation messages by object type, for summaries.
+
+    Lets a summary be printed without keeping every message in memory.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.valid = 0
+        self.by_type: Dict[str, Dict[str, int]] = {}
+
+    def add(self, message: Any) -> None:
+        """Count a validation message.
+
+        Args:
+            message (dict): The message. Anything else is ignored.
+        """
+        if not isinstance(message, dict):
+            return
+        obj_type = message.get("asset_type", "unknown").lower()
+        counts = self.by_type.setdefault(obj_type, {"valid": 0, "total": 0})
+        counts["total"] += 1
+        self.total += 1
+        if message.get("valid_stac", False) is True:
+            counts["valid"] += 1
+            self.valid += 1
+
+    def dump(self) -> Dict[str, Any]:
+        """Return the counts, to save them in a checkpoint."""
+        return {"total": self.total, "valid": self.valid, "by_type": self.by_type}
+
+    def load(self, counts: Dict[str, Any]) -> None:
+        """Restore the counts saved in a checkpoint."""
+        self.total = counts["total"]
+        self.valid = counts["valid"]
+        self.by_type = counts["by_type"]
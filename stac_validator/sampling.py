@@ -0,0 +1,139 @@
+import hashlib
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .visited import normalize_href
+
+T = TypeVar("T")
+
+# Normal quantile of the two-sided 95% confidence intervals of the estimates
+CONFIDENCE_Z = 1.959964
+
+
+def wilson_interval(
+    failures: int, total: int, z: float = CONFIDENCE_Z
+) -> Tuple[float, float]:
+    """Return the Wilson score confidence interval of a failure rate.
+
+    Unlike the normal approximation, the interval stays within [0, 1] and is
+    meaningful for small samples and for rates close to 0, such as no failure at
+    all in the sample.
+
+    Args:
+        failures (int): Number of failures in the sample.
+        total (int): Size of the sample.
+        z (float): Normal quantile of the confidence level.
+
+    Returns:
+        tuple: The lower and upper bounds of the failure rate.
+    """
+    if total == 0:
+        return 0.0, 1.0
+    rate = failures / total
+    denominator = 1 + z * z / total
+    center = (rate + z * z / (2 * total)) / denominator
+    margin = (
+        z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total))
+    ) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class Sampler:
+    """Selects a uniform sample of the items of each catalog, collection or page.
+
+    Each item is given a pseudo-random key from a hash of its normalised path and
+    of `seed`. An item is sampled if its key is below `rate`, and at most the
+    `per_collection` items with the lowest keys of a catalog, collection or page
+    are kept. Since keys only depend on the items, the same items are sampled by
+    every run with the same seed, whatever the crawl engine.
+
+    The sampler also counts the items seen, sampled and validated, and the failures
+    among the validated ones, to estimate the failure rate of all the items.
+
+    Args:
+        rate (Optional[float]): Fraction of the items to sample, between 0 and 1.
+        per_collection (Optional[int]): Maximum number of items sampled from each
+            catalog, collection or item collection page.
+        seed (int): Seed of the sample.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        per_collection: Optional[int] = None,
+        seed: int = 0,
+    ):
+        if rate is not None and not 0 <= rate <= 1:
+            raise ValueError("The sample rate must be between 0 and 1")
+        if per_collection is not None and per_collection < 1:
+            raise ValueError("The sample size per collection must be at least 1")
+        self.rate = rate
+        self.per_collection = per_collection
+        self._seed = str(seed).encode()
+        self._lock = threading.Lock()
+        self.population = 0
+        self.sampled = 0
+        self.validated = 0
+        self.failed = 0
+
+    def _key(self, href: str) -> float:
+        digest = hashlib.blake2b(
+            normalize_href(href).encode(), digest_size=8, key=self._seed
+        ).digest()
+        return int.from_bytes(digest, "big") / 2**64
+
+    def sample(self, entries: List[T], href: Callable[[T], str]) -> List[T]:
+        """Select the sampled items of a catalog, collection or page.
+
+        Args:
+            entries (list): The items, in any form.
+            href (Callable): Returns the path or URL of an item.
+
+        Returns:
+            list: The sampled items, in their original order.
+        """
+        keyed = [(self._key(href(entry)), index) for index, entry in enumerate(entries)]
+        if self.rate is not None:
+            keyed = [(key, index) for key, index in keyed if key < self.rate]
+        if self.per_collection is not None and len(keyed) > self.per_collection:
+            keyed = sorted(keyed)[: self.per_collection]
+        selected = sorted(index for _, index in keyed)
+        with self._lock:
+            self.population += len(entries)
+            self.sampled += len(selected)
+        return [entries[index] for index in selected]
+
+    def record(self, valid: bool) -> None:
+        """Count the validation of a sampled item."""
+        with self._lock:
+            self.validated += 1
+            if not valid:
+                self.failed += 1
+
+    def dump(self) -> Dict[str, int]:
+        """Return the counters, to save them in a checkpoint."""
+        with self._lock:
+            return {
+                "population": self.population,
+                "sampled": self.sampled,
+                "validated": self.validated,
+                "failed": self.failed,
+            }
+
+    def load(self, counters: Dict[str, int]) -> None:
+        """Restore the counters saved in a checkpoint."""
+        with self._lock:
+            self.population = counters["population"]
+            self.sampled = counters["sampled"]
+            self.validated = counters["validated"]
+            self.failed = counters["failed"]
+
+    @property
+    def failure_rate(self) -> float:
+        """The failure rate of the validated items of the sample."""
+        return self.failed / self.validated if self.validated else 0.0
+
+    def failure_interval(self) -> Tuple[float, float]:
+        """Return the 95% confidence interval of the failure rate of all items."""
+        return wilson_interval(self.failed, self.validated)
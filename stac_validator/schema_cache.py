@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, NamedTuple, Optional
+
+import requests  # type: ignore
+
+from .request_scheduler import SCHEDULER
+
+DEFAULT_SCHEMA_CACHE_TTL = 24 * 60 * 60
+
+
+class CachedSchema(NamedTuple):
+    """A raw schema document stored in the on-disk schema cache."""
+
+    content: bytes
+    etag: str
+    last_modified: str
+    fetched_at: float
+
+
+def default_schema_cache_dir() -> str:
+    """Return the default directory for the persistent schema cache.
+
+    The `STAC_VALIDATOR_CACHE_DIR` environment variable takes precedence, otherwise
+    the XDG cache directory (`$XDG_CACHE_HOME`, falling back to `~/.cache`) is used.
+
+    Returns:
+        str: The directory in which downloaded schemas are stored.
+    """
+    override = os.environ.get("STAC_VALIDATOR_CACHE_DIR")
+    if override:
+        return os.path.join(override, "schemas")
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(xdg_cache, "stac-validator", "schemas")
+
+
+class SchemaDiskCache:
+    """Persistent cache of raw schema documents with HTTP revalidation.
+
+    Each schema is stored as its raw bytes next to a small JSON metadata file holding
+    the `ETag` and `Last-Modified` response headers. Entries younger than `ttl` seconds
+    are served straight from disk. Older entries are revalidated with a conditional
+    GET, and are served stale if the schema host cannot be reached or answers with
+    a server error. Client errors, such as a 404 for a removed schema, are raised.
+
+    Args:
+        cache_dir (str): Directory to store schemas in. Defaults to
+            `default_schema_cache_dir()`.
+        ttl (int): Number of seconds a cached schema is used without revalidation.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, ttl: int = DEFAULT_SCHEMA_CACHE_TTL
+    ):
+        self.cache_dir = cache_dir or default_schema_cache_dir()
+        self.ttl = ttl
+
+    def _paths(self, url: str):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, digest[:2], digest)
+        return f"{base}.json", f"{base}.meta"
+
+    def load(self, url: str) -> Optional[CachedSchema]:
+        """Read a cached schema from disk.
+
+        Args:
+            url (str): The URL of the schema.
+
+        Returns:
+            Optional[CachedSchema]: The cached entry, or None if it is not cached.
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as fb:
+                content = fb.read()
+        except (OSError, ValueError):
+            return None
+        return CachedSchema(
+            content,
+            meta.get("etag", ""),
+            meta.get("last_modified", ""),
+            meta.get("fetched_at", 0.0),
+        )
+
+    def save(self, url: str, entry: CachedSchema) -> None:
+        """Write a schema to disk. Failures (e.g. a read-only filesystem) are ignored.
+
+        Args:
+            url (str): The URL of the schema.
+            entry (CachedSchema): The schema document and its metadata.
+        """
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+        }
+        try:
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            self._atomic_write(body_path, entry.content)
+            self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def is_fresh(self, entry: CachedSchema) -> bool:
+        """Return True if an entry can be used without revalidation."""
+        return time.time() - entry.fetched_at < self.ttl
+
+    def fetch(self, url: str, headers: Optional[Dict] = None) -> bytes:
+        """Return the raw bytes of a schema, downloading or revalidating as needed.
+
+        Args:
+            url (str): The URL of the schema.
+            headers (dict): Additional HTTP headers to include in the request.
+
+        Returns:
+            bytes: The raw schema document.
+
+        Raises:
+            requests.exceptions.RequestException: If the schema cannot be downloaded
+                and there is no cached copy to fall back on, or if the server
+                answers with a client error.
+        """
+        entry = self.load(url)
+        if entry is not None and self.is_fresh(entry):
+            return entry.content
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            resp = SCHEDULER.get(url, headers=request_headers)
+        except requests.exceptions.RequestException:
+            # Serve a stale copy while the schema host is unreachable
+            if entry is not None:
+                return entry.content
+            raise
+        if resp.status_code == 304 and entry is not None:
+            entry = entry._replace(fetched_at=time.time())
+            self.save(url, entry)
+            return entry.content
+        if resp.status_code >= 500 and entry is not None:
+            # Also while it fails, but not once it answers that the schema is gone
+            return entry.content
+        resp.raise_for_status()
+
+        entry = CachedSchema(
+            resp.content,
+            resp.headers.get("ETag", ""),
+            resp.headers.get("Last-Modified", ""),
+            time.time(),
+        )
+        self.save(url, entry)
+        return entry.content
+
+
+# Off until enabled, so that using the library does not write to the user's cache
+_schema_disk_cache: Optional[SchemaDiskCache] = None
+
+
+def configure_schema_cache(
+    cache_dir: Optional[str] = None,
+    ttl: Optional[int] = None,
+    enabled: bool = True,
+) -> Optional[SchemaDiskCache]:
+    """Configure the process-wide persistent schema cache.
+
+    Args:
+        cache_dir (str): Directory to store schemas in. Defaults to the XDG cache.
+        ttl (int): Seconds before a cached schema is revalidated.
+        enabled (bool): Whether remote schemas are cached on disk at all.
+
+    Returns:
+        Optional[SchemaDiskCache]: The active cache, or None if caching is disabled.
+    """
+    global _schema_disk_cache
+    if not enabled:
+        _schema_disk_cache = None
+    else:
+        _schema_disk_cache = SchemaDiskCache(
+            cache_dir=cache_dir,
+            ttl=DEFAULT_SCHEMA_CACHE_TTL if ttl is None else ttl,
+        )
+    return _schema_disk_cache
+
+
+def get_schema_cache() -> Optional[SchemaDiskCache]:
+    """Return the active persistent schema cache, or None if it is disabled."""
+    return _schema_disk_cache
@@ -0,0 +1,149 @@
+import marshal
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .schema_cache import DEFAULT_SCHEMA_CACHE_TTL
+
+# Parsed schemas are serialised with `marshal`, which only handles plain data and,
+# unlike pickle, cannot run code when loading. Its format depends on the Python
+# version, so entries written by another version are parsed from the raw bytes.
+PARSED_FORMAT = f"marshal-{sys.version_info[0]}.{sys.version_info[1]}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schemas (
+    uri TEXT PRIMARY KEY,
+    raw BLOB NOT NULL,
+    parsed BLOB,
+    format TEXT,
+    fetched_at REAL NOT NULL
+)
+"""
+
+
+def default_schema_db_path() -> str:
+    """Return the default location of the shared schema database.
+
+    Returns:
+        str: `schemas.sqlite` next to the persistent schema cache directory.
+    """
+    from .schema_cache import default_schema_cache_dir
+
+    return os.path.join(os.path.dirname(default_schema_cache_dir()), "schemas.sqlite")
+
+
+class SqliteSchemaStore:
+    """Schema store shared by every process on a machine, backed by SQLite.
+
+    Holds the raw bytes of remote schemas together with their parsed form, so that a
+    process that finds a schema in the database neither downloads nor parses it.
+    SQLite's file locking makes concurrent reads and writes from many processes safe;
+    the database runs in WAL mode so that readers never wait for a writer. Each
+    thread (and each forked process) opens its own connection.
+
+    Only remote schemas are stored, and entries older than `ttl` seconds are ignored
+    so that schemas are still revalidated like in the persistent schema cache.
+
+    Args:
+        path (str): Path of the database file, created if needed. Defaults to
+            `default_schema_db_path()`.
+        ttl (int): Seconds a stored schema is served before it is fetched again.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: int = DEFAULT_SCHEMA_CACHE_TTL,
+        timeout: float = 30.0,
+    ):
+        self.path = path or default_schema_db_path()
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _shareable(uri: str) -> bool:
+        return uri.startswith(("http://", "https://"))
+
+    def get(self, uri: str) -> Optional[Tuple[bytes, Optional[Dict]]]:
+        """Return the raw bytes and, if readable here, the parsed form of a schema.
+
+        Args:
+            uri (str): The URI of the schema.
+
+        Returns:
+            Optional[tuple]: The raw bytes and the parsed schema (None if it was
+                serialised by another Python version), or None if the schema is not
+                stored or has expired.
+        """
+        if not self._shareable(uri):
+            return None
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT raw, parsed, format, fetched_at FROM schemas WHERE uri = ?",
+                    (uri,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error:
+            return None
+        if row is None or time.time() - row[3] >= self.ttl:
+            return None
+        raw, parsed, parsed_format, _ = row
+        if parsed is None or parsed_format != PARSED_FORMAT:
+            return bytes(raw), None
+        try:
+            return bytes(raw), marshal.loads(parsed)
+        except (EOFError, ValueError, TypeError):
+            return bytes(raw), None
+
+    def put(self, uri: str, raw: bytes, schema: Dict) -> None:
+        """Store a schema for every process to use.
+
+        Args:
+            uri (str): The URI of the schema.
+            raw (bytes): The raw schema document.
+            schema (dict): The parsed schema.
+        """
+        if not self._shareable(uri):
+            return
+        try:
+            parsed: Optional[bytes] = marshal.dumps(schema)
+        except ValueError:
+            parsed = None
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO schemas VALUES (?, ?, ?, ?, ?)",
+                    (uri, raw, parsed, PARSED_FORMAT, time.time()),
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        """Delete every stored schema."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM schemas")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM schemas").fetchone()[0]
@@ -0,0 +1,310 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Seconds a failed load is remembered before the schema is requested again
+DEFAULT_FAILURE_TTL = 60
+
+# Schemas under these prefixes are needed by nearly every STAC object, so they are
+# never evicted from the store.
+CORE_SCHEMA_PREFIXES: Tuple[str, ...] = (
+    "https://schemas.stacspec.org/",
+    "https://geojson.org/schema/",
+)
+
+
+class SchemaStoreInfo(NamedTuple):
+    """Statistics reported by `SchemaStore.info()`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    pinned: int
+    max_entries: int
+    max_bytes: int
+    failure_hits: int
+    failures: int
+    coalesced: int
+    shared_hits: int
+
+
+class _Flight:
+    """A schema load in progress, awaited by every concurrent request for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.schema: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+
+def is_core_schema(schema_path: str) -> bool:
+    """Return True if a schema belongs to the core STAC (or GeoJSON) specification.
+
+    Args:
+        schema_path (str): Path or URI of the schema.
+
+    Returns:
+        bool: True if the schema should be pinned in the schema store.
+    """
+    return schema_path.startswith(CORE_SCHEMA_PREFIXES)
+
+
+class SchemaStore:
+    """In-memory store of parsed schemas bounded by entry count and size in bytes.
+
+    Schemas are loaded through `loader`, which returns the raw schema document, and
+    kept in least-recently-used order. When the store grows past `max_entries` or
+    `max_bytes` the least recently used schemas are evicted, except for pinned ones.
+    Core STAC schemas are pinned automatically so that a crawl touching many
+    extension schemas never has to refetch the core spec.
+
+    Failed loads (a 404, a timeout, an unparsable document) are remembered for
+    `failure_ttl` seconds and raise the same error again without a new request, and
+    concurrent requests for a schema that is being loaded wait for that single load
+    instead of starting their own.
+
+    A `shared` store (see `schema_db.SqliteSchemaStore`) is consulted on a miss
+    before calling the loader, and receives every schema the loader returns, so
+    that other processes can reuse schemas this one has downloaded and parsed.
+
+    Args:
+        loader (Callable[[str], bytes]): Function returning the raw bytes of a schema.
+        max_entries (int): Maximum number of schemas held in memory.
+        max_bytes (int): Maximum total size, in raw schema bytes, held in memory.
+        failure_ttl (float): Seconds a failed load is cached.
+        shared (object): Optional store shared between processes, with `get(path)`
+            returning `(raw, schema or None)` or None, and `put(path, raw, schema)`.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], bytes],
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        failure_ttl: float = DEFAULT_FAILURE_TTL,
+        shared: Optional[Any] = None,
+    ):
+        self.loader = loader
+        self.shared = shared
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.failure_ttl = failure_ttl
+        self._entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._pinned: Set[str] = set()
+        self._failures: Dict[str, Tuple[BaseException, float]] = {}
+        self._in_flight: Dict[str, _Flight] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.failure_hits = 0
+        self.coalesced = 0
+        self.shared_hits = 0
+
+    def get(self, schema_path: str) -> Dict:
+        """Return a parsed schema, loading it on a miss.
+
+        Args:
+            schema_path (str): Path or URI of the schema.
+
+        Returns:
+            dict: The parsed schema.
+
+        Raises:
+            Exception: The error raised by the loader or the JSON parser, when loading
+                the schema failed less than `failure_ttl` seconds ago.
+        """
+        with self._lock:
+            entry = self._entries.get(schema_path)
+            if entry is not None:
+                self._entries.move_to_end(schema_path)
+                self.hits += 1
+                return entry[0]
+            failure = self._failures.get(schema_path)
+            if failure is not None:
+                if time.monotonic() < failure[1]:
+                    self.failure_hits += 1
+                    raise failure[0]
+                del self._failures[schema_path]
+            flight = self._in_flight.get(schema_path)
+            leader = flight is None
+            if flight is None:
+                flight = self._in_flight[schema_path] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.schema  # type: ignore
+
+        try:
+            try:
+                raw, schema = self._load(schema_path)
+            except Exception as e:
+                with self._lock:
+                    self._failures[schema_path] = (
+                        e,
+                        time.monotonic() + self.failure_ttl,
+                    )
+                raise
+            self.put(schema_path, schema, len(raw))
+            flight.schema = schema
+        except BaseException as e:
+            # Waiters raise it too, whatever stopped the load
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[schema_path]
+            flight.done.set()
+        return schema
+
+    def _load(self, schema_path: str) -> Tuple[bytes, Dict]:
+        shared = self.shared
+        stored = shared.get(schema_path) if shared is not None else None
+        if stored is not None:
+            raw, schema = stored
+            with self._lock:
+                self.shared_hits += 1
+            return raw, json.loads(raw) if schema is None else schema
+        raw = self.loader(schema_path)
+        schema = json.loads(raw)
+        if shared is not None:
+            shared.put(schema_path, raw, schema)
+        return raw, schema
+
+    def put(self, schema_path: str, schema: Dict, size: int) -> None:
+        """Add a parsed schema to the store, evicting older schemas if needed.
+
+        Args:
+            schema_path (str): Path or URI of the schema.
+            schema (dict): The parsed schema.
+            size (int): Size of the raw schema document in bytes.
+        """
+        with self._lock:
+            previous = self._entries.pop(schema_path, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[schema_path] = (schema, size)
+            self._failures.pop(schema_path, None)
+            self._bytes += size
+            if is_core_schema(schema_path):
+                self._pinned.add(schema_path)
+            self._evict()
+
+    def pin(self, schema_path: str) -> None:
+        """Exclude a schema from eviction.
+
+        Args:
+            schema_path (str): Path or URI of the schema.
+        """
+        with self._lock:
+            self._pinned.add(schema_path)
+
+    def unpin(self, schema_path: str) -> None:
+        """Make a pinned schema evictable again.
+
+        Args:
+            schema_path (str): Path or URI of the schema.
+        """
+        with self._lock:
+            self._pinned.discard(schema_path)
+            self._evict()
+
+    def resize(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        failure_ttl: Optional[float] = None,
+    ) -> None:
+        """Change the capacity of the store, evicting schemas that no longer fit.
+
+        Args:
+            max_entries (int): New maximum number of schemas, or None to keep it.
+            max_bytes (int): New maximum size in bytes, or None to keep it.
+            failure_ttl (float): New number of seconds failed loads are cached, or
+                None to keep it.
+        """
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if failure_ttl is not None:
+                self.failure_ttl = failure_ttl
+            self._evict()
+
+    def _evict(self) -> None:
+        for schema_path in list(self._entries):
+            if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+                break
+            if schema_path in self._pinned:
+                continue
+            _, size = self._entries.pop(schema_path)
+            self._bytes -= size
+            self.evictions += 1
+
+    def snapshot(self) -> List[Tuple[str, Dict, int]]:
+        """Return every stored schema, to warm up the store of another process.
+
+        Returns:
+            list: The path, parsed schema and size of each schema, least recently
+                used first, as accepted by `put`.
+        """
+        with self._lock:
+            return [
+                (schema_path, schema, size)
+                for schema_path, (schema, size) in self._entries.items()
+            ]
+
+    def __contains__(self, schema_path: str) -> bool:
+        with self._lock:
+            return schema_path in self._entries
+
+    def info(self) -> SchemaStoreInfo:
+        """Return hit, miss and eviction counters along with the bytes held.
+
+        `failure_hits` counts requests answered from a cached failure, `failures`
+        the failures currently cached and `coalesced` the requests that waited for
+        a load already in progress. `shared_hits` counts misses answered by the
+        shared store without calling the loader.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return SchemaStoreInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                len(self._entries),
+                self._bytes,
+                len(self._pinned & set(self._entries)),
+                self.max_entries,
+                self.max_bytes,
+                self.failure_hits,
+                sum(1 for _, expiry in self._failures.values() if expiry > now),
+                self.coalesced,
+                self.shared_hits,
+            )
+
+    def clear(self) -> None:
+        """Drop every stored schema and cached failure, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+            self._failures.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.failure_hits = 0
+            self.coalesced = 0
+            self.shared_hits = 0
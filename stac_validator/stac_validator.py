@@ -5,7 +5,21 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import click  # type: ignore
 
+from .async_crawl import DEFAULT_CONCURRENCY
+from .bundle import build_schema_bundle
+from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL
+from .compiled import ENGINES
+from .link_checker import DEFAULT_LINK_CACHE_TTL, DEFAULT_LINK_WORKERS, LinkChecker
+from .manifest import ValidationManifest
+from .request_scheduler import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_READ_TIMEOUT,
+)
+from .result_log import LOG_FORMATS, ResultCounter
+from .sampling import Sampler
 from .validate import StacValidate
+from .visited import VisitedLinks
 
 
 def _print_summary(
@@ -67,17 +81,45 @@ def print_update_message(version: str) -> None:
     click.secho()
 
 
-def item_collection_summary(message: List[Dict[str, Any]]) -> None:
+def _print_sampling_summary(sampler: Sampler) -> None:
+    """Prints the failure rate of all items estimated from a sample.
+
+    Args:
+        sampler (Sampler): The sampler of the validation.
+    """
+    low, high = sampler.failure_interval()
+    click.secho(
+        f"\n  Sampled {sampler.sampled} of {sampler.population} items, "
+        f"validated {sampler.validated}"
+    )
+    click.secho(
+        f"  Estimated item failure rate: {sampler.failure_rate * 100:.1f}% "
+        f"(95% CI {low * 100:.1f}%-{high * 100:.1f}%)"
+    )
+    click.secho(
+        f"  Estimated failing items: {round(sampler.failure_rate * sampler.population)} "
+        f"of {sampler.population} "
+        f"({round(low * sampler.population)}-{round(high * sampler.population)})"
+    )
+
+
+def item_collection_summary(
+    message: List[Dict[str, Any]], sampler: Optional[Sampler] = None
+) -> None:
     """Prints a summary of the validation results for an item collection response.
 
     Args:
         message (List[Dict[str, Any]]): The validation results for the item collection.
+        sampler (Optional[Sampler]): The sampler of the validation, to report the
+            failure rate estimated from the sample.
 
     Returns:
         None
     """
     valid_count = sum(1 for item in message if item.get("valid_stac") is True)
     _print_summary("-- Item Collection Summary", valid_count, len(message), "items")
+    if sampler is not None:
+        _print_sampling_summary(sampler)
 
 
 def collections_summary(message: List[Dict[str, Any]]) -> None:
@@ -93,36 +135,38 @@ def collections_summary(message: List[Dict[str, Any]]) -> None:
     _print_summary("-- Collections Summary", valid_count, len(message), "collections")
 
 
-def recursive_validation_summary(message: List[Dict[str, Any]]) -> None:
+def recursive_validation_summary(
+    message: List[Dict[str, Any]],
+    visited: Optional[VisitedLinks] = None,
+    manifest: Optional[ValidationManifest] = None,
+    results: Optional[ResultCounter] = None,
+    sampler: Optional[Sampler] = None,
+) -> None:
     """Prints a summary of the recursive validation results.
 
     Args:
         message (List[Dict[str, Any]]): The validation results from recursive validation.
+        visited (Optional[VisitedLinks]): The links followed by the validation, to
+            report how many duplicate links were skipped.
+        manifest (Optional[ValidationManifest]): The manifest of the validation, to
+            report how many results were reused from the previous run.
+        results (Optional[ResultCounter]): Counts of every result, used instead of
+            `message` when the results were logged rather than kept in memory.
+        sampler (Optional[Sampler]): The sampler of the validation, to report the
+            failure rate of the items estimated from the sample.
 
     Returns:
         None
     """
     # Count valid and total objects by type
-    type_counts = {}
-    total_valid = 0
-
-    for item in message:
-        if not isinstance(item, dict):
-            continue
-
-        obj_type = item.get("asset_type", "unknown").lower()
-        is_valid = item.get("valid_stac", False) is True
-
-        if obj_type not in type_counts:
-            type_counts[obj_type] = {"valid": 0, "total": 0}
-
-        type_counts[obj_type]["total"] += 1
-        if is_valid:
-            type_counts[obj_type]["valid"] += 1
-            total_valid += 1
+    if results is None:
+        results = ResultCounter()
+        for item in message:
+            results.add(item)
+    type_counts = results.by_type
 
     # Print overall summary
-    _print_summary("-- Recursive Validation Summary", total_valid, len(message))
+    _print_summary("-- Recursive Validation Summary", results.valid, results.total)
 
     # Print breakdown by type if there are multiple types
     if len(type_counts) > 1:
@@ -135,8 +179,62 @@ def recursive_validation_summary(message: List[Dict[str, Any]]) -> None:
                 f"    {obj_type.capitalize()}: {counts['valid']}/{counts['total']} ({percentage:.1f}%)"
             )
 
+    if visited is not None and visited.duplicates:
+        click.secho(
+            f"\n  Skipped {visited.duplicates} duplicate links, "
+            f"{visited.cycles} of them closing a cycle"
+        )
+
+    if manifest is not None:
+        click.secho(
+            f"\n  Reused {manifest.reused} unchanged results from the manifest, "
+            f"validated {manifest.recorded} objects"
+        )
+
+    if sampler is not None:
+        _print_sampling_summary(sampler)
+
+
+def link_check_summary(checker: LinkChecker) -> None:
+    """Prints how many link and asset checks were made and saved.
+
+    Args:
+        checker (LinkChecker): The link checker of the validation.
+
+    Returns:
+        None
+    """
+    click.secho()
+    click.secho("-- Link Check Summary:", bold=True)
+    click.secho(
+        f"  Checked {checker.requested} distinct hrefs, reused {checker.reused} "
+        f"results of this run and {checker.cached} from the link cache"
+    )
+    if checker.local:
+        click.secho(
+            f"  Checked {checker.local} local hrefs with "
+            f"{checker.listings.scanned} directory listings"
+        )
+
+
+class _ValidateByDefault(click.Group):
+    """Group running the `validate` command unless another command is named.
 
-@click.command()
+    Keeps `stac-validator STAC_FILE [OPTIONS]` working next to the subcommands.
+    """
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if not args or args[0] not in self.commands:
+            args = ["validate", *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=_ValidateByDefault)
+def main() -> None:
+    """Validate STAC objects, or build offline schema bundles."""
+
+
+@main.command("validate")
 @click.argument("stac_file")
 @click.option(
     "--core", is_flag=True, help="Validate core stac object only without extensions."
@@ -183,6 +281,68 @@ def recursive_validation_summary(message: List[Dict[str, Any]]) -> None:
     type=int,
     help="Maximum depth to traverse when recursing. Omit this argument to get full recursion. Ignored if `recursive == False`.",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of objects fetched and validated concurrently when recursing.",
+)
+@click.option(
+    "--async-crawl",
+    is_flag=True,
+    help="Fetch objects with asyncio when recursing or validating item collections and collections. Requires aiohttp.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Maximum number of fetches in flight at once with --async-crawl.",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes validating fetched objects when recursing or validating item collections and collections.",
+)
+@click.option(
+    "--checkpoint",
+    help="Save the state of a recursive validation to this file at intervals and on errors, to continue it later with --resume.",
+)
+@click.option(
+    "--resume",
+    help="Continue the recursive validation saved in this checkpoint file, and keep checkpointing to it. Cannot be used with --checkpoint.",
+)
+@click.option(
+    "--checkpoint-interval",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_CHECKPOINT_INTERVAL,
+    show_default=True,
+    help="Seconds between two checkpoints of a recursive validation.",
+)
+@click.option(
+    "--sample-rate",
+    type=click.FloatRange(min=0, max=1),
+    help="Validate this fraction of the items when recursing or validating item collections, and estimate the failure rate of all items. Items left out are not fetched.",
+)
+@click.option(
+    "--sample-per-collection",
+    type=click.IntRange(min=1),
+    help="Validate at most this many items of each catalog, collection or item collection page, and estimate the failure rate of all items.",
+)
+@click.option(
+    "--sample-seed",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Seed of the sample of items. Runs with the same seed validate the same items.",
+)
+@click.option(
+    "--manifest",
+    help="Record recursive validation results in a manifest file at this path, and reuse the results of objects unchanged since the previous run.",
+)
 @click.option(
     "--collections",
     is_flag=True,
@@ -204,6 +364,56 @@ def recursive_validation_summary(message: List[Dict[str, Any]]) -> None:
     multiple=True,
     help="HTTP header to include in the requests. Can be used multiple times.",
 )
+@click.option(
+    "--link-workers",
+    type=click.IntRange(min=1),
+    default=DEFAULT_LINK_WORKERS,
+    show_default=True,
+    help="Number of links or assets of an object checked concurrently with --links and --assets.",
+)
+@click.option(
+    "--link-cache",
+    help="Record links and assets found valid in a cache file at this path, and do not check them again in the next runs until they expire.",
+)
+@click.option(
+    "--link-cache-ttl",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_LINK_CACHE_TTL,
+    show_default=True,
+    help="Seconds before a link recorded in the --link-cache is checked again.",
+)
+@click.option(
+    "--rate-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Maximum HTTP requests per second to each host. Defaults to no limit.",
+)
+@click.option(
+    "--max-host-connections",
+    type=click.IntRange(min=1),
+    help="Maximum HTTP requests in flight to each host. Defaults to no limit.",
+)
+@click.option(
+    "--connect-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_CONNECT_TIMEOUT,
+    show_default=True,
+    help="Seconds to wait for a connection to a host.",
+)
+@click.option(
+    "--read-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_READ_TIMEOUT,
+    show_default=True,
+    help="Seconds to wait for data from a host once connected.",
+)
+@click.option(
+    "--max-retries",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_RETRIES,
+    show_default=True,
+    help="Number of times a request answered with 429 or 503 is sent again, "
+    "after its Retry-After delay.",
+)
 @click.option(
     "--pages",
     "-p",
@@ -222,6 +432,13 @@ def recursive_validation_summary(message: List[Dict[str, Any]]) -> None:
     default="",
     help="Save full recursive output to log file (local filepath).",
 )
+@click.option(
+    "--log-format",
+    type=click.Choice(LOG_FORMATS),
+    default="json",
+    show_default=True,
+    help="Format of the log file: one JSON array written at the end, or one JSON line per result written as results come. With jsonl, recursive validation only keeps counts of the results in memory.",
+)
 @click.option(
     "--pydantic",
     is_flag=True,
@@ -232,7 +449,68 @@ def recursive_validation_summary(message: List[Dict[str, Any]]) -> None:
     is_flag=True,
     help="Enable verbose output. This will output additional information during validation.",
 )
-def main(
+@click.option(
+    "--schema-cache-dir",
+    default=None,
+    help="Directory of the persistent schema cache. Defaults to the XDG cache directory.",
+)
+@click.option(
+    "--schema-cache-ttl",
+    type=int,
+    default=None,
+    help="Seconds before a cached schema is revalidated with the server. Defaults to one day.",
+)
+@click.option(
+    "--schema-cache-size",
+    type=int,
+    default=None,
+    help="Maximum number of parsed schemas kept in memory. Defaults to 256.",
+)
+@click.option(
+    "--schema-cache-max-bytes",
+    type=int,
+    default=None,
+    help="Maximum size in bytes of the parsed schemas kept in memory. Defaults to 64 MiB.",
+)
+@click.option(
+    "--schema-failure-ttl",
+    type=int,
+    default=None,
+    help="Seconds a failed schema fetch is remembered before it is retried. Defaults to 60.",
+)
+@click.option(
+    "--schema-db",
+    default=None,
+    help="Share parsed schemas between processes through a SQLite database at this path.",
+)
+@click.option(
+    "--schema-bundle",
+    default=None,
+    help="Load schemas from an offline schema bundle built with `stac-validator bundle`.",
+)
+@click.option(
+    "--flatten-schemas",
+    is_flag=True,
+    help="Validate against fully dereferenced (flattened) schemas to avoid resolving $refs during validation.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    default="jsonschema",
+    show_default=True,
+    help="JSON Schema validation engine. 'compiled' generates Python code for each schema.",
+)
+@click.option(
+    "--compiled-cache-dir",
+    help="Cache the code generated by '--engine compiled' in this directory, signed "
+    "with a key private to the user. Defaults to compiling schemas in every run.",
+)
+@click.option(
+    "--no-schema-cache",
+    is_flag=True,
+    help="Do not store downloaded schemas in the persistent schema cache.",
+)
+def validate(
     stac_file: str,
     collections: bool,
     item_collection: bool,
@@ -253,9 +531,40 @@ def main(
     log_file: str,
     pydantic: bool,
     verbose: bool = False,
+    log_format: str = "json",
+    schema_cache_dir: Optional[str] = None,
+    schema_cache_ttl: Optional[int] = None,
+    schema_cache_size: Optional[int] = None,
+    schema_cache_max_bytes: Optional[int] = None,
+    schema_failure_ttl: Optional[int] = None,
+    schema_db: Optional[str] = None,
+    schema_bundle: Optional[str] = None,
+    flatten_schemas: bool = False,
+    engine: str = "jsonschema",
+    compiled_cache_dir: Optional[str] = None,
+    workers: int = 1,
+    async_crawl: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    processes: int = 1,
+    manifest: Optional[str] = None,
+    checkpoint: Optional[str] = None,
+    resume: Optional[str] = None,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    link_workers: int = DEFAULT_LINK_WORKERS,
+    link_cache: Optional[str] = None,
+    link_cache_ttl: float = DEFAULT_LINK_CACHE_TTL,
+    rate_limit: Optional[float] = None,
+    max_host_connections: Optional[int] = None,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    sample_rate: Optional[float] = None,
+    sample_per_collection: Optional[int] = None,
+    sample_seed: int = 0,
+    no_schema_cache: bool = False,
 ):
-    """Main function for the `stac-validator` command line tool. Validates a STAC file
-    against the STAC specification and prints the validation results to the console as JSON.
+    """Validates a STAC file against the STAC specification and prints the validation
+    results to the console as JSON.
 
     Args:
         stac_file (str): Path to the STAC file to be validated.
@@ -264,9 +573,28 @@ def main(
         no_assets_urls (bool): Whether to open href links when validating assets
             (enabled by default).
         headers (dict): HTTP headers to include in the requests.
+        link_workers (int): Number of links or assets of an object checked concurrently.
+        link_cache (str): Path of a cache of the links found valid, reused by the next runs.
+        link_cache_ttl (float): Seconds before a cached link is checked again.
+        rate_limit (float): Maximum HTTP requests per second to each host.
+        max_host_connections (int): Maximum HTTP requests in flight to each host.
+        connect_timeout (float): Seconds to wait for a connection to a host.
+        read_timeout (float): Seconds to wait for data from a host once connected.
+        max_retries (int): Number of times a throttled request is sent again.
         pages (int): Maximum number of pages to validate via `item_collection`.
         recursive (bool): Whether to recursively validate all related STAC objects.
         max_depth (int): Maximum depth to traverse when recursing.
+        workers (int): Number of objects fetched and validated concurrently when recursing.
+        async_crawl (bool): Whether to fetch objects with asyncio when crawling.
+        concurrency (int): Maximum number of fetches in flight at once with `async_crawl`.
+        processes (int): Number of worker processes validating fetched objects.
+        manifest (str): Path of a manifest of recursive validation results reused by the next run.
+        checkpoint (str): Path of a file where the state of a recursive validation is saved.
+        resume (str): Path of a checkpoint file of a recursive validation to continue.
+        checkpoint_interval (float): Seconds between two checkpoints.
+        sample_rate (float): Fraction of the items to validate.
+        sample_per_collection (int): Maximum number of items validated per catalog, collection or page.
+        sample_seed (int): Seed of the sample of items.
         core (bool): Whether to validate core STAC objects only.
         extensions (bool): Whether to validate extensions only.
         links (bool): Whether to additionally validate links. Only works with default mode.
@@ -277,8 +605,20 @@ def main(
         trace_recursion (bool): Whether to enable verbose output for recursive mode.
         no_output (bool): Whether to print output to console.
         log_file (str): Path to a log file to save full recursive output.
+        log_format (str): Format of the log file, "json" or "jsonl".
         pydantic (bool): Whether to validate using stac-pydantic models for enhanced type checking and validation.
         verbose (bool): Whether to enable verbose output. This will output additional information during validation.
+        schema_cache_dir (str): Directory of the persistent schema cache.
+        schema_cache_ttl (int): Seconds before a cached schema is revalidated with the server.
+        schema_cache_size (int): Maximum number of parsed schemas kept in memory.
+        schema_cache_max_bytes (int): Maximum size in bytes of the parsed schemas kept in memory.
+        schema_failure_ttl (int): Seconds a failed schema fetch is remembered before it is retried.
+        schema_db (str): Path of a SQLite database through which parsed schemas are shared between processes.
+        schema_bundle (str): Path to an offline schema bundle to load schemas from.
+        flatten_schemas (bool): Whether to validate against fully dereferenced (flattened) schemas.
+        engine (str): JSON Schema validation engine, "jsonschema" or "compiled".
+        compiled_cache_dir (str): Directory in which generated code is cached.
+        no_schema_cache (bool): Whether to disable the persistent schema cache.
 
     Returns:
         None
@@ -295,27 +635,66 @@ def main(
     else:
         schema_map_dict = dict(schema_map)
 
-    stac = StacValidate(
-        stac_file=stac_file,
-        collections=collections,
-        item_collection=item_collection,
-        pages=pages,
-        recursive=recursive,
-        max_depth=max_depth,
-        core=core,
-        links=links,
-        assets=assets,
-        assets_open_urls=not no_assets_urls,
-        headers=dict(header),
-        extensions=extensions,
-        custom=custom,
-        schema_config=schema_config,
-        schema_map=schema_map_dict,
-        trace_recursion=trace_recursion,
-        log=log_file,
-        pydantic=pydantic,
-        verbose=verbose,
-    )
+    if checkpoint and resume:
+        # --resume keeps saving checkpoints to the file it continues from
+        raise click.UsageError("--checkpoint and --resume cannot be used together")
+
+    try:
+        stac = StacValidate(
+            stac_file=stac_file,
+            collections=collections,
+            item_collection=item_collection,
+            pages=pages,
+            recursive=recursive,
+            max_depth=max_depth,
+            core=core,
+            links=links,
+            assets=assets,
+            assets_open_urls=not no_assets_urls,
+            headers=dict(header),
+            link_workers=link_workers,
+            link_cache=link_cache,
+            link_cache_ttl=link_cache_ttl,
+            rate_limit=rate_limit,
+            max_host_connections=max_host_connections,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            extensions=extensions,
+            custom=custom,
+            schema_config=schema_config,
+            schema_map=schema_map_dict,
+            trace_recursion=trace_recursion,
+            log=log_file,
+            log_format=log_format,
+            pydantic=pydantic,
+            verbose=verbose,
+            schema_cache=not no_schema_cache,
+            schema_cache_dir=schema_cache_dir,
+            schema_cache_ttl=schema_cache_ttl,
+            schema_cache_size=schema_cache_size,
+            schema_cache_max_bytes=schema_cache_max_bytes,
+            schema_failure_ttl=schema_failure_ttl,
+            schema_db=schema_db,
+            schema_bundle=schema_bundle,
+            flatten_schemas=flatten_schemas,
+            engine=engine,
+            compiled_cache_dir=compiled_cache_dir,
+            workers=workers,
+            async_crawl=async_crawl,
+            concurrency=concurrency,
+            processes=processes,
+            manifest=manifest,
+            checkpoint=resume or checkpoint,
+            resume=resume is not None,
+            checkpoint_interval=checkpoint_interval,
+            sample_rate=sample_rate,
+            sample_per_collection=sample_per_collection,
+            sample_seed=sample_seed,
+        )
+    except ValueError as e:
+        # Options that cannot be combined
+        raise click.UsageError(str(e))
 
     try:
         if not item_collection and not collections:
@@ -326,7 +705,7 @@ def main(
             stac.validate_item_collection()
 
         message = stac.message
-        if "version" in message[0]:
+        if message and "version" in message[0]:
             print_update_message(message[0]["version"])
 
         if no_output is False:
@@ -334,11 +713,20 @@ def main(
 
         # Print appropriate summary based on validation mode
         if item_collection:
-            item_collection_summary(message)
+            item_collection_summary(message, stac.sampler)
         elif collections:
             collections_summary(message)
         elif recursive:
-            recursive_validation_summary(message)
+            recursive_validation_summary(
+                message, stac.visited, stac.manifest, stac.results, stac.sampler
+            )
+
+        checker = stac.link_checker
+        if (
+            checker is not None
+            and checker.requested + checker.saved + checker.local > 0
+        ):
+            link_check_summary(checker)
 
     finally:
         # Always print the duration, even if validation fails
@@ -350,5 +738,50 @@ def main(
     sys.exit(0 if valid else 1)
 
 
+@main.command("bundle")
+@click.argument("sources", nargs=-1, required=True)
+@click.option(
+    "--output",
+    "-o",
+    required=True,
+    help="Path of the schema bundle file to write.",
+)
+@click.option(
+    "--max-depth",
+    "-m",
+    type=int,
+    help="Maximum depth of child and item links to follow from each source. Omit this argument to crawl everything.",
+)
+@click.option(
+    "--header",
+    type=(str, str),
+    multiple=True,
+    help="HTTP header to include in the requests. Can be used multiple times.",
+)
+def bundle(sources: Tuple[str, ...], output: str, max_depth: int, header: list):
+    """Builds an offline schema bundle, for the `stac-validator bundle` command.
+
+    Crawls STAC catalogs, collections, items or item collections (or takes schema URLs
+    directly), resolves every core and extension schema together with all of their
+    transitive `$ref`s, and writes them to a single indexed bundle file that can be
+    loaded with `--schema-bundle`.
+
+    Args:
+        sources (tuple): Paths or URLs of STAC objects or schemas.
+        output (str): Path of the schema bundle file to write.
+        max_depth (int): Maximum depth of links to follow from each source.
+        header (list): HTTP headers to include in the requests.
+
+    Returns:
+        None
+    """
+    schema_uris = build_schema_bundle(
+        list(sources), output, headers=dict(header), max_depth=max_depth
+    )
+    for uri in schema_uris:
+        click.echo(uri)
+    click.secho(f"\nBundled {len(schema_uris)} schemas into {output}", fg="green")
+
+
 if __name__ == "__main__":
     main()
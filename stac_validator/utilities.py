@@ -1,10 +1,11 @@
 import functools
 import json
 import os
-import ssl
-from typing import Dict, Optional, Tuple
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
 
 import requests  # type: ignore
 import yaml  # type: ignore
@@ -13,6 +14,13 @@ from referencing import Registry, Resource  # type: ignore
 from referencing.jsonschema import DRAFT202012  # type: ignore
 from referencing.typing import URI  # type: ignore
 
+from .compiled import compile_validator, get_compiled_cache_dir
+from .flatten import flatten_schema, flattened_schema_uri
+from .request_scheduler import SCHEDULER
+from .schema_cache import get_schema_cache
+from .schema_db import SqliteSchemaStore
+from .schema_store import SchemaStore
+
 NEW_VERSIONS = [
     "1.0.0-beta.2",
     "1.0.0-rc.1",
@@ -169,7 +177,7 @@ def fetch_and_parse_file(input_path: str, headers: Optional[Dict] = None) -> Dic
     """
     try:
         if is_url(input_path):
-            resp = requests.get(input_path, headers=headers)
+            resp = SCHEDULER.get(input_path, headers=headers)
             resp.raise_for_status()
             data = resp.json()
         else:
@@ -181,15 +189,122 @@ def fetch_and_parse_file(input_path: str, headers: Optional[Dict] = None) -> Dic
         raise e
 
 
-@functools.lru_cache(maxsize=48)
+_schema_bundle = None
+
+
+def set_schema_bundle(bundle) -> None:
+    """Serve schemas from an offline schema bundle before going to the network.
+
+    Args:
+        bundle (Optional[bundle.SchemaBundle]): The loaded bundle, or None to stop
+            using a bundle.
+    """
+    global _schema_bundle
+    _schema_bundle = bundle
+
+
+def get_schema_bundle():
+    """Return the schema bundle in use, or None if no bundle is loaded."""
+    return _schema_bundle
+
+
+def fetch_schema_bytes(input_path: str) -> bytes:
+    """Fetches the raw bytes of a JSON schema file from a URL or local file.
+
+    Schemas contained in the loaded schema bundle (see `bundle.load_schema_bundle`)
+    are served from the bundle. Other remote schemas go through the persistent schema
+    cache when it is enabled (see `schema_cache.configure_schema_cache`) so that later
+    runs can skip the download.
+
+    Args:
+        input_path: A string representing the URL or local file path to the JSON schema file.
+
+    Returns:
+        The raw contents of the JSON schema file.
+
+    Raises:
+        requests.exceptions.RequestException: If there is an error while downloading the file.
+        FileNotFoundError: If a local schema file is not found.
+    """
+    bundle = _schema_bundle
+    if bundle is not None:
+        raw = bundle.get_bytes(input_path)
+        if raw is not None:
+            return raw
+    if is_url(input_path):
+        disk_cache = get_schema_cache()
+        if disk_cache is not None:
+            return disk_cache.fetch(input_path)
+        resp = SCHEDULER.get(input_path)
+        resp.raise_for_status()
+        return resp.content
+    with open(input_path, "rb") as f:
+        return f.read()
+
+
+SCHEMA_STORE = SchemaStore(loader=fetch_schema_bytes)
+
+
+def configure_schema_store(
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    failure_ttl: Optional[float] = None,
+) -> SchemaStore:
+    """Set the capacity of the process-wide schema store.
+
+    Args:
+        max_entries (int): Maximum number of parsed schemas held in memory.
+        max_bytes (int): Maximum total size of the schemas held in memory, in bytes.
+        failure_ttl (float): Seconds a failed schema fetch is cached before retrying.
+
+    Returns:
+        SchemaStore: The process-wide schema store.
+    """
+    SCHEMA_STORE.resize(
+        max_entries=max_entries, max_bytes=max_bytes, failure_ttl=failure_ttl
+    )
+    return SCHEMA_STORE
+
+
+def configure_schema_db(
+    path: Optional[str] = None,
+    ttl: Optional[int] = None,
+    enabled: bool = True,
+) -> Optional[SqliteSchemaStore]:
+    """Share parsed schemas with other processes through a SQLite database.
+
+    Once enabled, schemas missing from the in-memory `SCHEMA_STORE` are looked up in
+    the database before being downloaded, and downloaded schemas are written to it,
+    so worker processes (or invocations sharing a container) fetch and parse each
+    schema only once between them.
+
+    Args:
+        path (str): Path of the database file. Defaults to `schemas.sqlite` in the
+            XDG cache directory.
+        ttl (int): Seconds a stored schema is used before it is fetched again.
+        enabled (bool): Whether the database is used at all.
+
+    Returns:
+        Optional[SqliteSchemaStore]: The active database, or None if it is disabled.
+    """
+    if not enabled:
+        SCHEMA_STORE.shared = None
+    elif ttl is None:
+        SCHEMA_STORE.shared = SqliteSchemaStore(path)
+    else:
+        SCHEMA_STORE.shared = SqliteSchemaStore(path, ttl=ttl)
+    return SCHEMA_STORE.shared
+
+
 def fetch_and_parse_schema(input_path: str) -> Dict:
     """Fetches and parses a JSON schema file from a URL or local file using a cache.
 
     Given a URL or local file path to a JSON schema file, this function fetches the file
-    and parses its contents into a dictionary. If the input path is a valid URL, the
-    function uses the requests library to download the file, otherwise it opens the
-    local file with the json library. Additionally, this function caches the results of
-    previous function calls to reduce the number of times the file is fetched and parsed.
+    and parses its contents into a dictionary. Parsed schemas are kept in the
+    process-wide `SCHEMA_STORE`, which is bounded by entry count and size in bytes and
+    never evicts the core STAC schemas, to reduce the number of times the file is
+    fetched and parsed. When `configure_schema_db` is enabled, schemas are also
+    shared with other processes through a SQLite database.
 
     Args:
         input_path: A string representing the URL or local file path to the JSON schema file.
@@ -201,7 +316,7 @@ def fetch_and_parse_schema(input_path: str) -> Dict:
         ValueError: If the input is not a valid URL or local file path.
         requests.exceptions.RequestException: If there is an error while downloading the file.
     """
-    return fetch_and_parse_file(input_path)
+    return SCHEMA_STORE.get(input_path)
 
 
 def set_schema_addr(version: str, stac_type: str) -> str:
@@ -221,42 +336,6 @@ def set_schema_addr(version: str, stac_type: str) -> str:
         return f"https://cdn.staclint.com/v{version}/{stac_type}.json"
 
 
-def link_request(
-    link: Dict, initial_message: Dict, open_urls: bool = True, headers: Dict = {}
-) -> None:
-    """Makes a request to a URL and appends it to the relevant field of the initial message.
-
-    Args:
-        link: A dictionary containing a "href" key which is a string representing a URL.
-        initial_message: A dictionary containing lists for "request_valid", "request_invalid",
-        "format_valid", and "format_invalid" URLs.
-        open_urls: Whether to open link href URL
-        headers: HTTP headers to include in the request
-
-    Returns:
-        None
-
-    """
-    if is_url(link["href"]):
-        try:
-            if open_urls:
-                request = Request(link["href"], headers=headers)
-                if "s3" in link["href"]:
-                    context = ssl._create_unverified_context()
-                    response = urlopen(request, context=context)
-                else:
-                    response = urlopen(request)
-                status_code = response.getcode()
-                if status_code == 200:
-                    initial_message["request_valid"].append(link["href"])
-        except Exception:
-            initial_message["request_invalid"].append(link["href"])
-        initial_message["format_valid"].append(link["href"])
-    else:
-        initial_message["request_invalid"].append(link["href"])
-        initial_message["format_invalid"].append(link["href"])
-
-
 def cached_retrieve(uri: URI, schema_map: Optional[Dict] = None) -> Resource[Dict]:
     """
     Retrieve and cache a remote schema.
@@ -277,6 +356,21 @@ def cached_retrieve(uri: URI, schema_map: Optional[Dict] = None) -> Resource[Dic
     )
 
 
+def map_schema_path(schema_path: str, schema_map: Optional[Dict] = None) -> str:
+    """Return the location a schema is loaded from, once overridden by a schema map.
+
+    Args:
+        schema_path (str): Path or URI of the schema.
+        schema_map (dict): Override schema location to validate against local versions of a schema
+
+    Returns:
+        str: The path or URI of the schema in `SCHEMA_STORE`.
+    """
+    if schema_map and schema_path in schema_map:
+        return schema_map[schema_path]
+    return schema_path
+
+
 def fetch_schema_with_override(
     schema_path: str, schema_map: Optional[Dict] = None
 ) -> Dict:
@@ -290,25 +384,391 @@ def fetch_schema_with_override(
     Returns:
         dict: The parsed JSON dict of the schema.
     """
+    return fetch_and_parse_schema(map_schema_path(schema_path, schema_map))
 
-    if schema_map:
-        if schema_path in schema_map:
-            schema_path = schema_map[schema_path]
 
-    # Load the schema
-    return fetch_and_parse_schema(schema_path)
+def schema_refs(node, base_uri: str) -> Iterator[str]:
+    """Yield the absolute document URI of every `$ref` in a schema.
+
+    Args:
+        node: The parsed schema, or any sub-schema of it.
+        base_uri (str): URI the schema was loaded from, used to resolve relative refs.
+
+    Yields:
+        str: The URI of each referenced document, without fragment. Refs within the
+            schema itself yield its own URI.
+    """
+    if isinstance(node, dict):
+        if isinstance(node.get("$id"), str):
+            base_uri = urljoin(base_uri, node["$id"])
+        if isinstance(node.get("$ref"), str):
+            yield urldefrag(urljoin(base_uri, node["$ref"]))[0]
+        for key, value in node.items():
+            if key not in ("enum", "const"):
+                yield from schema_refs(value, base_uri)
+    elif isinstance(node, list):
+        for value in node:
+            yield from schema_refs(value, base_uri)
+
+
+DEFAULT_PREFETCH_WORKERS = 8
+
+_PREFETCHED: Set[Tuple[str, Tuple]] = set()
+_PREFETCHED_LOCK = threading.Lock()
+
+
+def prefetch_schemas(
+    schema_paths: Iterable[str],
+    schema_map: Optional[Dict] = None,
+    max_workers: int = DEFAULT_PREFETCH_WORKERS,
+) -> bool:
+    """Fetch schemas and every schema they transitively `$ref`, concurrently.
+
+    The schemas of each wave (the given schemas, then the documents they reference
+    that were not seen yet, and so on) are fetched in parallel into `SCHEMA_STORE`,
+    so validating an object against N uncached schemas costs about one round trip
+    per level of `$ref`s instead of one per schema. Schemas whose references were
+    already prefetched in this process are skipped without any work.
+
+    Fetch errors are ignored here: they are raised again, and reported as usual,
+    when the schema is used for validation. Schemas are only recorded as prefetched
+    once they and all their references were fetched, so a failed fetch is tried
+    again by the next prefetch.
+
+    Args:
+        schema_paths (Iterable[str]): Paths or URIs of the schemas.
+        schema_map (dict): Override schema location to validate against local versions of a schema
+        max_workers (int): Maximum number of schemas fetched at the same time.
+
+    Returns:
+        bool: Whether every schema and reference was fetched.
+    """
+    map_key = schema_map_key(schema_map)
+    with _PREFETCHED_LOCK:
+        wave = [path for path in dict.fromkeys(schema_paths) if path]
+        wave = [path for path in wave if (path, map_key) not in _PREFETCHED]
+    if not wave:
+        return True
+
+    seen: Set[str] = set(wave)
+    failed = False
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while wave:
+            futures = [
+                (path, executor.submit(fetch_schema_with_override, path, schema_map))
+                for path in wave
+            ]
+            wave = []
+            for path, future in futures:
+                try:
+                    schema = future.result()
+                except Exception:
+                    failed = True
+                    continue
+                for ref in schema_refs(schema, path):
+                    if ref and ref not in seen:
+                        seen.add(ref)
+                        wave.append(ref)
+
+    if failed:
+        # The schemas fetched are in SCHEMA_STORE, so prefetching them again is cheap
+        return False
+    with _PREFETCHED_LOCK:
+        _PREFETCHED.update((path, map_key) for path in seen)
+    return True
+
+
+def clear_prefetched_schemas() -> None:
+    """Forget which schemas were prefetched, so they are prefetched again if needed."""
+    with _PREFETCHED_LOCK:
+        _PREFETCHED.clear()
+
+
+class ValidatorCacheInfo(NamedTuple):
+    """Statistics reported by `ValidatorCache.info()`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int
+
+
+class ValidatorCache:
+    """Process-wide LRU cache of ready-to-use JSON Schema validators.
+
+    Building a `Draft202012Validator` means wrapping the schema in a `Resource`,
+    creating a `Registry` and, during the first validation, crawling every `$ref`
+    the schema points to. Validators are keyed by the schema URI and the effective
+    schema_map so that every object validated against the same schema reuses one
+    compiled validator (and the `$ref` resolutions it has already performed).
+
+    Args:
+        maxsize (int): Maximum number of validators to keep before evicting the least
+            recently used one.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._validators: "OrderedDict[Tuple, Draft202012Validator]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Incremented by `clear`, so that holders of validators know to drop them
+        self.generation = 0
+
+    def get(
+        self,
+        schema_path: str,
+        schema_map: Optional[Dict] = None,
+        flatten: bool = False,
+        engine: str = "jsonschema",
+    ) -> Draft202012Validator:
+        """Return the cached validator for a schema, building it on a miss.
+
+        Args:
+            schema_path (str): Path or URI of the JSON Schema.
+            schema_map (dict): Override schema location to validate against local versions of a schema
+            flatten (bool): Whether to validate against the flattened form of the schema.
+            engine (str): Validation engine, "jsonschema" or "compiled".
+
+        Returns:
+            Draft202012Validator: A validator for the schema.
+        """
+        # The compiled engine always works on the flattened schema
+        flatten = flatten or engine == "compiled"
+        key = (schema_path, schema_map_key(schema_map), flatten, engine)
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is not None:
+                self._validators.move_to_end(key)
+                self.hits += 1
+                return validator
+            self.misses += 1
+
+        validator = build_validator(
+            schema_path, schema_map=schema_map, flatten=flatten, engine=engine
+        )
+
+        with self._lock:
+            self._validators[key] = validator
+            self._validators.move_to_end(key)
+            while len(self._validators) > self.maxsize:
+                self._validators.popitem(last=False)
+                self.evictions += 1
+        return validator
+
+    def info(self) -> ValidatorCacheInfo:
+        """Return hit, miss and eviction counters along with the current size."""
+        with self._lock:
+            return ValidatorCacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                len(self._validators),
+                self.maxsize,
+            )
+
+    def clear(self) -> None:
+        """Drop every cached validator and reset the counters."""
+        with self._lock:
+            self._validators.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.generation += 1
+
+
+VALIDATOR_CACHE = ValidatorCache()
+
+
+def schema_map_key(schema_map: Optional[Dict] = None) -> Tuple:
+    """Return a hashable representation of a schema_map for use in cache keys.
+
+    Args:
+        schema_map (dict): Override schema location to validate against local versions of a schema
+
+    Returns:
+        tuple: The sorted schema_map items, or an empty tuple if there is no map.
+    """
+    if not schema_map:
+        return ()
+    return tuple(sorted(schema_map.items()))
+
+
+class SharedRegistry:
+    """Long-lived `referencing.Registry` shared by every validator of a schema_map.
+
+    Every `$ref` target retrieved while validating any object is wrapped in a
+    `Resource` once and added to the shared registry, so that core and extension
+    schemas referencing the same sub-schemas (GeoJSON definitions, the basics and
+    datetime fragments of the core spec) never retrieve or wrap them again in this
+    process. Across runs, the raw documents come from the persistent schema cache or
+    a schema bundle.
+
+    Args:
+        schema_map (dict): Override schema location to validate against local versions of a schema
+    """
+
+    def __init__(self, schema_map: Optional[Dict] = None):
+        self.schema_map = schema_map
+        self._lock = threading.Lock()
+        self._resources: Dict[str, Resource] = {}
+        self._registry: Registry = Registry(retrieve=self._retrieve)  # type: ignore
+        self.retrievals = 0
+
+    def _retrieve(self, uri: URI) -> Resource:
+        with self._lock:
+            resource = self._resources.get(uri)
+        if resource is None:
+            resource = cached_retrieve(uri, schema_map=self.schema_map)
+            self.add(uri, resource)
+        return resource
+
+    def add(self, uri: str, resource: Resource) -> None:
+        """Add a resource to the shared registry.
+
+        Args:
+            uri (str): The URI the resource is registered under.
+            resource (Resource): The wrapped schema.
+        """
+        with self._lock:
+            if uri not in self._resources:
+                self.retrievals += 1
+                self._resources[uri] = resource
+                self._registry = self._registry.with_resource(
+                    uri=uri, resource=resource
+                )
+
+    def registry_for(self, schema_path: str, schema: Dict) -> Registry:
+        """Return a crawled registry containing a root schema and every known resource.
+
+        Args:
+            schema_path (str): Path or URI of the root JSON Schema.
+            schema (dict): The parsed root JSON Schema.
+
+        Returns:
+            Registry: A registry that retrieves unknown `$ref`s into the shared registry.
+        """
+        with self._lock:
+            resource = self._resources.get(schema_path)
+        if resource is None:
+            resource = Resource(contents=schema, specification=DRAFT202012)  # type: ignore
+            self.add(schema_path, resource)
+        with self._lock:
+            self._registry = self._registry.crawl()
+            return self._registry
+
+
+_SHARED_REGISTRIES: Dict[Tuple, SharedRegistry] = {}
+_SHARED_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_shared_registry(schema_map: Optional[Dict] = None) -> SharedRegistry:
+    """Return the process-wide shared registry for a schema_map.
+
+    Args:
+        schema_map (dict): Override schema location to validate against local versions of a schema
+
+    Returns:
+        SharedRegistry: The registry used by every validator built with this schema_map.
+    """
+    key = schema_map_key(schema_map)
+    with _SHARED_REGISTRIES_LOCK:
+        shared = _SHARED_REGISTRIES.get(key)
+        if shared is None:
+            shared = _SHARED_REGISTRIES[key] = SharedRegistry(schema_map)
+        return shared
+
+
+def clear_shared_registries() -> None:
+    """Drop every shared registry, forcing `$ref` targets to be retrieved again."""
+    with _SHARED_REGISTRIES_LOCK:
+        _SHARED_REGISTRIES.clear()
+
+
+def build_validator(
+    schema_path: str,
+    schema_map: Optional[Dict] = None,
+    flatten: bool = False,
+    engine: str = "jsonschema",
+) -> Draft202012Validator:
+    """
+    Build a JSON Schema validator with dynamic reference resolution.
+
+    The validator resolves `$ref`s through the shared registry of its schema_map, so
+    sub-schemas already retrieved for other validators are reused. With `flatten`, it
+    validates against the fully dereferenced form of the schema (see
+    `flatten.flatten_schema`) and no longer resolves references while validating.
+    The "compiled" engine turns the flattened schema into generated Python code (see
+    `compiled.compile_validator`), cached on disk if a directory was set with
+    `compiled.configure_compiled_cache`.
+
+    Args:
+        schema_path (str): Path or URI of the JSON Schema.
+        schema_map (dict): Override schema location to validate against local versions of a schema
+        flatten (bool): Whether to validate against the flattened form of the schema.
+        engine (str): Validation engine, "jsonschema" or "compiled".
+
+    Returns:
+        Draft202012Validator: A validator whose registry resolves remote `$ref`s.
+
+    Raises:
+        requests.RequestException: If fetching a remote schema fails.
+        FileNotFoundError: If a local schema file is not found.
+    """
+    schema = fetch_schema_with_override(schema_path, schema_map=schema_map)
+    registry = get_shared_registry(schema_map).registry_for(schema_path, schema)
+    if flatten or engine == "compiled":
+        schema = flatten_schema(
+            schema_path,
+            functools.partial(fetch_schema_with_override, schema_map=schema_map),
+        )
+        registry = registry.with_resource(
+            uri=flattened_schema_uri(schema_path),
+            resource=Resource(contents=schema, specification=DRAFT202012),  # type: ignore
+        )
+    validator = Draft202012Validator(schema, registry=registry)
+    if engine == "compiled":
+        return compile_validator(
+            validator, schema_path, cache_dir=get_compiled_cache_dir()
+        )
+    return validator
+
+
+def get_flattened_schema(schema_path: str, schema_map: Optional[Dict] = None) -> Dict:
+    """Return the cached, fully dereferenced form of a schema.
+
+    Args:
+        schema_path (str): Path or URI of the JSON Schema.
+        schema_map (dict): Override schema location to validate against local versions of a schema
+
+    Returns:
+        dict: The flattened schema.
+    """
+    return VALIDATOR_CACHE.get(schema_path, schema_map=schema_map, flatten=True).schema
 
 
 def validate_with_ref_resolver(
-    schema_path: str, content: Dict, schema_map: Optional[Dict] = None
+    schema_path: str,
+    content: Dict,
+    schema_map: Optional[Dict] = None,
+    flatten: bool = False,
+    engine: str = "jsonschema",
 ) -> None:
     """
     Validate a JSON document against a JSON Schema with dynamic reference resolution.
 
+    The validator for each (schema, schema_map) pair is built once and reused from
+    `VALIDATOR_CACHE` for every subsequent document.
+
     Args:
         schema_path (str): Path or URI of the JSON Schema.
         content (dict): JSON content to validate.
         schema_map (dict): Override schema location to validate against local versions of a schema
+        flatten (bool): Whether to validate against the flattened form of the schema.
+        engine (str): Validation engine, "jsonschema" or "compiled".
 
     Raises:
         jsonschema.exceptions.ValidationError: If validation fails.
@@ -316,18 +776,9 @@ def validate_with_ref_resolver(
         FileNotFoundError: If a local schema file is not found.
         Exception: If any other error occurs during validation.
     """
-    schema = fetch_schema_with_override(schema_path, schema_map=schema_map)
-    # Set up the resource and registry for schema resolution
-    cached_retrieve_with_schema_map = functools.partial(
-        cached_retrieve, schema_map=schema_map
+    validator = VALIDATOR_CACHE.get(
+        schema_path, schema_map=schema_map, flatten=flatten, engine=engine
     )
-    resource: Resource = Resource(contents=schema, specification=DRAFT202012)  # type: ignore
-    registry: Registry = Registry(retrieve=cached_retrieve_with_schema_map).with_resource(  # type: ignore
-        uri=schema_path, resource=resource
-    )  # type: ignore
-
-    # Validate the content against the schema
-    validator = Draft202012Validator(schema, registry=registry)
     validator.validate(content)
 
 
@@ -1,7 +1,25 @@
+import asyncio
+import contextlib
+import copy
+import functools
 import json
 import os
+import queue
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from json.decoder import JSONDecodeError
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib.error import HTTPError, URLError
 
 import click  # type: ignore
@@ -9,18 +27,73 @@ import jsonschema  # type: ignore
 from jsonschema.exceptions import best_match
 from requests import exceptions  # type: ignore
 
+from .async_crawl import DEFAULT_CONCURRENCY, AsyncFetcher, run_coroutine
+from .bundle import load_schema_bundle
+from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL, CrawlCheckpoint, CrawlFrame
+from .compiled import ENGINES, configure_compiled_cache
+from .link_checker import (
+    DEFAULT_LINK_CACHE_TTL,
+    DEFAULT_LINK_WORKERS,
+    LinkCache,
+    LinkChecker,
+)
+from .manifest import ValidationManifest, schema_set_hash
+from .process_pool import ProcessValidationPool, ReportedError
+from .request_scheduler import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_READ_TIMEOUT,
+    configure_request_scheduler,
+)
+from .result_log import (
+    LOG_FORMATS,
+    JsonArrayLog,
+    JsonLinesLog,
+    ResultCounter,
+    open_result_log,
+)
+from .sampling import Sampler
+from .schema_cache import configure_schema_cache
 from .utilities import (
+    configure_schema_db,
+    configure_schema_store,
     extract_relevant_oneof_error,
     fetch_and_parse_file,
     fetch_and_parse_schema,
     get_stac_type,
     is_valid_url,
-    link_request,
     load_schema_config,
+    prefetch_schemas,
     set_schema_addr,
+    set_schema_bundle,
     validate_stac_version_field,
     validate_with_ref_resolver,
 )
+from .validation_plan import PLAN_CACHE, ValidationPlan
+from .visited import VisitedLinks, normalize_href
+
+
+class _RecursiveResult(NamedTuple):
+    """An object fetched and validated by a worker of a parallel recursive run."""
+
+    stac_file: str
+    stac_content: Optional[Dict]
+    message: Optional[Dict]
+    valid: bool
+    error: Optional[Exception]
+    schema: Optional[str] = None
+
+
+# Maximum number of results `StacValidate.iter_results` produces ahead of its caller
+DEFAULT_RESULT_BUFFER = 1000
+
+
+class _ResultsClosed(BaseException):
+    """Stops a validation whose streamed results are no longer consumed.
+
+    Derives from BaseException so that the error handling of the validation does
+    not report it as a validation error.
+    """
 
 
 class StacValidate:
@@ -39,14 +112,45 @@ class StacValidate:
         assets (bool): Whether to additionally validate assets (only works in default mode).
         assets_open_urls (bool): Whether to open assets URLs when validating assets.
         headers (dict): HTTP headers to include in the requests.
+        link_workers (int): Number of links or assets of an object checked concurrently.
+        link_cache (Optional[str]): Path of a file where links found valid are recorded, and not checked again by the next runs.
+        link_cache_ttl (float): Seconds before a link recorded in `link_cache` is checked again.
+        rate_limit (Optional[float]): Maximum HTTP requests per second to each host. Defaults to no limit.
+        max_host_connections (Optional[int]): Maximum HTTP requests in flight to each host. Defaults to no limit.
+        connect_timeout (float): Seconds to wait for a connection to a host. Defaults to 10.
+        read_timeout (float): Seconds to wait for data from a host once connected. Defaults to 60.
+        max_retries (int): Number of times a request answered with 429 or 503 is sent again, after its `Retry-After` delay. Defaults to 3.
         extensions (bool): Whether to only validate STAC object extensions.
         custom (str): The local filepath or remote URL of a custom JSON schema to validate the STAC object.
         trace_recursion (bool): Whether to enable verbose output in recursive mode.
         log (str): The local filepath to save the output of the recursive validation to.
+        log_format (str): Format of the log file, "json" (one JSON array written at the end) or "jsonl" (one JSON line per result, written as results come).
         pydantic (bool): Whether to validate using Pydantic models.
         schema_config (str): The local filepath or remote URL of a custom JSON schema config to validate the STAC object.
         schema_map (Optional[Dict[str, str]]): A dictionary mapping schema paths to their replacements.
         verbose (bool): Whether to enable verbose output.
+        schema_cache (bool): Whether to store downloaded schemas in the persistent schema cache. Defaults to False, the command line enables it.
+        schema_cache_dir (Optional[str]): Directory of the persistent schema cache (defaults to the XDG cache).
+        schema_cache_ttl (Optional[int]): Seconds before a cached schema is revalidated with the server.
+        schema_cache_size (Optional[int]): Maximum number of parsed schemas kept in memory.
+        schema_cache_max_bytes (Optional[int]): Maximum size in bytes of the parsed schemas kept in memory.
+        schema_failure_ttl (Optional[int]): Seconds a failed schema fetch is remembered before it is retried.
+        schema_db (Optional[str]): Path of a SQLite database through which parsed schemas are shared with other processes.
+        schema_bundle (Optional[str]): Path to an offline schema bundle to load schemas from. A validator without one unloads the bundle of an earlier validator.
+        flatten_schemas (bool): Whether to validate against fully dereferenced (flattened) schemas.
+        engine (str): JSON Schema validation engine, "jsonschema" or "compiled" (generated Python code).
+        compiled_cache_dir (Optional[str]): Directory in which the "compiled" engine caches generated code, signed with a key private to the user. Schemas are compiled again in every process if None.
+        workers (int): Number of objects fetched and validated concurrently in recursive mode.
+        async_crawl (bool): Whether to fetch objects with asyncio in the recursive, item collection and collections modes.
+        concurrency (int): Maximum number of fetches in flight at once with `async_crawl`.
+        processes (int): Number of worker processes validating fetched objects in the recursive, item collection and collections modes.
+        manifest (Optional[str]): Path of a manifest of recursive validation results, whose unchanged objects are not validated again.
+        checkpoint (Optional[str]): Path of a file where the state of a recursive validation is saved at intervals, and on errors.
+        resume (bool): Whether to continue the recursive validation saved in `checkpoint` instead of starting from `stac_file`.
+        checkpoint_interval (float): Seconds between two checkpoints.
+        sample_rate (Optional[float]): Fraction of the items validated in the recursive and item collection modes, the others are not fetched.
+        sample_per_collection (Optional[int]): Maximum number of items validated per catalog, collection or item collection page.
+        sample_seed (int): Seed of the sample of items.
 
     Methods:
         run(): Validates the STAC object and returns whether it is valid.
@@ -66,20 +170,60 @@ class StacValidate:
         assets: bool = False,
         assets_open_urls: bool = True,
         headers: dict = {},
+        link_workers: int = DEFAULT_LINK_WORKERS,
+        link_cache: Optional[str] = None,
+        link_cache_ttl: float = DEFAULT_LINK_CACHE_TTL,
+        rate_limit: Optional[float] = None,
+        max_host_connections: Optional[int] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
         extensions: bool = False,
         custom: str = "",
         schema_config: Optional[str] = None,
         schema_map: Optional[Dict[str, str]] = None,
         trace_recursion: bool = False,
         log: str = "",
+        log_format: str = "json",
         pydantic: bool = False,
         verbose: bool = False,
+        schema_cache: bool = False,
+        schema_cache_dir: Optional[str] = None,
+        schema_cache_ttl: Optional[int] = None,
+        schema_cache_size: Optional[int] = None,
+        schema_cache_max_bytes: Optional[int] = None,
+        schema_failure_ttl: Optional[int] = None,
+        schema_db: Optional[str] = None,
+        schema_bundle: Optional[str] = None,
+        flatten_schemas: bool = False,
+        engine: str = "jsonschema",
+        compiled_cache_dir: Optional[str] = None,
+        workers: int = 1,
+        async_crawl: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        processes: int = 1,
+        manifest: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        resume: bool = False,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+        sample_rate: Optional[float] = None,
+        sample_per_collection: Optional[int] = None,
+        sample_seed: int = 0,
     ):
+        # Keep the arguments to build the same validator in worker processes
+        self._options = {
+            name: value for name, value in locals().items() if name != "self"
+        }
         self.stac_file = stac_file
+        self._root_file = stac_file
         self.collections = collections
         self.item_collection = item_collection
         self.pages = pages
         self.message: List = []
+        # Receives each message instead of `message` while results are streamed
+        self._sink: Optional[Callable[[Dict], None]] = None
+        # The JSON Lines log written by `_sink` during a recursive validation
+        self._result_log: Optional[JsonLinesLog] = None
         self._schema = custom
         self.schema_map = schema_map
         self.schema_config = schema_config
@@ -87,6 +231,13 @@ class StacValidate:
         self.assets = assets
         self.assets_open_urls = assets_open_urls
         self.headers: Dict = headers
+        # Shared by the copies of the validator, to reuse its pooled connections
+        self.link_workers = link_workers
+        self.link_cache = link_cache
+        self.link_cache_ttl = link_cache_ttl
+        self.link_checker: Optional[LinkChecker] = None
+        if links or assets:
+            self._link_checker()
         self.recursive = recursive
         self.max_depth = max_depth
         self.extensions = extensions
@@ -95,11 +246,74 @@ class StacValidate:
         self.version = ""
         self.depth: int = 0
         self.skip_val = False
+        self.visited = VisitedLinks()
         self.trace_recursion = trace_recursion
         self.valid = False
         self.log = log
+        if log_format not in LOG_FORMATS:
+            raise ValueError(
+                f"Unknown log format '{log_format}', expected one of {LOG_FORMATS}"
+            )
+        self.log_format = log_format
+        # Counts the results of a recursive validation logged as JSON Lines
+        self.results: Optional[ResultCounter] = None
         self.pydantic = pydantic
         self.verbose = verbose
+        self.flatten_schemas = flatten_schemas
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown validation engine '{engine}', expected one of {ENGINES}"
+            )
+        self.engine = engine
+        configure_compiled_cache(compiled_cache_dir)
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.async_crawl = async_crawl
+        self.concurrency = concurrency
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        self.processes = processes
+        self._process_pool: Optional[ProcessValidationPool] = None
+        if resume and not checkpoint:
+            raise ValueError("resume requires a checkpoint")
+        if checkpoint and (workers > 1 or processes > 1 or async_crawl):
+            raise ValueError(
+                "checkpoints are only supported by the serial recursive validation"
+            )
+        self._checkpoint: Optional[CrawlCheckpoint] = None
+        if checkpoint:
+            self._checkpoint = CrawlCheckpoint(checkpoint, checkpoint_interval)
+        self.resume = resume
+        self.sampler: Optional[Sampler] = None
+        if sample_rate is not None or sample_per_collection is not None:
+            if collections:
+                raise ValueError(
+                    "sampling is only supported by the recursive and item "
+                    "collection validations"
+                )
+            self.sampler = Sampler(sample_rate, sample_per_collection, sample_seed)
+
+        configure_schema_cache(
+            cache_dir=schema_cache_dir, ttl=schema_cache_ttl, enabled=schema_cache
+        )
+        configure_schema_store(
+            max_entries=schema_cache_size,
+            max_bytes=schema_cache_max_bytes,
+            failure_ttl=schema_failure_ttl,
+        )
+        configure_request_scheduler(
+            rate=rate_limit,
+            max_connections=max_host_connections,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+        )
+        configure_schema_db(schema_db, ttl=schema_cache_ttl, enabled=bool(schema_db))
+        if schema_bundle:
+            load_schema_bundle(schema_bundle)
+        else:
+            set_schema_bundle(None)
 
         self._original_schema_paths = {}
         cli_schema_map = schema_map or {}
@@ -139,6 +353,18 @@ class StacValidate:
         # Merge config with CLI (CLI wins)
         self.schema_map = {**config_mappings, **cli_schema_map}
 
+        self.manifest: Optional[ValidationManifest] = None
+        if manifest:
+            settings = {
+                "engine": engine,
+                "pydantic": pydantic,
+                "flatten_schemas": flatten_schemas,
+                "custom": custom,
+            }
+            self.manifest = ValidationManifest(
+                manifest, schema_set_hash(settings, self.schema_map)
+            )
+
     @property
     def schema(self) -> str:
         return self._schema
@@ -402,12 +628,26 @@ class StacValidate:
         initial_message = self.create_links_message()
         assets = self.stac_content.get("assets")
         if assets:
-            for asset in assets.values():
-                link_request(
-                    asset, initial_message, self.assets_open_urls, self.headers
-                )
+            self._link_checker().check_links(
+                assets.values(),
+                initial_message,
+                self.assets_open_urls,
+                base=self._links_base(),
+            )
         return initial_message
 
+    def _link_checker(self) -> LinkChecker:
+        if self.link_checker is None:
+            cache = None
+            if self.link_cache:
+                cache = LinkCache(self.link_cache, self.link_cache_ttl)
+            self.link_checker = LinkChecker(self.headers, self.link_workers, cache)
+        return self.link_checker
+
+    def _links_base(self) -> Optional[str]:
+        """Return the document path that relative links and assets are resolved against."""
+        return self.stac_file if isinstance(self.stac_file, str) else None
+
     def links_validator(self) -> Dict:
         """
         Validate the 'links' field in STAC content.
@@ -425,11 +665,14 @@ class StacValidate:
                     link["href"].split("/")[0] + "//" + link["href"].split("/")[2]
                 )
 
-        # Validate each link, making it absolute if necessary
+        # Make each link absolute if necessary, then validate them all. Without a
+        # root URL, relative links are checked against the local document
         for link in self.stac_content["links"]:
-            if not is_valid_url(link["href"]):
+            if root_url and not is_valid_url(link["href"]):
                 link["href"] = root_url + link["href"][1:]
-            link_request(link, initial_message, True, self.headers)
+        self._link_checker().check_links(
+            self.stac_content["links"], initial_message, base=self._links_base()
+        )
 
         return initial_message
 
@@ -446,18 +689,30 @@ class StacValidate:
         """
         if is_valid_url(self.schema):
             validate_with_ref_resolver(
-                self.schema, self.stac_content, schema_map=self.schema_map
+                self.schema,
+                self.stac_content,
+                schema_map=self.schema_map,
+                flatten=self.flatten_schemas,
+                engine=self.engine,
             )
         elif os.path.exists(self.schema):
             validate_with_ref_resolver(
-                self.schema, self.stac_content, schema_map=self.schema_map
+                self.schema,
+                self.stac_content,
+                schema_map=self.schema_map,
+                flatten=self.flatten_schemas,
+                engine=self.engine,
             )
         else:
             file_directory = os.path.dirname(os.path.abspath(str(self.stac_file)))
             schema = os.path.join(file_directory, self.schema)
             schema = os.path.abspath(os.path.realpath(schema))
             validate_with_ref_resolver(
-                schema, self.stac_content, schema_map=self.schema_map
+                schema,
+                self.stac_content,
+                schema_map=self.schema_map,
+                flatten=self.flatten_schemas,
+                engine=self.engine,
             )
 
     def core_validator(self, stac_type: str) -> None:
@@ -467,12 +722,51 @@ class StacValidate:
         Args:
             stac_type (str): The type of the STAC object (e.g., "item", "collection").
         """
-        stac_type = stac_type.lower()
-        self.schema = set_schema_addr(self.version, stac_type)
-        validate_with_ref_resolver(
-            self.schema, self.stac_content, schema_map=self.schema_map
+        plan = self._validation_plan(stac_type)
+        self.schema = plan.core_schema
+        plan.core_validator().validate(self.stac_content)
+
+    def _validation_plan(self, stac_type: str) -> ValidationPlan:
+        """Return the shared validation plan of objects like the STAC content."""
+        return PLAN_CACHE.get(
+            self.version,
+            stac_type,
+            self.stac_content.get("stac_extensions") or (),
+            schema_map=self.schema_map,
+            flatten=self.flatten_schemas,
+            engine=self.engine,
         )
 
+    def _prefetch_schemas(self, stac_type: str, core: bool = False) -> bool:
+        """
+        Fetch the remote extension schemas of the STAC object, and their `$ref`s,
+        concurrently before validating against them one by one.
+
+        Args:
+            stac_type (str): The STAC object type.
+            core (bool): Whether to also prefetch the core schema.
+
+        Returns:
+            bool: Whether every schema was fetched.
+        """
+        schemas = []
+        if core:
+            schemas.append(set_schema_addr(self.version, stac_type.lower()))
+        version = "1.0.0-beta.1" if self.version == "1.0.0-beta.2" else self.version
+        extensions = self.stac_content.get("stac_extensions")
+        for extension in extensions if isinstance(extensions, list) else []:
+            if not isinstance(extension, str):
+                continue
+            if extension == "proj":
+                extension = "projection"
+            if is_valid_url(extension):
+                schemas.append(extension)
+            elif not extension.endswith(".json"):
+                schemas.append(
+                    f"https://cdn.staclint.com/v{version}/extension/{extension}.json"
+                )
+        return prefetch_schemas(schemas, schema_map=self.schema_map)
+
     def extensions_validator(self, stac_type: str) -> Dict:
         """
         Validate STAC extensions for an ITEM or validate the core schema for a COLLECTION.
@@ -488,6 +782,9 @@ class StacValidate:
         valid = True
 
         try:
+            plan = self._validation_plan(stac_type)
+            if not plan.prefetched:
+                plan.prefetched = self._prefetch_schemas(stac_type)
             if (
                 "stac_extensions" in self.stac_content
                 and len(self.stac_content["stac_extensions"]) > 0
@@ -497,18 +794,17 @@ class StacValidate:
                     index = self.stac_content["stac_extensions"].index("proj")
                     self.stac_content["stac_extensions"][index] = "projection"
 
-                schemas = self.stac_content["stac_extensions"]
-                for extension in schemas:
-                    if not (is_valid_url(extension) or extension.endswith(".json")):
-                        if self.version == "1.0.0-beta.2":
-                            self.stac_content["stac_version"] = "1.0.0-beta.1"
-                            self.version = self.stac_content["stac_version"]
-                        extension = (
-                            f"https://cdn.staclint.com/v{self.version}/extension/"
-                            f"{extension}.json"
-                        )
+                for index, name in enumerate(plan.extensions):
+                    extension = plan.extension_schema(index)
+                    if extension != name and self.version == "1.0.0-beta.2":
+                        self.stac_content["stac_version"] = "1.0.0-beta.1"
+                        self.version = self.stac_content["stac_version"]
                     self.schema = extension
-                    self.custom_validator()
+                    validator = plan.extension_validator(index)
+                    if validator is None:
+                        self.custom_validator()
+                    else:
+                        validator.validate(self.stac_content)
                     display_path = self._original_schema_paths.get(extension, extension)
                     message["schema"].append(display_path)
             else:
@@ -578,6 +874,10 @@ class StacValidate:
         message = self.create_message(stac_type, "default")
         message["schema"] = []
 
+        plan = self._validation_plan(stac_type)
+        if stac_type.upper() in ("ITEM", "COLLECTION") and not plan.prefetched:
+            plan.prefetched = self._prefetch_schemas(stac_type, core=True)
+
         # Validate core
         self.core_validator(stac_type)
         core_schema = self.schema
@@ -604,158 +904,861 @@ class StacValidate:
 
         return message
 
-    def recursive_validator(self, stac_type: str) -> bool:
+    def _recursive_link_path(self, base_url: str, address: str) -> str:
+        """Return the path of a child or item link relative to its parent object."""
+        if is_valid_url(address):
+            return address
+        path_parts = str(base_url).split("/")
+        path_parts.pop(-1)
+        root = path_parts[0]
+        for i in range(1, len(path_parts)):
+            root = f"{root}/{path_parts[i]}"
+        return f"{root}/{address}"
+
+    def _reused_result(
+        self, stac_file: str, stac_content: Dict
+    ) -> Optional[Tuple[Dict, str]]:
+        """Return the manifest result of an object unchanged since it was recorded."""
+        if self.manifest is None:
+            return None
+        return self.manifest.get(stac_file, stac_content)
+
+    def _record_result(
+        self, stac_file: str, stac_content: Dict, message: Dict, schema: str
+    ) -> None:
+        if self.manifest is not None:
+            self.manifest.put(stac_file, stac_content, message, schema)
+
+    def _manifest_validation(self, validate: Callable[[], Dict]) -> Dict:
         """
-        Recursively validate a STAC JSON document and its children/items.
+        Validate the current object of a recursive validation, unless the manifest
+        holds its result, and record the result in the manifest.
 
-        Follows "child" and "item" links, calling the appropriate validator on each.
-        Uses pydantic_validator if self.pydantic is True, otherwise uses default_validator.
+        Args:
+            validate (Callable): Validates the current object and returns its message.
+
+        Returns:
+            dict: The validation message.
+        """
+        stac_file = str(self.stac_file)
+        reused = self._reused_result(stac_file, self.stac_content)
+        if reused is not None:
+            message, self._schema = reused
+            return message
+        message = validate()
+        self._record_result(stac_file, self.stac_content, message, self.schema)
+        return message
+
+    def _validate_recursive_node(self, stac_type: str) -> Tuple[Dict, bool]:
+        """
+        Validate the current catalog or collection of a recursive validation.
 
         Args:
             stac_type (str): The STAC object type to validate.
 
         Returns:
-            bool: True if all validations are successful, False otherwise.
+            tuple: The validation message and whether the object is valid.
         """
-        valid = False
-        if not self.skip_val:
-            self.schema = set_schema_addr(self.version, stac_type.lower())
-            message = self.create_message(stac_type, "recursive")
-            message["valid_stac"] = False
-            # Add validator_engine field to track validation method
-            message["validator_engine"] = "pydantic" if self.pydantic else "jsonschema"
+        message = self._manifest_validation(
+            functools.partial(self._check_recursive_node, stac_type)
+        )
+        return message, message["valid_stac"]
 
-            try:
-                if self.pydantic:
-                    # Set pydantic model info in schema field
-                    model_name = f"stac-pydantic {stac_type.capitalize()} model"
-                    message["schema"] = [model_name]
-                    # Run pydantic validation
-                    msg = self.pydantic_validator(stac_type)
-                else:
-                    msg = self.default_validator(stac_type)
-                    message["schema"] = msg["schema"]
+    def _check_recursive_node(self, stac_type: str) -> Dict:
+        self.schema = set_schema_addr(self.version, stac_type.lower())
+        message = self.create_message(stac_type, "recursive")
+        message["valid_stac"] = False
+        # Add validator_engine field to track validation method
+        message["validator_engine"] = "pydantic" if self.pydantic else self.engine
 
-            except jsonschema.exceptions.ValidationError as e:
-                if e.context:
-                    e = best_match(e.context)  # type: ignore
-                if e.absolute_path:
-                    err_msg = (
-                        f"{e.message}. Error is in "
-                        f"{' -> '.join([str(i) for i in e.absolute_path])} "
-                    )
-                else:
-                    err_msg = f"{e.message}"
+        try:
+            if self.pydantic:
+                # Set pydantic model info in schema field
+                model_name = f"stac-pydantic {stac_type.capitalize()} model"
+                message["schema"] = [model_name]
+                # Run pydantic validation
+                msg = self.pydantic_validator(stac_type)
+            else:
+                msg = self.default_validator(stac_type)
+                message["schema"] = msg["schema"]
+
+        except jsonschema.exceptions.ValidationError as e:
+            if e.context:
+                e = best_match(e.context)  # type: ignore
+            if e.absolute_path:
+                err_msg = (
+                    f"{e.message}. Error is in "
+                    f"{' -> '.join([str(i) for i in e.absolute_path])} "
+                )
+            else:
+                err_msg = f"{e.message}"
+            message.update(
+                self.create_err_msg(
+                    err_type="JSONSchemaValidationError",
+                    err_msg=err_msg,
+                    error_obj=e,
+                    schema_uri=(
+                        e.schema.get("$id", "")
+                        if hasattr(e, "schema") and isinstance(e.schema, dict)
+                        else ""
+                    ),
+                )
+            )
+            return message
+        except Exception as e:
+            if self.pydantic and "pydantic" in str(e.__class__.__module__):
                 message.update(
                     self.create_err_msg(
-                        err_type="JSONSchemaValidationError",
-                        err_msg=err_msg,
+                        err_type="PydanticValidationError",
+                        err_msg=str(e),
                         error_obj=e,
-                        schema_uri=(
-                            e.schema.get("$id", "")
-                            if hasattr(e, "schema") and isinstance(e.schema, dict)
-                            else ""
-                        ),
                     )
                 )
-                self.message.append(message)
-                if self.trace_recursion:
-                    click.echo(json.dumps(message, indent=4))
-                return valid
-            except Exception as e:
-                if self.pydantic and "pydantic" in str(e.__class__.__module__):
-                    message.update(
-                        self.create_err_msg(
-                            err_type="PydanticValidationError",
-                            err_msg=str(e),
-                            error_obj=e,
-                        )
+                return message
+            raise
+
+        message["valid_stac"] = True
+        return message
+
+    def _validate_recursive_item(self, stac_type: str) -> Dict:
+        """
+        Validate the current item of a recursive validation.
+
+        Args:
+            stac_type (str): The STAC object type to validate.
+
+        Returns:
+            dict: The validation message.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the item is invalid, which ends
+                the recursive validation.
+        """
+        return self._manifest_validation(
+            functools.partial(self._check_recursive_item, stac_type)
+        )
+
+    def _check_recursive_item(self, stac_type: str) -> Dict:
+        self.schema = set_schema_addr(self.version, stac_type.lower())
+        message = self.create_message(stac_type, "recursive")
+        message["validator_engine"] = "pydantic" if self.pydantic else self.engine
+        try:
+            if self.pydantic:
+                # Set pydantic model info in schema field for child items
+                model_name = f"stac-pydantic {stac_type.capitalize()} model"
+                message["schema"] = [model_name]
+                # Run pydantic validation
+                msg = self.pydantic_validator(stac_type)
+            elif self.version == "0.7.0":
+                schema = fetch_and_parse_schema(self.schema)
+                # Prevent unknown url type issue
+                schema["allOf"] = [{}]
+                jsonschema.validate(self.stac_content, schema)
+            else:
+                msg = self.default_validator(stac_type)
+                message["schema"] = msg["schema"]
+            message["valid_stac"] = True
+        except Exception as e:
+            if self.pydantic and "pydantic" in str(e.__class__.__module__):
+                message.update(
+                    self.create_err_msg(
+                        err_type="PydanticValidationError",
+                        err_msg=str(e),
+                        error_obj=e,
                     )
-                    self.message.append(message)
-                    if self.trace_recursion:
-                        click.echo(json.dumps(message, indent=4))
-                    return valid
+                )
+                message["valid_stac"] = False
+            else:
                 raise
+        return message
 
-            valid = True
-            message["valid_stac"] = valid
+    def _emit(self, message: Dict) -> None:
+        """Report a validation message, to `message` or to the results being streamed."""
+        if self._sink is not None:
+            self._sink(message)
+        else:
             self.message.append(message)
-            if self.trace_recursion:
-                click.echo(json.dumps(message, indent=4))
+
+    def _report_recursive_message(self, message: Dict) -> None:
+        self._emit(message)
+        if self.trace_recursion:
+            click.echo(json.dumps(message, indent=4))
+
+    def _keep_item_messages(self) -> bool:
+        return bool(self.log or (not self.max_depth or self.max_depth < 5))
+
+    def recursive_validator(self, stac_type: str) -> bool:
+        """
+        Recursively validate a STAC JSON document and its children/items.
+
+        Follows "child" and "item" links, calling the appropriate validator on each.
+        Uses pydantic_validator if self.pydantic is True, otherwise uses default_validator.
+
+        Args:
+            stac_type (str): The STAC object type to validate.
+
+        Returns:
+            bool: True if all validations are successful, False otherwise.
+        """
+        if self.skip_val:
+            return False
+        message, valid = self._validate_recursive_node(stac_type)
+        self._report_recursive_message(message)
+        if not valid:
+            return valid
+        return self._crawl([self._enter_node(str(self.stac_file), self.stac_content)])
+
+    def _enter_node(self, href: str, stac_content: Dict) -> CrawlFrame:
+        """Start following the links of a valid catalog or collection."""
+        self.depth += 1
+        if self.max_depth and self.depth >= self.max_depth:
+            self.skip_val = True
+        links = self._node_links(href, stac_content)
+        self.visited.push(href)
+        return CrawlFrame(href, links)
+
+    def _node_links(self, href: str, stac_content: Dict) -> List[Tuple[str, str]]:
+        """Return the relation and path of the child and item links to follow."""
+        links = [
+            (link["rel"], self._recursive_link_path(href, link["href"]))
+            for link in stac_content["links"]
+            if link["rel"] in ("child", "item")
+        ]
+        if self.sampler is None:
+            return links
+        # Only the sampled items are fetched, every child is
+        items = [link for link in links if link[0] == "item"]
+        sampled = {
+            id(link) for link in self.sampler.sample(items, lambda link: link[1])
+        }
+        return [link for link in links if link[0] == "child" or id(link) in sampled]
+
+    def _report_recursive_item(self, message: Dict) -> None:
+        if self.sampler is not None:
+            self.sampler.record(message["valid_stac"])
+        if self._keep_item_messages():
+            self._emit(message)
+
+    def _report_sampled_item_error(self, error: Exception) -> None:
+        """
+        Report an invalid item of a recursive validation with sampling.
+
+        Without sampling, an invalid item ends the recursive validation. With
+        sampling, it is reported and the validation goes on, so that the failure
+        rate of the items can be estimated.
+        """
+        if isinstance(error, ReportedError):
+            schema_error = (
+                error.message.get("error_type") == "JSONSchemaValidationError"
+            )
+        else:
+            schema_error = isinstance(error, jsonschema.exceptions.ValidationError)
+        if self.sampler is None or not schema_error:
+            raise error
+        self.sampler.record(False)
+        self._emit(self._exception_message(error))
+
+    def _crawl(self, frames: List[CrawlFrame]) -> bool:
+        """
+        Follow the links of a stack of catalogs and collections depth-first.
+
+        The links of the innermost frame are followed first, and a valid child
+        pushes a frame of its own. A link is removed from its frame once it has
+        been followed, so that at any time the frames are the frontier of the
+        crawl, which is saved at intervals with a `checkpoint` and when the crawl
+        stops on an error.
+
+        Args:
+            frames (list): The frames to follow, outermost first.
+
+        Returns:
+            bool: Whether the outermost frame and its children are valid.
+        """
+        valid = False
+        try:
+            while frames:
+                frame = frames[-1]
+                if not frame.links:
+                    frames.pop()
+                    self.visited.pop()
+                    valid = frame.valid
+                    if frames:
+                        frames[-1].valid = frames[-1].valid and valid
+                    continue
+                rel, path = frame.links[0]
+                child = None
+                # Objects linked more than once are only validated once
+                if self.visited.seen(path):
+                    self.visited.visit(path)
+                else:
+                    child = self._follow_link(frame, rel, path)
+                frame.links.popleft()
+                if child is not None:
+                    frames.append(child)
+                if self._checkpoint is not None and self._checkpoint.due():
+                    self._save_checkpoint(frames)
+        except BaseException:
+            if self._checkpoint is not None and frames:
+                self._save_checkpoint(frames)
+            raise
+        if self._checkpoint is not None:
+            self._checkpoint.remove()
+        return valid
+
+    def _follow_link(
+        self, frame: CrawlFrame, rel: str, path: str
+    ) -> Optional[CrawlFrame]:
+        """
+        Fetch and validate the object of a child or item link.
+
+        The link is only marked as visited once its object is validated, so that
+        a crawl resumed after an error follows it again.
+
+        Returns:
+            Optional[CrawlFrame]: The frame of a valid child whose links are to be
+                followed, or None.
+        """
+        self.stac_file = path
+        self.stac_content = fetch_and_parse_file(str(self.stac_file), self.headers)
+        self.stac_content["stac_version"] = self.version
+        stac_type = get_stac_type(self.stac_content).lower()
+
+        if rel == "item":
+            try:
+                message = self._validate_recursive_item(stac_type)
+            except jsonschema.exceptions.ValidationError as e:
+                self._report_sampled_item_error(e)
+            else:
+                self._report_recursive_item(message)
+            self.visited.visit(path)
+            return None
+
+        if self.skip_val:
+            # Skipped children are still fetched
+            self.visited.visit(path)
+            return None
+        message, valid = self._validate_recursive_node(stac_type)
+        self._report_recursive_message(message)
+        self.visited.visit(path)
+        if not valid:
+            frame.valid = False
+            return None
+        return self._enter_node(path, self.stac_content)
+
+    def _save_checkpoint(self, frames: List[CrawlFrame]) -> None:
+        state = {
+            "stac_file": normalize_href(str(self._root_file)),
+            "version": self.version,
+            "depth": self.depth,
+            "skip_val": self.skip_val,
+            "visited": self.visited.dump(),
+        }
+        if self.sampler is not None:
+            state["sample"] = self.sampler.dump()
+        # The results reported so far, so that the resumed validation reports them.
+        # A JSON Lines log already holds them, so only its size is saved.
+        if self.results is not None and self._result_log is not None:
+            state["results"] = self.results.dump()
+            state["log_size"] = self._result_log.tell()
+        else:
+            state["message"] = self.message
+        self._checkpoint.save(state, frames)  # type: ignore
+
+    def _resume_crawl(self) -> bool:
+        """
+        Continue a recursive validation from its last checkpoint.
+
+        Returns:
+            bool: True if all validations are successful, False otherwise.
+
+        Raises:
+            FileNotFoundError: If there is no checkpoint.
+            ValueError: If the checkpoint is of the crawl of another catalog.
+        """
+        state, frames = self._checkpoint.load()  # type: ignore
+        if state["stac_file"] != normalize_href(str(self._root_file)):
+            raise ValueError(
+                f"The checkpoint {self._checkpoint.path} is of the validation "  # type: ignore
+                f"of {state['stac_file']}"
+            )
+        self.version = state["version"]
+        self.depth = state["depth"]
+        self.skip_val = state["skip_val"]
+        self.visited = VisitedLinks.load(state["visited"])
+        if self.sampler is not None and "sample" in state:
+            self.sampler.load(state["sample"])
+        self.message = state.get("message", [])
+        if self.results is not None and self._result_log is not None:
+            # Drop the results logged after the checkpoint, which are reported again
+            self._result_log.truncate(state.get("log_size", 0))
+            if "results" in state:
+                self.results.load(state["results"])
+        for frame in frames:
+            self.visited.push(frame.href)
+        return self._crawl(frames)
+
+    def _recursive_task(
+        self,
+        stac_file: str,
+        stac_content: Optional[Dict],
+        rel: str,
+        validate: bool = True,
+        stac_type: Optional[str] = None,
+    ) -> _RecursiveResult:
+        """
+        Fetch and validate one object of a parallel recursive validation.
+
+        Runs in a worker thread on a copy of the validator, so that each object has
+        its own `stac_file`, `stac_content` and `schema`. Errors are returned rather
+        than raised so that they surface in traversal order.
+
+        Args:
+            stac_file (str): Path or URL of the object.
+            stac_content (Optional[dict]): The object, or None to fetch it.
+            rel (str): "child" for catalogs and collections, "item" for items.
+            validate (bool): Whether to validate a child, or only fetch it.
+            stac_type (Optional[str]): The object type, detected if None.
+
+        Returns:
+            _RecursiveResult: The fetched object and its validation message.
+        """
+        worker = copy.copy(self)
+        worker.message = []
+        worker._sink = None
+        worker.stac_file = stac_file
+        if stac_content is None:
+            try:
+                stac_content = fetch_and_parse_file(stac_file, self.headers)
+            except Exception as e:
+                return _RecursiveResult(stac_file, None, None, False, e)
+            stac_content["stac_version"] = self.version
+        if self._process_pool is not None and (rel == "item" or validate):
+            reused = self._reused_result(stac_file, stac_content)
+            if reused is not None:
+                message, schema = reused
+                return _RecursiveResult(
+                    stac_file,
+                    None if rel == "item" else stac_content,
+                    message,
+                    rel == "item" or message["valid_stac"],
+                    None,
+                    schema,
+                )
+            result = self._process_pool.submit(
+                "_recursive_task",
+                self.version,
+                stac_file,
+                stac_content,
+                rel,
+                validate,
+                stac_type,
+            ).result()
+            if result.message is not None and result.schema is not None:
+                self._record_result(
+                    stac_file, stac_content, result.message, result.schema
+                )
+            return result
+        worker.stac_content = stac_content
+        try:
+            if stac_type is None:
+                stac_type = get_stac_type(stac_content).lower()
+            if rel == "item":
+                message = worker._validate_recursive_item(stac_type)
+                # Only the message of an item is needed once it is validated
+                return _RecursiveResult(
+                    stac_file, None, message, True, None, worker.schema
+                )
+            if not validate:
+                return _RecursiveResult(stac_file, None, None, False, None)
+            message, valid = worker._validate_recursive_node(stac_type)
+            return _RecursiveResult(
+                stac_file, stac_content, message, valid, None, worker.schema
+            )
+        except Exception as e:
+            return _RecursiveResult(
+                stac_file, stac_content, None, False, e, worker.schema
+            )
+
+    def _recursive_result(self, result: _RecursiveResult) -> _RecursiveResult:
+        if result.schema is not None:
+            # Track the schema of the last validated object, like a serial run
+            self._schema = result.schema
+        if result.error is not None:
+            # Report the error for the object it occurred in, like a serial run
+            self.stac_file = result.stac_file
+            if result.stac_content:
+                self.stac_content = result.stac_content
+            raise result.error
+        return result
+
+    def parallel_recursive_validator(self, stac_type: str) -> bool:
+        """
+        Recursively validate a STAC JSON document and its children/items in parallel.
+
+        Children and items are fetched and validated by a pool of `workers` threads,
+        each on its own copy of the validator, as soon as their parent is validated.
+        Results are collected in the same depth-first order as `recursive_validator`,
+        so the messages, `max_depth` handling and the validity returned are the same.
+
+        Args:
+            stac_type (str): The STAC object type to validate.
+
+        Returns:
+            bool: True if all validations are successful, False otherwise.
+        """
+        executor = ThreadPoolExecutor(max_workers=max(self.workers, self.processes))
+        futures: List[Future] = []
+
+        def submit(*args) -> Future:
+            future = executor.submit(self._recursive_task, *args)
+            futures.append(future)
+            return future
+
+        def collect_node(future: Future) -> bool:
+            result = self._recursive_result(future.result())
+            self._report_recursive_message(result.message)  # type: ignore
+            if not result.valid:
+                return False
 
             self.depth += 1
             if self.max_depth and self.depth >= self.max_depth:
                 self.skip_val = True
 
-            base_url = self.stac_file
+            links = []
+            for rel, path in self._node_links(
+                result.stac_file, result.stac_content  # type: ignore
+            ):
+                validate = rel == "item" or not self.skip_val
+                # Links visited before are not fetched again, but links first
+                # met in a sibling subtree are only dropped when collected
+                link_future = None
+                if not self.visited.seen(path):
+                    link_future = submit(path, None, rel, validate)
+                links.append((rel, path, link_future))
 
             child_validity = []
-            for link in self.stac_content["links"]:
-                if link["rel"] in ("child", "item"):
-                    address = link["href"]
-                    if not is_valid_url(address):
-                        path_parts = str(base_url).split("/")
-                        path_parts.pop(-1)
-                        root = path_parts[0]
-                        for i in range(1, len(path_parts)):
-                            root = f"{root}/{path_parts[i]}"
-                        self.stac_file = f"{root}/{address}"
+            with self.visited.within(result.stac_file):  # type: ignore
+                for rel, path, link_future in links:
+                    # Unsubmitted links were always visited before
+                    if not self.visited.visit(path) or link_future is None:
+                        if link_future is not None:
+                            link_future.cancel()
+                        continue
+                    if rel == "child" and not self.skip_val:
+                        child_validity.append(collect_node(link_future))
+                    elif rel == "child":
+                        # Skipped children are still fetched, like in a serial run
+                        self._recursive_result(link_future.result())
                     else:
-                        self.stac_file = address
-
-                    self.stac_content = fetch_and_parse_file(
-                        str(self.stac_file), self.headers
-                    )
-                    self.stac_content["stac_version"] = self.version
-                    stac_type = get_stac_type(self.stac_content).lower()
-
-                if link["rel"] == "child":
-                    if not self.skip_val:
-                        valid_child = self.recursive_validator(stac_type)
-                        child_validity.append(valid_child)
-
-                if link["rel"] == "item":
-                    self.schema = set_schema_addr(self.version, stac_type.lower())
-                    message = self.create_message(stac_type, "recursive")
-                    message["validator_engine"] = (
-                        "pydantic" if self.pydantic else "jsonschema"
-                    )
-                    try:
-                        if self.pydantic:
-                            # Set pydantic model info in schema field for child items
-                            model_name = f"stac-pydantic {stac_type.capitalize()} model"
-                            message["schema"] = [model_name]
-                            # Run pydantic validation
-                            msg = self.pydantic_validator(stac_type)
-                        elif self.version == "0.7.0":
-                            schema = fetch_and_parse_schema(self.schema)
-                            # Prevent unknown url type issue
-                            schema["allOf"] = [{}]
-                            jsonschema.validate(self.stac_content, schema)
+                        try:
+                            result = self._recursive_result(link_future.result())
+                        except (
+                            jsonschema.exceptions.ValidationError,
+                            ReportedError,
+                        ) as e:
+                            self._report_sampled_item_error(e)
                         else:
-                            msg = self.default_validator(stac_type)
-                            message["schema"] = msg["schema"]
-                        message["valid_stac"] = True
-                    except Exception as e:
-                        if self.pydantic and "pydantic" in str(e.__class__.__module__):
-                            message.update(
-                                self.create_err_msg(
-                                    err_type="PydanticValidationError",
-                                    err_msg=str(e),
-                                    error_obj=e,
-                                )
-                            )
-                            message["valid_stac"] = False
+                            self._report_recursive_item(result.message)  # type: ignore
+            return all(child_validity)
+
+        try:
+            return collect_node(
+                submit(str(self.stac_file), self.stac_content, "child", True, stac_type)
+            )
+        finally:
+            for future in futures:
+                future.cancel()
+            if self._process_pool is not None:
+                self._process_pool.cancel_pending()
+            executor.shutdown(wait=True)
+
+    @contextlib.contextmanager
+    def _validation_processes(self) -> Iterator[None]:
+        """Run the worker processes of `processes` for the duration of a validation."""
+        if self.processes <= 1 or self._process_pool is not None:
+            yield
+            return
+        if self.version:
+            # Start the workers with the core schemas already parsed
+            prefetch_schemas(
+                [
+                    set_schema_addr(self.version, stac_type)
+                    for stac_type in ("catalog", "collection", "item")
+                ],
+                schema_map=self.schema_map,
+            )
+        options = dict(
+            self._options,
+            stac_file=None,
+            log="",
+            workers=1,
+            async_crawl=False,
+            processes=1,
+            # Results are looked up and recorded by the parent process
+            manifest=None,
+        )
+        self._process_pool = ProcessValidationPool(self.processes, options)
+        try:
+            yield
+        finally:
+            pool, self._process_pool = self._process_pool, None
+            pool.close()
+
+    def _process_task(self, method: str, version: str, args: Tuple) -> Any:
+        """
+        Run a validation method in a worker process of a `ProcessValidationPool`.
+
+        Errors of recursive validations are replaced by a `ReportedError` holding
+        the message `run` would report for them, since they cannot be pickled.
+
+        Args:
+            method (str): Name of the method to call.
+            version (str): STAC version of the validation.
+            args (tuple): Arguments of the method.
+
+        Returns:
+            Any: The result of the method.
+        """
+        self.version = version
+        result = getattr(self, method)(*args)
+        if isinstance(result, _RecursiveResult) and result.error is not None:
+            reporter = copy.copy(self)
+            reporter.stac_file = result.stac_file
+            if result.schema is not None:
+                reporter._schema = result.schema
+            if result.stac_content:
+                reporter.stac_content = result.stac_content
+            error = ReportedError(reporter._exception_message(result.error))
+            result = result._replace(error=error)
+        return result
+
+    def _submit_validation(
+        self, executor: Executor, method: str, *args
+    ) -> "asyncio.Future":
+        """Validate in the worker processes if there are some, otherwise in `executor`."""
+        if self._process_pool is not None:
+            return asyncio.wrap_future(
+                self._process_pool.submit(method, self.version, *args)
+            )
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(executor, getattr(self, method), *args)
+
+    def _submit_recursive_task(self, executor: Executor, *args) -> "asyncio.Future":
+        """Validate an object of an async recursive validation with `_recursive_task`.
+
+        With a manifest, the task runs in `executor` even if there are worker
+        processes, so that results are looked up and recorded in this process.
+        """
+        if self.manifest is not None:
+            loop = asyncio.get_running_loop()
+            return loop.run_in_executor(executor, self._recursive_task, *args)
+        return self._submit_validation(executor, "_recursive_task", *args)
+
+    def _run_async(self, crawl: Callable[..., Awaitable]) -> Any:
+        """Run an async crawl with a fetcher and an executor for validation."""
+
+        async def main():
+            async with AsyncFetcher(self.headers, self.concurrency) as fetcher:
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    return await crawl(fetcher, executor)
+
+        return run_coroutine(main())
+
+    async def _async_recursive_task(
+        self,
+        fetcher: AsyncFetcher,
+        executor: Executor,
+        stac_file: str,
+        rel: str,
+        validate: bool,
+    ) -> _RecursiveResult:
+        """Fetch an object of an async recursive validation and validate it in the executor."""
+        try:
+            stac_content = await fetcher.fetch(stac_file)
+        except Exception as e:
+            return _RecursiveResult(stac_file, None, None, False, e)
+        stac_content["stac_version"] = self.version
+        if rel == "child" and not validate:
+            return _RecursiveResult(stac_file, None, None, False, None)
+        return await self._submit_recursive_task(executor, stac_file, stac_content, rel)
+
+    async def _async_recursive_validator(
+        self, stac_type: str, fetcher: AsyncFetcher, executor: Executor
+    ) -> bool:
+        """
+        Recursively validate a STAC JSON document and its children/items with asyncio.
+
+        Works like `parallel_recursive_validator`, except that children and items are
+        fetched by `fetcher`, with up to `concurrency` requests in flight, and only
+        their validation runs in `executor`.
+
+        Args:
+            stac_type (str): The STAC object type to validate.
+            fetcher (AsyncFetcher): The fetcher for children and items.
+            executor (Executor): The executor validating the fetched objects.
+
+        Returns:
+            bool: True if all validations are successful, False otherwise.
+        """
+        tasks: List[asyncio.Future] = []
+
+        def submit(stac_file: str, rel: str, validate: bool) -> asyncio.Future:
+            task = asyncio.ensure_future(
+                self._async_recursive_task(fetcher, executor, stac_file, rel, validate)
+            )
+            tasks.append(task)
+            return task
+
+        async def collect_node(task: asyncio.Future) -> bool:
+            result = self._recursive_result(await task)
+            self._report_recursive_message(result.message)  # type: ignore
+            if not result.valid:
+                return False
+
+            self.depth += 1
+            if self.max_depth and self.depth >= self.max_depth:
+                self.skip_val = True
+
+            links = []
+            for rel, path in self._node_links(
+                result.stac_file, result.stac_content  # type: ignore
+            ):
+                validate = rel == "item" or not self.skip_val
+                # Links visited before are not fetched again, but links first
+                # met in a sibling subtree are only dropped when collected
+                link_task = None
+                if not self.visited.seen(path):
+                    link_task = submit(path, rel, validate)
+                links.append((rel, path, link_task))
+
+            child_validity = []
+            with self.visited.within(result.stac_file):  # type: ignore
+                for rel, path, link_task in links:
+                    # Unsubmitted links were always visited before
+                    if not self.visited.visit(path) or link_task is None:
+                        if link_task is not None:
+                            link_task.cancel()
+                        continue
+                    if rel == "child" and not self.skip_val:
+                        child_validity.append(await collect_node(link_task))
+                    elif rel == "child":
+                        # Skipped children are still fetched, like in a serial run
+                        self._recursive_result(await link_task)
+                    else:
+                        try:
+                            result = self._recursive_result(await link_task)
+                        except (
+                            jsonschema.exceptions.ValidationError,
+                            ReportedError,
+                        ) as e:
+                            self._report_sampled_item_error(e)
                         else:
-                            raise
+                            self._report_recursive_item(result.message)  # type: ignore
+            return all(child_validity)
+
+        root = self._submit_recursive_task(
+            executor,
+            str(self.stac_file),
+            self.stac_content,
+            "child",
+            True,
+            stac_type,
+        )
+        tasks.append(root)
+        try:
+            return await collect_node(root)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _validate_dict_copy(
+        self, stac_file: Optional[str], stac_content: Dict
+    ) -> Tuple[List, bool]:
+        """Validate a dictionary on a copy of the validator, returning its messages and validity."""
+        worker = copy.copy(self)
+        worker.message = []
+        worker._sink = None
+        worker.log = ""
+        worker.stac_file = stac_file
+        worker.schema = ""
+        valid = worker.validate_dict(stac_content)
+        return worker.message, valid
+
+    async def _collect_dict_validations(self, futures: List[asyncio.Future]) -> None:
+        for future in futures:
+            messages, self.valid = await future
+            if self.sampler is not None:
+                self.sampler.record(self.valid)
+            for message in messages:
+                self._emit(message)
+
+    def _write_log(self) -> None:
+        if self.log and self._sink is None:
+            with open(self.log, "w") as f:
+                f.write(json.dumps(self.message, indent=4))
 
-                    if self.log or (not self.max_depth or self.max_depth < 5):
-                        self.message.append(message)
-            if all(child_validity):
-                valid = True
-            else:
-                valid = False
-        return valid
+    async def _async_validate_collections(
+        self, fetcher: AsyncFetcher, executor: Executor
+    ) -> None:
+        """Validate the collections of a /collections endpoint concurrently, in order."""
+        collections = await fetcher.fetch(str(self.stac_file))
+        futures = [
+            self._submit_validation(
+                executor, "_validate_dict_copy", self.stac_file, collection
+            )
+            for collection in collections["collections"]
+        ]
+        await self._collect_dict_validations(futures)
+        self._write_log()
+
+    async def _async_validate_item_collection(
+        self, fetcher: AsyncFetcher, executor: Executor
+    ) -> None:
+        """
+        Validate an item collection and its pages concurrently, in order.
+
+        The items of a page are validated in `executor` while the next page is
+        fetched, and their messages are collected in the order of a serial run.
+        """
+
+        def submit(item_collection: Dict) -> List[asyncio.Future]:
+            return [
+                self._submit_validation(executor, "_validate_dict_copy", path, item)
+                for path, item in self._item_collection_items(item_collection)
+            ]
+
+        page = 1
+        print(f"processing page {page}")
+        item_collection = await fetcher.fetch(str(self.stac_file))
+        pending = submit(item_collection)
+
+        try:
+            if self.pages is not None:
+                for _ in range(self.pages - 1):
+                    next_links = [
+                        link["href"]
+                        for link in item_collection.get("links", [])
+                        if link["rel"] == "next"
+                    ]
+                    if not next_links:
+                        continue
+                    page += 1
+                    print(f"processing page {page}")
+                    self.stac_file = next_links[0]
+                    item_collection = await fetcher.fetch(str(self.stac_file))
+                    await self._collect_dict_validations(pending)
+                    pending = submit(item_collection)
+        except Exception as e:
+            await self._collect_dict_validations(pending)
+            pending = []
+            message = {
+                "pagination_error": (
+                    f"Validating the item collection failed on page {page}: {str(e)}"
+                )
+            }
+            self._emit(message)
+        await self._collect_dict_validations(pending)
+        self._write_log()
 
     def validate_dict(self, stac_content: Dict) -> bool:
         """
@@ -777,22 +1780,59 @@ class StacValidate:
         Args:
             item_collection (dict): The dictionary representation of the item collection.
         """
+        if self.processes > 1:
+            self._validate_item_collection_dict_in_processes(item_collection)
+            return
+
         # Store the original stac_file to restore it later
         original_stac_file = self.stac_file
 
-        for item in item_collection["features"]:
-            # Update the path to include the item ID for better traceability
-            if isinstance(original_stac_file, str) and "id" in item:
-                # Remove any query string from the URL before appending the item ID
-                base_url = original_stac_file.split("?")[0]
-                self.stac_file = f"{base_url}/{item['id']}"
-
+        for path, item in self._item_collection_items(item_collection):
+            self.stac_file = path
             self.schema = ""
-            self.validate_dict(item)
+            valid = self.validate_dict(item)
+            if self.sampler is not None:
+                self.sampler.record(valid)
 
         # Restore the original stac_file
         self.stac_file = original_stac_file
 
+    def _item_collection_items(self, item_collection: Dict) -> List[Tuple[Any, Dict]]:
+        """Return the path and content of the items of a page to validate."""
+        items = []
+        path = self.stac_file
+        for item in item_collection["features"]:
+            # Update the path to include the item ID for better traceability
+            if isinstance(self.stac_file, str) and "id" in item:
+                # Remove any query string from the URL before appending the item ID
+                path = f"{self.stac_file.split('?')[0]}/{item['id']}"
+            items.append((path, item))
+        if self.sampler is not None:
+            items = self.sampler.sample(items, lambda entry: str(entry[0]))
+        return items
+
+    def _validate_item_collection_dict_in_processes(
+        self, item_collection: Dict
+    ) -> None:
+        """Validate the items of an item collection in the worker processes, in order."""
+        with self._validation_processes():
+            futures = [
+                self._process_pool.submit(  # type: ignore
+                    "_validate_dict_copy", self.version, path, item
+                )
+                for path, item in self._item_collection_items(item_collection)
+            ]
+            self._collect_process_validations(futures)
+
+    def _collect_process_validations(self, futures: List[Future]) -> None:
+        for future in futures:
+            messages, self.valid = future.result()
+            if self.sampler is not None:
+                self.sampler.record(self.valid)
+            for message in messages:
+                self._emit(message)
+        self._write_log()
+
     def validate_collections(self) -> None:
         """
         Validate STAC Collections from a /collections endpoint.
@@ -803,7 +1843,22 @@ class StacValidate:
             jsonschema.exceptions.ValidationError, Exception: Various errors
             during fetching or parsing.
         """
+        if self.async_crawl:
+            with self._validation_processes():
+                self._run_async(self._async_validate_collections)
+            return
         collections = fetch_and_parse_file(str(self.stac_file), self.headers)
+        if self.processes > 1:
+            with self._validation_processes():
+                self._collect_process_validations(
+                    [
+                        self._process_pool.submit(  # type: ignore
+                            "_validate_dict_copy", self.version, self.stac_file, item
+                        )
+                        for item in collections["collections"]
+                    ]
+                )
+            return
         for collection in collections["collections"]:
             self.schema = ""
             self.validate_dict(collection)
@@ -818,6 +1873,14 @@ class StacValidate:
             jsonschema.exceptions.ValidationError, Exception: Various errors
             during fetching or parsing.
         """
+        with self._validation_processes():
+            if self.async_crawl:
+                self._run_async(self._async_validate_item_collection)
+            else:
+                self._validate_item_collection_pages()
+
+    def _validate_item_collection_pages(self) -> None:
+        """Validate the pages of an item collection one after the other."""
         page = 1
         print(f"processing page {page}")
         item_collection = fetch_and_parse_file(str(self.stac_file), self.headers)
@@ -844,7 +1907,7 @@ class StacValidate:
                     f"Validating the item collection failed on page {page}: {str(e)}"
                 )
             }
-            self.message.append(message)
+            self._emit(message)
 
     def pydantic_validator(self, stac_type: str) -> Dict:
         """
@@ -936,10 +1999,61 @@ class StacValidate:
                 extension_schemas.append(ext)
             message["extension_schemas"] = extension_schemas
 
+    def _exception_message(self, e: Exception) -> Dict:
+        """
+        Create the error message `run` reports for an exception.
+
+        Args:
+            e (Exception): The exception raised while fetching or validating.
+
+        Returns:
+            dict: Dictionary containing error information.
+        """
+        if isinstance(e, ReportedError):
+            self.valid = False
+            return dict(e.message)
+
+        if isinstance(e, jsonschema.exceptions.ValidationError):
+            if e.absolute_path:
+                err_msg = (
+                    f"{e.message}. Error is in "
+                    f"{' -> '.join([str(i) for i in e.absolute_path])} "
+                )
+            else:
+                err_msg = f"{e.message}"
+            return self.create_err_msg(
+                err_type="JSONSchemaValidationError", err_msg=err_msg, error_obj=e
+            )
+
+        if isinstance(
+            e,
+            (
+                URLError,
+                JSONDecodeError,
+                ValueError,
+                TypeError,
+                FileNotFoundError,
+                ConnectionError,
+                exceptions.SSLError,
+                OSError,
+                KeyError,
+                HTTPError,
+            ),
+        ):
+            return self.create_err_msg(
+                err_type=type(e).__name__, err_msg=str(e), error_obj=e
+            )
+
+        return self.create_err_msg(err_type="Exception", err_msg=str(e), error_obj=e)
+
     def run(self) -> bool:
         """
         Run the STAC validation process based on the input parameters.
 
+        In recursive mode with a "jsonl" `log_format`, each result is appended to
+        the log as it comes instead of being kept in `message`, which stays empty,
+        and `results` counts them for summaries.
+
         Returns:
             bool: True if the STAC is valid, False otherwise.
 
@@ -949,6 +2063,30 @@ class StacValidate:
             jsonschema.exceptions.ValidationError, Exception: Various errors
             during fetching or parsing.
         """
+        if not (
+            self.recursive
+            and self.log
+            and self.log_format == "jsonl"
+            and self._sink is None
+        ):
+            return self._run()
+        self.results = ResultCounter()
+        # A resumed validation continues the log, from the size of its checkpoint
+        log = JsonLinesLog(self.log, append=self.resume)
+        with log:
+            self._result_log = log
+            self._sink = functools.partial(self._log_result, log)
+            try:
+                return self._run()
+            finally:
+                self._sink = None
+                self._result_log = None
+
+    def _log_result(self, log: JsonArrayLog, message: Dict) -> None:
+        log.write(message)
+        self.results.add(message)  # type: ignore
+
+    def _run(self) -> bool:
         message = {}
         try:
             # Fetch STAC content if not provided via item_collection/collections
@@ -975,7 +2113,7 @@ class StacValidate:
                         version=version,  # Pass the version we extracted
                     )
                 )
-                self.message.append(message)
+                self._emit(message)
                 return self.valid
 
             self.version = version
@@ -995,7 +2133,28 @@ class StacValidate:
                 self.valid = True
 
             elif self.recursive:
-                self.valid = self.recursive_validator(stac_type)
+                self.visited = VisitedLinks()
+                self.visited.visit(str(self.stac_file))
+                try:
+                    with self._validation_processes():
+                        if self.async_crawl:
+                            self.valid = self._run_async(
+                                functools.partial(
+                                    self._async_recursive_validator, stac_type
+                                )
+                            )
+                        elif self.workers > 1 or self.processes > 1:
+                            self.valid = self.parallel_recursive_validator(stac_type)
+                        elif self.resume:
+                            self.valid = self._resume_crawl()
+                        else:
+                            self.valid = self.recursive_validator(stac_type)
+                    if self.sampler is not None and self.sampler.failed:
+                        self.valid = False
+                finally:
+                    # Keep the results recorded before an error for the next run
+                    if self.manifest is not None:
+                        self.manifest.flush()
 
             elif self.extensions:
                 message = self.extensions_validator(stac_type)
@@ -1007,49 +2166,15 @@ class StacValidate:
                 self.valid = True
                 message = self.default_validator(stac_type)
 
-        except jsonschema.exceptions.ValidationError as e:
-            if e.absolute_path:
-                err_msg = (
-                    f"{e.message}. Error is in "
-                    f"{' -> '.join([str(i) for i in e.absolute_path])} "
-                )
-            else:
-                err_msg = f"{e.message}"
-            message.update(
-                self.create_err_msg(
-                    err_type="JSONSchemaValidationError", err_msg=err_msg, error_obj=e
-                )
-            )
-
-        except (
-            URLError,
-            JSONDecodeError,
-            ValueError,
-            TypeError,
-            FileNotFoundError,
-            ConnectionError,
-            exceptions.SSLError,
-            OSError,
-            KeyError,
-            HTTPError,
-        ) as e:
-            message.update(
-                self.create_err_msg(
-                    err_type=type(e).__name__, err_msg=str(e), error_obj=e
-                )
-            )
-
         except Exception as e:
-            message.update(
-                self.create_err_msg(err_type="Exception", err_msg=str(e), error_obj=e)
-            )
+            message.update(self._exception_message(e))
 
         if message:
             message["valid_stac"] = self.valid
-            self.message.append(message)
+            self._emit(message)
 
         # Write out log if path is provided
-        if self.log:
+        if self.log and self._sink is None:
             with open(self.log, "w") as f:
                 f.write(json.dumps(self.message, indent=4))
 
@@ -1062,3 +2187,79 @@ class StacValidate:
             self.message = filtered_messages
 
         return self.valid
+
+    def iter_results(self, buffer_size: int = DEFAULT_RESULT_BUFFER) -> Iterator[Dict]:
+        """
+        Validate according to the mode of the validator, yielding each result as
+        soon as it is produced.
+
+        Works in every mode: `collections`, `item_collection`, `recursive` or a
+        single object. Results are yielded in the order `run` (or
+        `validate_collections` and `validate_item_collection`) would append them
+        to `message`, which stays empty, so memory use does not grow with the
+        number of objects. Unlike `run`, the messages of valid objects are yielded
+        even when a recursive validation ends up invalid. With `log`, the results
+        are written to the log file as they are yielded. A resumed recursive
+        validation only yields the results of the objects validated after its
+        checkpoint.
+
+        Validation runs in a background thread that stays at most `buffer_size`
+        results ahead of the caller. Closing the generator early stops it.
+
+        Args:
+            buffer_size (int): Maximum number of results produced but not yet yielded.
+
+        Yields:
+            dict: The validation messages.
+        """
+        results: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=buffer_size)
+        closed = threading.Event()
+
+        def put(done: bool, value: Any) -> None:
+            while not closed.is_set():
+                try:
+                    results.put((done, value), timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            raise _ResultsClosed()
+
+        def produce() -> None:
+            self._sink = functools.partial(put, False)
+            error = None
+            try:
+                if self.collections:
+                    self.validate_collections()
+                elif self.item_collection:
+                    self.validate_item_collection()
+                else:
+                    self.run()
+            except _ResultsClosed:
+                return
+            except BaseException as e:
+                error = e
+            finally:
+                self._sink = None
+            try:
+                put(True, error)
+            except _ResultsClosed:
+                pass
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        log = open_result_log(self.log, self.log_format) if self.log else None
+        try:
+            while True:
+                done, value = results.get()
+                if done:
+                    if value is not None:
+                        raise value
+                    return
+                if log is not None:
+                    log.write(value)
+                yield value
+        finally:
+            closed.set()
+            producer.join()
+            if log is not None:
+                log.close()
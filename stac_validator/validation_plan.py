@@ -0,0 +1,211 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from jsonschema import Draft202012Validator
+
+from .utilities import (
+    SCHEMA_STORE,
+    VALIDATOR_CACHE,
+    is_valid_url,
+    map_schema_path,
+    schema_map_key,
+    set_schema_addr,
+)
+
+
+class ValidationPlan:
+    """The schemas that a kind of STAC object is validated against, and their validators.
+
+    Objects of the same STAC version and type that declare the same extensions, such
+    as the items of a collection, share one plan. Working out the schema address of
+    each extension, including the legacy "proj" name and short extension names, and
+    looking up the validator of each schema is done once per plan, so validating
+    another object of the plan only runs the validators.
+
+    Addresses and validators are resolved lazily, in the order the schemas are
+    validated against, so that errors are raised for the same schema as without a
+    plan.
+
+    Args:
+        version (str): The STAC version of the objects.
+        stac_type (str): The STAC object type.
+        extensions (tuple): The `stac_extensions` of the objects.
+        schema_map (dict): Override schema location to validate against local versions of a schema
+        flatten (bool): Whether to validate against the flattened form of the schemas.
+        engine (str): Validation engine, "jsonschema" or "compiled".
+    """
+
+    def __init__(
+        self,
+        version: str,
+        stac_type: str,
+        extensions: Tuple = (),
+        schema_map: Optional[Dict] = None,
+        flatten: bool = False,
+        engine: str = "jsonschema",
+    ):
+        self.version = version
+        self.stac_type = stac_type.lower()
+        # Handle legacy "proj" to "projection" mapping
+        self.extensions = tuple(
+            "projection" if extension == "proj" else extension
+            for extension in extensions
+        )
+        self.schema_map = schema_map
+        self.flatten = flatten
+        self.engine = engine
+        self.core_schema = set_schema_addr(version, self.stac_type)
+        self.prefetched = False
+        self._core_validator: Optional[Draft202012Validator] = None
+        self._extension_schemas: List[Optional[str]] = [None] * len(self.extensions)
+        self._extension_validators: List[Optional[Draft202012Validator]] = [None] * len(
+            self.extensions
+        )
+
+    def _validator(self, schema: str) -> Draft202012Validator:
+        return VALIDATOR_CACHE.get(
+            schema, schema_map=self.schema_map, flatten=self.flatten, engine=self.engine
+        )
+
+    def core_validator(self) -> Draft202012Validator:
+        """Return the validator of the core schema."""
+        if self._core_validator is None:
+            # Keep the core schema in memory however many extension schemas are seen
+            SCHEMA_STORE.pin(map_schema_path(self.core_schema, self.schema_map))
+            self._core_validator = self._validator(self.core_schema)
+        return self._core_validator
+
+    def extension_schema(self, index: int) -> str:
+        """Return the schema address of an extension.
+
+        Args:
+            index (int): Index of the extension in `extensions`.
+
+        Returns:
+            str: The URL of the extension schema, or its path if it is a local file.
+        """
+        schema = self._extension_schemas[index]
+        if schema is None:
+            schema = self.extensions[index]
+            if not (is_valid_url(schema) or schema.endswith(".json")):
+                version = (
+                    "1.0.0-beta.1" if self.version == "1.0.0-beta.2" else self.version
+                )
+                schema = f"https://cdn.staclint.com/v{version}/extension/{schema}.json"
+            self._extension_schemas[index] = schema
+        return schema
+
+    def extension_validator(self, index: int) -> Optional[Draft202012Validator]:
+        """Return the validator of an extension schema.
+
+        Args:
+            index (int): Index of the extension in `extensions`.
+
+        Returns:
+            Optional[Draft202012Validator]: The validator, or None for local schema
+                files, which may be relative to each object.
+        """
+        validator = self._extension_validators[index]
+        if validator is None:
+            schema = self.extension_schema(index)
+            if not is_valid_url(schema):
+                return None
+            validator = self._extension_validators[index] = self._validator(schema)
+        return validator
+
+
+class ValidationPlanCache:
+    """Process-wide LRU cache of validation plans.
+
+    Plans are keyed by the STAC version, object type and extensions of the objects,
+    along with the schema_map, flattening and engine they are validated with. Plans
+    are dropped when `VALIDATOR_CACHE` is cleared, since they hold its validators.
+
+    Args:
+        maxsize (int): Maximum number of plans to keep before evicting the least
+            recently used one.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._plans: "OrderedDict[Tuple, ValidationPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = VALIDATOR_CACHE.generation
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        version: str,
+        stac_type: str,
+        extensions: Any = (),
+        schema_map: Optional[Dict] = None,
+        flatten: bool = False,
+        engine: str = "jsonschema",
+    ) -> ValidationPlan:
+        """Return the plan of a kind of STAC object, creating it on a miss.
+
+        Args:
+            version (str): The STAC version of the object.
+            stac_type (str): The STAC object type.
+            extensions (Iterable): The `stac_extensions` of the object.
+            schema_map (dict): Override schema location to validate against local versions of a schema
+            flatten (bool): Whether to validate against the flattened form of the schemas.
+            engine (str): Validation engine, "jsonschema" or "compiled".
+
+        Returns:
+            ValidationPlan: The plan. Objects with malformed extensions get a plan of
+                their own, which is not cached.
+        """
+        try:
+            extensions = tuple(
+                "projection" if extension == "proj" else extension
+                for extension in extensions
+            )
+        except TypeError:
+            extensions = ()
+        key = (
+            version,
+            stac_type.lower(),
+            extensions,
+            schema_map_key(schema_map),
+            flatten,
+            engine,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return ValidationPlan(
+                version, stac_type, extensions, schema_map, flatten, engine
+            )
+
+        with self._lock:
+            if self._generation != VALIDATOR_CACHE.generation:
+                self._plans.clear()
+                self._generation = VALIDATOR_CACHE.generation
+            cached = self._plans.get(key)
+            if cached is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        plan = ValidationPlan(
+            version, stac_type, extensions, schema_map, flatten, engine
+        )
+        with self._lock:
+            plan = self._plans.setdefault(key, plan)
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        """Drop every cached plan and reset the counters."""
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+PLAN_CACHE = ValidationPlanCache()
@@ -0,0 +1,226 @@
+import base64
+import contextlib
+import hashlib
+import os
+import posixpath
+import sys
+from array import array
+from typing import Dict, Iterator, List
+from urllib.parse import urlsplit, urlunsplit
+
+from .utilities import is_url
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_href(href: str) -> str:
+    """Return the canonical absolute form of a link, used to recognise revisits.
+
+    URLs get a lowercase scheme and host, no default port, no fragment and no `.`
+    or `..` path segments. Local paths are made absolute and normalised.
+
+    Args:
+        href (str): An absolute URL or a local path.
+
+    Returns:
+        str: The normalised URL or path.
+    """
+    if not is_url(href):
+        return os.path.normpath(os.path.abspath(href))
+    parts = urlsplit(href)
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port is not None and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    path = posixpath.normpath(parts.path) if parts.path else "/"
+    if parts.path.endswith("/") and not path.endswith("/"):
+        path += "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+def href_fingerprint(href: str) -> int:
+    """Return a non-zero 64-bit fingerprint of the normalised form of a link.
+
+    Args:
+        href (str): An absolute URL or a local path.
+
+    Returns:
+        int: The fingerprint.
+    """
+    digest = hashlib.blake2b(normalize_href(href).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class FingerprintSet:
+    """Set of non-zero 64-bit integers stored in a flat array.
+
+    An open-addressing hash table with linear probing over an `array("Q")`, kept at
+    most half full, so each member costs 16 bytes at worst instead of the hundred
+    or so bytes of a URL string in a Python set.
+
+    Args:
+        capacity (int): Initial number of slots, rounded up to a power of two.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self._slots = array("Q", [0]) * size
+        self._mask = size - 1
+        self._size = 0
+
+    def _index(self, fingerprint: int) -> int:
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while slots[index] and slots[index] != fingerprint:
+            index = (index + 1) & mask
+        return index
+
+    def add(self, fingerprint: int) -> bool:
+        """Add a fingerprint.
+
+        Args:
+            fingerprint (int): A non-zero 64-bit integer.
+
+        Returns:
+            bool: True if the fingerprint was not in the set yet.
+        """
+        index = self._index(fingerprint)
+        if self._slots[index]:
+            return False
+        self._slots[index] = fingerprint
+        self._size += 1
+        if self._size * 2 > len(self._slots):
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        old_slots = self._slots
+        self._slots = array("Q", [0]) * (len(old_slots) * 2)
+        self._mask = len(self._slots) - 1
+        for fingerprint in old_slots:
+            if fingerprint:
+                self._slots[self._index(fingerprint)] = fingerprint
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return bool(self._slots[self._index(fingerprint)])
+
+    def __len__(self) -> int:
+        return self._size
+
+    def tobytes(self) -> bytes:
+        """Return the table as little-endian bytes, readable by `frombytes`."""
+        slots = array("Q", self._slots)
+        if sys.byteorder != "little":
+            slots.byteswap()
+        return slots.tobytes()
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> "FingerprintSet":
+        """Rebuild a set from the output of `tobytes`.
+
+        Args:
+            data (bytes): The table, whose number of slots is a power of two.
+
+        Returns:
+            FingerprintSet: The set.
+        """
+        slots = array("Q")
+        slots.frombytes(data)
+        if sys.byteorder != "little":
+            slots.byteswap()
+        if not slots or len(slots) & (len(slots) - 1):
+            raise ValueError("Invalid fingerprint table size")
+        fingerprints = cls(capacity=1)
+        fingerprints._slots = slots
+        fingerprints._mask = len(slots) - 1
+        fingerprints._size = len(slots) - slots.count(0)
+        return fingerprints
+
+
+class VisitedLinks:
+    """Links already followed by a recursive validation, with revisit counters.
+
+    Links are recognised by the fingerprint of their normalised absolute href. A
+    link to an object that was already visited is a duplicate, and also a cycle
+    when that object is an ancestor of the object holding the link.
+    """
+
+    def __init__(self):
+        self._fingerprints = FingerprintSet()
+        self._path: List[int] = []
+        self.duplicates = 0
+        self.cycles = 0
+
+    def seen(self, href: str) -> bool:
+        """Return True if a link was already visited, without counting it."""
+        return href_fingerprint(href) in self._fingerprints
+
+    def visit(self, href: str) -> bool:
+        """Mark a link as visited.
+
+        Args:
+            href (str): Absolute URL or local path of the link.
+
+        Returns:
+            bool: True on the first visit, False for a duplicate, which is counted.
+        """
+        fingerprint = href_fingerprint(href)
+        if self._fingerprints.add(fingerprint):
+            return True
+        self.duplicates += 1
+        if fingerprint in self._path:
+            self.cycles += 1
+        return False
+
+    def push(self, href: str) -> None:
+        """Track an object as an ancestor of the links followed next."""
+        self._path.append(href_fingerprint(href))
+
+    def pop(self) -> None:
+        """Stop tracking the last ancestor pushed."""
+        self._path.pop()
+
+    @contextlib.contextmanager
+    def within(self, href: str) -> Iterator[None]:
+        """Track an object as an ancestor while its links are followed."""
+        self.push(href)
+        try:
+            yield
+        finally:
+            self.pop()
+
+    def dump(self) -> Dict:
+        """Return the visited links and counters as JSON-serialisable data.
+
+        Ancestors are not included: they are pushed again when a crawl resumes.
+        """
+        return {
+            "fingerprints": base64.b64encode(self._fingerprints.tobytes()).decode(),
+            "duplicates": self.duplicates,
+            "cycles": self.cycles,
+        }
+
+    @classmethod
+    def load(cls, data: Dict) -> "VisitedLinks":
+        """Rebuild visited links from the output of `dump`.
+
+        Args:
+            data (dict): The dumped links and counters.
+
+        Returns:
+            VisitedLinks: The visited links, without ancestors.
+        """
+        visited = cls()
+        visited._fingerprints = FingerprintSet.frombytes(
+            base64.b64decode(data["fingerprints"])
+        )
+        visited.duplicates = data["duplicates"]
+        visited.cycles = data["cycles"]
+        return visited
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
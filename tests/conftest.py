@@ -0,0 +1,19 @@
+import pytest
+
+from tests.helpers import ANY_SCHEMA, write_schemas, write_tree
+
+
+@pytest.fixture
+def stac_tree(tmp_path):
+    """Factory writing STAC objects and local core schemas into tmp_path.
+
+    Called with the objects keyed by their path relative to tmp_path, and the
+    catalog and item schemas to validate them against, it returns tmp_path and the
+    schema_map of the schemas.
+    """
+
+    def write(objects, catalog_schema=ANY_SCHEMA, item_schema=ANY_SCHEMA):
+        write_tree(tmp_path, objects)
+        return tmp_path, write_schemas(tmp_path, catalog_schema, item_schema)
+
+    return write
@@ -0,0 +1,85 @@
+"""
+Description: STAC trees and local core schemas shared by the crawl tests
+
+"""
+
+import json
+import os
+
+from stac_validator import stac_validator
+
+CATALOG_SCHEMA = (
+    "https://schemas.stacspec.org/v1.0.0/catalog-spec/json-schema/catalog.json"
+)
+ITEM_SCHEMA = "https://schemas.stacspec.org/v1.0.0/item-spec/json-schema/item.json"
+
+DRAFT_07 = "http://json-schema.org/draft-07/schema#"
+# Accepts any object
+ANY_SCHEMA = {"$schema": DRAFT_07}
+# Rejects objects whose id is not a string
+ID_SCHEMA = {"$schema": DRAFT_07, "properties": {"id": {"type": "string"}}}
+# Also rejects objects whose id starts with a digit
+LOWERCASE_ID_SCHEMA = {
+    "$schema": DRAFT_07,
+    "properties": {"id": {"type": "string", "pattern": "^[a-z]"}},
+}
+
+
+def catalog(id, links):
+    return {
+        "type": "Catalog",
+        "stac_version": "1.0.0",
+        "id": id,
+        "description": id,
+        "links": [{"rel": rel, "href": href} for rel, href in links],
+    }
+
+
+def item(id):
+    return {"type": "Feature", "stac_version": "1.0.0", "id": id, "links": []}
+
+
+def write_json(path, content, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(content))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def write_tree(root, objects):
+    """Write STAC objects, keyed by their path relative to root."""
+    for name, content in objects.items():
+        write_json(root / name, content)
+
+
+def write_schemas(directory, catalog_schema=ANY_SCHEMA, item_schema=ANY_SCHEMA):
+    """Write local copies of the core schemas, and return their schema_map."""
+    schema_map = {}
+    for url, schema in ((CATALOG_SCHEMA, catalog_schema), (ITEM_SCHEMA, item_schema)):
+        path = directory / f"{url.rsplit('/', 1)[1]}.schema"
+        write_json(path, schema)
+        schema_map[url] = str(path)
+    return schema_map
+
+
+def validator(path, schema_map, **kwargs):
+    """Return a validator of a STAC file against local core schemas."""
+    return stac_validator.StacValidate(
+        str(path), schema_map=schema_map, schema_cache=False, **kwargs
+    )
+
+
+def recursive_validator(root, schema_map, **kwargs):
+    """Return a recursive validator of the catalog.json of root."""
+    return validator(root / "catalog.json", schema_map, recursive=True, **kwargs)
+
+
+def run(root, schema_map, **kwargs):
+    """Validate the catalog.json of root recursively, tracing every result.
+
+    Returns:
+        tuple: Whether the catalog is valid, and the messages of the validation.
+    """
+    stac = recursive_validator(root, schema_map, trace_recursion=True, **kwargs)
+    valid = stac.run()
+    return valid, stac.message
@@ -0,0 +1,171 @@
+"""
+Description: Test the asyncio crawl engine against a local HTTP server
+
+"""
+
+import asyncio
+import functools
+import http.server
+import threading
+import time
+
+import pytest
+
+from stac_validator.async_crawl import AsyncFetcher, run_coroutine
+from tests.helpers import (
+    ID_SCHEMA,
+    LOWERCASE_ID_SCHEMA,
+    catalog,
+    item,
+    validator,
+    write_json,
+    write_schemas,
+)
+
+pytest.importorskip("aiohttp")
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(0.01)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve tmp_path over HTTP, with local copies of the core schemas."""
+    schema_map = write_schemas(tmp_path, ID_SCHEMA, LOWERCASE_ID_SCHEMA)
+
+    handler = functools.partial(QuietHandler, directory=str(tmp_path))
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield tmp_path, f"http://127.0.0.1:{httpd.server_port}", schema_map
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def run(stac_file, schema_map, mode="recursive", **kwargs):
+    stac = validator(stac_file, schema_map, **{mode: True}, **kwargs)
+    if mode == "item_collection":
+        stac.validate_item_collection()
+    elif mode == "collections":
+        stac.validate_collections()
+    else:
+        stac.run()
+    return stac.valid, stac.message
+
+
+@pytest.mark.parametrize("max_depth", [None, 2])
+def test_async_recursion_matches_serial(server, max_depth):
+    root, url, schema_map = server
+    write_json(
+        root / "catalog.json",
+        catalog(
+            "root",
+            [("child", "a/catalog.json"), ("child", "b/catalog.json")]
+            + [("item", f"item-{i}.json") for i in range(20)],
+        ),
+    )
+    write_json(root / "a/catalog.json", catalog("a", [("child", "c/catalog.json")]))
+    write_json(root / "a/c/catalog.json", catalog("c", [("item", "c-0.json")]))
+    write_json(root / "a/c/c-0.json", item("c-0"))
+    write_json(root / "b/catalog.json", catalog(5, []))
+    for i in range(20):
+        write_json(root / f"item-{i}.json", item(f"item-{i}"))
+
+    serial = run(f"{url}/catalog.json", schema_map, trace_recursion=True)
+    concurrent = run(
+        f"{url}/catalog.json",
+        schema_map,
+        trace_recursion=True,
+        async_crawl=True,
+        concurrency=4,
+        workers=2,
+    )
+    assert concurrent == serial
+    assert len(serial[1]) == 25
+
+
+def test_async_recursion_reports_missing_object(server):
+    root, url, schema_map = server
+    write_json(root / "catalog.json", catalog("root", [("item", "missing.json")]))
+    serial = run(f"{url}/catalog.json", schema_map)
+    concurrent = run(f"{url}/catalog.json", schema_map, async_crawl=True)
+    assert concurrent == serial
+    assert serial[1][-1]["error_type"] == "HTTPError"
+    assert serial[1][-1]["path"] == f"{url}/missing.json"
+
+
+def test_async_item_collection_matches_serial(server):
+    root, url, schema_map = server
+    for page in range(1, 4):
+        write_json(
+            root / f"page-{page}.json",
+            {
+                "type": "FeatureCollection",
+                "features": [item(f"p{page}-{i}") for i in range(3)] + [item("1")],
+                "links": [{"rel": "next", "href": f"{url}/page-{page + 1}.json"}],
+            },
+        )
+
+    # The fourth page does not exist
+    serial = run(f"{url}/page-1.json", schema_map, "item_collection", pages=5)
+    concurrent = run(
+        f"{url}/page-1.json",
+        schema_map,
+        "item_collection",
+        pages=5,
+        async_crawl=True,
+    )
+    assert concurrent == serial
+    assert len(serial[1]) == 13
+    assert "pagination_error" in serial[1][-1]
+
+
+def test_async_collections_matches_serial(server):
+    root, url, schema_map = server
+    write_json(
+        root / "collections.json",
+        {"collections": [catalog("a", []), catalog(1, []), catalog("b", [])]},
+    )
+    serial = run(f"{url}/collections.json", schema_map, "collections")
+    concurrent = run(
+        f"{url}/collections.json", schema_map, "collections", async_crawl=True
+    )
+    assert concurrent == serial
+    assert [message["valid_stac"] for message in serial[1]] == [True, False, True]
+
+
+def test_async_fetcher_bounds_concurrency(server):
+    root, url, _ = server
+    for i in range(20):
+        write_json(root / f"item-{i}.json", item(f"item-{i}"))
+    QuietHandler.max_in_flight = 0
+
+    async def fetch_all():
+        async with AsyncFetcher(concurrency=3) as fetcher:
+            return await asyncio.gather(
+                *(fetcher.fetch(f"{url}/item-{i}.json") for i in range(20))
+            )
+
+    results = run_coroutine(fetch_all())
+    assert [result["id"] for result in results] == [f"item-{i}" for i in range(20)]
+    assert 1 < QuietHandler.max_in_flight <= 3
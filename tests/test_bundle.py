@@ -0,0 +1,131 @@
+"""
+Description: Test building and loading offline schema bundles
+
+"""
+
+import json
+
+import pytest
+import requests_mock
+from click.testing import CliRunner
+
+from stac_validator import stac_validator
+from stac_validator.bundle import (
+    SchemaBundle,
+    build_schema_bundle,
+    discover_schema_uris,
+    load_schema_bundle,
+)
+from stac_validator.schema_cache import configure_schema_cache
+from stac_validator.utilities import (
+    SCHEMA_STORE,
+    fetch_and_parse_schema,
+    get_schema_bundle,
+    set_schema_bundle,
+)
+
+BASE_URL = "https://example.com/schemas/v1.0.0/"
+SCHEMA_A = {
+    "$id": BASE_URL + "a.json",
+    "type": "object",
+    "properties": {"b": {"$ref": "b.json#/definitions/b"}},
+}
+SCHEMA_B = {"definitions": {"b": {"$ref": "nested/c.json"}}}
+SCHEMA_C = {"type": "string"}
+
+
+@pytest.fixture
+def schema_server(tmp_path):
+    configure_schema_cache(cache_dir=str(tmp_path / "cache"))
+    with requests_mock.Mocker() as mock:
+        mock.get(BASE_URL + "a.json", json=SCHEMA_A)
+        mock.get(BASE_URL + "b.json", json=SCHEMA_B)
+        mock.get(BASE_URL + "nested/c.json", json=SCHEMA_C)
+        yield mock
+    configure_schema_cache(enabled=False)
+    set_schema_bundle(None)
+    SCHEMA_STORE.clear()
+
+
+def test_bundle_resolves_transitive_refs(schema_server, tmp_path):
+    output = str(tmp_path / "schemas.bundle")
+    uris = build_schema_bundle([BASE_URL + "a.json"], output)
+    assert sorted(uris) == [
+        BASE_URL + "a.json",
+        BASE_URL + "b.json",
+        BASE_URL + "nested/c.json",
+    ]
+
+    bundle = SchemaBundle(output)
+    assert len(bundle) == 3
+    assert bundle.get(BASE_URL + "b.json#/definitions/b") == SCHEMA_B
+    assert bundle.get(BASE_URL + "missing.json") is None
+    bundle.close()
+
+
+def test_bundle_serves_schemas_offline(schema_server, tmp_path):
+    output = str(tmp_path / "schemas.bundle")
+    build_schema_bundle([BASE_URL + "a.json"], output)
+
+    SCHEMA_STORE.clear()
+    configure_schema_cache(enabled=False)
+    load_schema_bundle(output)
+    with requests_mock.Mocker():
+        # No URLs are registered, so any network access would raise
+        assert fetch_and_parse_schema(BASE_URL + "nested/c.json") == SCHEMA_C
+
+
+def test_loading_a_bundle_again_reuses_or_replaces_it(schema_server, tmp_path):
+    output = str(tmp_path / "schemas.bundle")
+    build_schema_bundle([BASE_URL + "a.json"], output)
+    first = load_schema_bundle(output)
+    assert load_schema_bundle(output) is first
+
+    # A rebuilt bundle replaces the loaded one, which stays readable by the
+    # validations still using it
+    build_schema_bundle([BASE_URL + "b.json"], output)
+    second = load_schema_bundle(output)
+    assert second is not first
+    assert get_schema_bundle() is second
+    assert len(second) == 2
+    assert json.loads(first.get_bytes(BASE_URL + "a.json")) == SCHEMA_A
+
+
+def test_later_validators_unload_the_bundle(schema_server, tmp_path):
+    output = str(tmp_path / "schemas.bundle")
+    build_schema_bundle([BASE_URL + "a.json"], output)
+    stac_validator.StacValidate(schema_bundle=output, schema_cache=False)
+    assert get_schema_bundle() is not None
+    stac_validator.StacValidate(schema_cache=False)
+    assert get_schema_bundle() is None
+
+
+def test_bundle_subcommand(schema_server, tmp_path):
+    output = str(tmp_path / "schemas.bundle")
+    result = CliRunner().invoke(
+        stac_validator.main, ["bundle", BASE_URL + "a.json", "-o", output]
+    )
+    assert result.exit_code == 0
+    assert "Bundled 3 schemas" in result.output
+    bundle = SchemaBundle(output)
+    assert len(bundle) == 3
+    bundle.close()
+
+
+def test_bundle_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-bundle.json"
+    path.write_text(json.dumps(SCHEMA_C))
+    with pytest.raises(ValueError):
+        SchemaBundle(str(path))
+
+
+def test_discover_schema_uris_from_catalog():
+    uris = discover_schema_uris(["tests/test_data/v100/catalog.json"])
+    assert uris[0] == (
+        "https://schemas.stacspec.org/v1.0.0/catalog-spec/json-schema/catalog.json"
+    )
+    assert (
+        "https://schemas.stacspec.org/v1.0.0/collection-spec/json-schema/collection.json"
+        in uris
+    )
+    assert "https://stac-extensions.github.io/eo/v1.0.0/schema.json" in uris
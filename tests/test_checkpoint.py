@@ -0,0 +1,176 @@
+"""
+Description: Test checkpointing and resuming recursive validations
+
+"""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from stac_validator import stac_validator
+from stac_validator.visited import FingerprintSet, VisitedLinks
+from tests.helpers import catalog, item, recursive_validator
+
+
+@pytest.fixture
+def tree(stac_tree):
+    objects = {
+        "catalog.json": catalog(
+            "root",
+            [("child", "a/catalog.json"), ("child", "b/catalog.json")]
+            + [("item", f"item-{i}.json") for i in range(2)],
+        ),
+        "a/catalog.json": catalog(
+            "a",
+            [("child", "c/catalog.json"), ("child", "../b/catalog.json")]
+            + [("item", f"a-{i}.json") for i in range(3)],
+        ),
+        "a/c/catalog.json": catalog("c", [("item", f"c-{i}.json") for i in range(3)]),
+        "b/catalog.json": catalog("b", [("item", f"b-{i}.json") for i in range(3)]),
+    }
+    objects.update({f"item-{i}.json": item(f"item-{i}") for i in range(2)})
+    for name in ("a", "a/c", "b"):
+        prefix = name.rsplit("/", 1)[-1]
+        objects.update(
+            {f"{name}/{prefix}-{i}.json": item(f"{prefix}-{i}") for i in range(3)}
+        )
+    root, schema_map = stac_tree(objects)
+    return root, schema_map, str(root / "crawl.checkpoint")
+
+
+def validator(root, schema_map, **kwargs):
+    return recursive_validator(root, schema_map, trace_recursion=True, **kwargs)
+
+
+def test_completed_crawl_removes_checkpoint(tree):
+    root, schema_map, checkpoint = tree
+    expected = validator(root, schema_map)
+    expected.run()
+
+    stac = validator(root, schema_map, checkpoint=checkpoint, checkpoint_interval=0)
+    assert stac.run()
+    assert stac.message == expected.message
+    assert len(stac.message) == 15
+    assert not (root / "crawl.checkpoint").exists()
+
+
+def test_resume_after_error(tree):
+    root, schema_map, checkpoint = tree
+    expected = validator(root, schema_map)
+    expected.run()
+
+    missing = root / "a" / "c" / "c-1.json"
+    content = missing.read_text()
+    missing.unlink()
+    first = validator(root, schema_map, checkpoint=checkpoint)
+    assert not first.run()
+    assert first.message[-1]["error_type"] == "FileNotFoundError"
+
+    missing.write_text(content)
+    second = validator(root, schema_map, checkpoint=checkpoint, resume=True)
+    assert second.run()
+    # The resumed crawl continues with the object that failed, and reports the
+    # results saved with the checkpoint
+    assert second.message == expected.message
+    assert (second.visited.duplicates, second.visited.cycles) == (
+        expected.visited.duplicates,
+        expected.visited.cycles,
+    )
+    assert not (root / "crawl.checkpoint").exists()
+
+
+def test_resume_continues_the_log(tree):
+    root, schema_map, checkpoint = tree
+    log = root / "results.jsonl"
+    expected = validator(root, schema_map)
+    expected.run()
+
+    missing = root / "b" / "b-1.json"
+    content = missing.read_text()
+    missing.unlink()
+    options = dict(checkpoint=checkpoint, log=str(log), log_format="jsonl")
+    assert not validator(root, schema_map, **options).run()
+    # The results are in the log, so the checkpoint only records its size
+    state = json.loads((root / "crawl.checkpoint").read_text())
+    assert "message" not in state and state["log_size"] > 0
+    missing.write_text(content)
+    second = validator(root, schema_map, resume=True, **options)
+    assert second.run()
+    logged = [json.loads(line) for line in log.read_text().splitlines()]
+    assert logged == expected.message
+    assert (second.results.total, second.results.valid) == (15, 15)
+
+
+@pytest.mark.parametrize("max_depth", [None, 2])
+def test_resume_after_interruption(tree, max_depth):
+    root, schema_map, checkpoint = tree
+    expected = validator(root, schema_map, max_depth=max_depth)
+    expected.run()
+
+    first = validator(root, schema_map, max_depth=max_depth, checkpoint=checkpoint)
+    results = first.iter_results(buffer_size=1)
+    seen = [next(results) for _ in range(5)]
+    results.close()
+    assert (root / "crawl.checkpoint").exists()
+
+    second = validator(
+        root, schema_map, max_depth=max_depth, checkpoint=checkpoint, resume=True
+    )
+    resumed = list(second.iter_results())
+    assert seen == expected.message[: len(seen)]
+    resumed_from = len(expected.message) - len(resumed)
+    assert resumed == expected.message[resumed_from:]
+    # Only the result buffered when the generator was closed is dropped
+    assert len(expected.message) - len(seen) - len(resumed) <= 1
+
+
+def test_resume_other_catalog(tree):
+    root, schema_map, checkpoint = tree
+    missing = root / "b" / "b-0.json"
+    missing.unlink()
+    validator(root, schema_map, checkpoint=checkpoint).run()
+
+    stac = recursive_validator(
+        root / "a", schema_map, checkpoint=checkpoint, resume=True
+    )
+    assert not stac.run()
+    assert stac.message[-1]["error_type"] == "ValueError"
+
+
+def test_checkpoint_requires_serial_crawl():
+    with pytest.raises(ValueError):
+        stac_validator.StacValidate(recursive=True, checkpoint="crawl", workers=2)
+    with pytest.raises(ValueError):
+        stac_validator.StacValidate(recursive=True, resume=True)
+
+
+def test_cli_rejects_checkpoint_with_resume(tree):
+    root, _, checkpoint = tree
+    result = CliRunner().invoke(
+        stac_validator.main,
+        [
+            str(root / "catalog.json"),
+            "--recursive",
+            "--checkpoint",
+            checkpoint,
+            "--resume",
+            str(root / "other.checkpoint"),
+        ],
+    )
+    assert result.exit_code == 2
+    assert "cannot be used together" in result.output
+
+
+def test_visited_links_round_trip():
+    visited = VisitedLinks()
+    for i in range(2000):
+        visited.visit(f"https://example.com/{i}.json")
+    visited.visit("https://example.com/1.json")
+    restored = VisitedLinks.load(json.loads(json.dumps(visited.dump())))
+    assert len(restored) == 2000
+    assert restored.seen("https://example.com/1999.json")
+    assert not restored.seen("https://example.com/2000.json")
+    assert restored.duplicates == 1
+    with pytest.raises(ValueError):
+        FingerprintSet.frombytes(b"\0" * 24)
@@ -0,0 +1,148 @@
+"""
+Description: Test the code-generating (compiled) validation engine
+
+"""
+
+import json
+import os
+
+import jsonschema
+import pytest
+from jsonschema import Draft202012Validator
+
+from stac_validator import compiled, stac_validator
+from stac_validator.compiled import compile_validator
+
+DRAFT_07 = "http://json-schema.org/draft-07/schema#"
+
+SCHEMA = {
+    "type": "object",
+    "required": ["id", "kind"],
+    "properties": {
+        "id": {"type": "string", "minLength": 2, "pattern": "^[a-z]"},
+        "kind": {"enum": ["a", "b", 1, True]},
+        "count": {"type": "integer", "minimum": 0, "exclusiveMaximum": 10},
+        "ratio": {"type": "number", "multipleOf": 0.5},
+        "tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+        "value": {"oneOf": [{"type": "string"}, {"type": "null"}]},
+        "legacy": {
+            "$schema": DRAFT_07,
+            "properties": {"x": {"$ref": "#/$defs/count", "type": "string"}},
+        },
+        "extra": {"unevaluatedProperties": False, "properties": {"a": True}},
+    },
+    "patternProperties": {"^x-": {"const": [1, {"k": False}]}},
+    "additionalProperties": False,
+    "if": {"properties": {"kind": {"const": "b"}}},
+    "then": {"required": ["count"]},
+    "$defs": {"count": {"type": "integer"}},
+}
+
+INSTANCES = [
+    {"id": "ab", "kind": "a"},
+    {"id": "ab", "kind": "b"},
+    {"id": "ab", "kind": "b", "count": 9},
+    {"id": "ab", "kind": "b", "count": 10},
+    {"id": "ab", "kind": "b", "count": 9.0},
+    {"id": "ab", "kind": 1.0, "count": True},
+    {"id": "Ab", "kind": "a"},
+    {"id": "a", "kind": "a"},
+    {"id": "ab", "kind": "a", "ratio": 1.5, "tags": ["x", "y"]},
+    {"id": "ab", "kind": "a", "ratio": 1.2, "tags": ["x", "x"]},
+    {"id": "ab", "kind": "a", "value": None, "x-y": [1, {"k": False}]},
+    {"id": "ab", "kind": "a", "value": 1, "x-y": [1, {"k": 0}]},
+    {"id": "ab", "kind": "a", "legacy": {"x": 1}},
+    {"id": "ab", "kind": "a", "legacy": {"x": "1"}},
+    {"id": "ab", "kind": "a", "extra": {"a": 1}},
+    {"id": "ab", "kind": "a", "extra": {"b": 1}},
+    {"id": "ab", "kind": "a", "other": 1},
+    ["not", "an", "object"],
+]
+
+
+@pytest.fixture
+def validators():
+    validator = Draft202012Validator(SCHEMA)
+    return validator, compile_validator(validator, "schema.json")
+
+
+@pytest.mark.parametrize("instance", INSTANCES)
+def test_compiled_matches_jsonschema(validators, instance):
+    validator, compiled_validator = validators
+    assert compiled_validator.is_valid(instance) == validator.is_valid(instance)
+    assert [e.message for e in compiled_validator.iter_errors(instance)] == [
+        e.message for e in validator.iter_errors(instance)
+    ]
+
+
+def test_compiled_falls_back_for_unsupported_keywords(validators):
+    _, compiled_validator = validators
+    # Refs outside of the flattened `$defs` and `unevaluatedProperties` are
+    # delegated to jsonschema
+    assert [node for _, node in compiled_validator.fallbacks] == [
+        SCHEMA["properties"]["legacy"]["properties"]["x"],
+        SCHEMA["properties"]["extra"],
+    ]
+
+
+def test_compiled_reports_jsonschema_errors(validators):
+    validator, compiled_validator = validators
+    instance = {"id": "ab", "kind": "c"}
+    with pytest.raises(jsonschema.exceptions.ValidationError) as compiled_error:
+        compiled_validator.validate(instance)
+    with pytest.raises(jsonschema.exceptions.ValidationError) as expected_error:
+        validator.validate(instance)
+    assert compiled_error.value.message == expected_error.value.message
+    assert compiled_error.value.path == expected_error.value.path
+
+
+def test_compiled_source_cached_on_disk(tmp_path, monkeypatch):
+    validator = Draft202012Validator(SCHEMA)
+    first = compile_validator(validator, "schema.json", str(tmp_path))
+    assert sorted(os.listdir(tmp_path))[-1] == "compiled.key"
+    assert len(os.listdir(tmp_path)) == 2
+
+    def fail(*args):
+        raise AssertionError("schema compiled again")
+
+    monkeypatch.setattr(compiled, "compile_schema_source", fail)
+    second = compile_validator(validator, "schema.json", str(tmp_path))
+    assert second.source == first.source
+    assert second.is_valid({"id": "ab", "kind": "a"})
+
+
+def test_tampered_compiled_source_is_not_run(tmp_path):
+    validator = Draft202012Validator(SCHEMA)
+    compile_validator(validator, "schema.json", str(tmp_path))
+    (entry,) = [path for path in tmp_path.iterdir() if path.suffix == ".json"]
+    cached = json.loads(entry.read_text())
+    cached["source"] = "def validate(data):\n    raise SystemExit('injected')\n"
+    entry.write_text(json.dumps(cached))
+
+    compiled_validator = compile_validator(validator, "schema.json", str(tmp_path))
+    assert "injected" not in compiled_validator.source
+    assert compiled_validator.is_valid({"id": "ab", "kind": "a"})
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_compiled_cache_requires_a_private_key(tmp_path):
+    validator = Draft202012Validator(SCHEMA)
+    compile_validator(validator, "schema.json", str(tmp_path))
+    os.chmod(tmp_path / "compiled.key", 0o644)
+    assert compiled._cache_key(str(tmp_path)) is None
+
+
+def test_compiled_engine_option(tmp_path):
+    stac = stac_validator.StacValidate(
+        "tests/test_data/v100/extended-item-no-extensions.json",
+        custom="tests/test_data/schema/v1.0.0/projection.json",
+        engine="compiled",
+        schema_cache_dir=str(tmp_path),
+    )
+    stac.run()
+    assert stac.message[0]["valid_stac"] is True
+    # Generated code is only cached on disk when asked for
+    assert not (tmp_path / "compiled").exists()
+
+    with pytest.raises(ValueError):
+        stac_validator.StacValidate(engine="fast")
@@ -0,0 +1,133 @@
+"""
+Description: Test the flattened (pre-dereferenced) schema mode
+
+"""
+
+import json
+
+import pytest
+
+from stac_validator import stac_validator
+from stac_validator.utilities import build_validator, get_flattened_schema
+
+DRAFT_07 = "http://json-schema.org/draft-07/schema#"
+
+
+@pytest.fixture
+def schemas(tmp_path):
+    geometry = {
+        "$schema": DRAFT_07,
+        "$id": str(tmp_path / "geometry.json"),
+        "definitions": {"position": {"type": "array", "minItems": 2}},
+        "type": "object",
+        "required": ["type", "coordinates"],
+        "properties": {
+            "type": {"enum": ["Point"]},
+            # Ignored up to draft 7, since the sibling of a `$ref`
+            "coordinates": {"$ref": "#/definitions/position", "maxItems": 1},
+        },
+    }
+    tree = {
+        "$schema": DRAFT_07,
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "children": {"type": "array", "items": {"$ref": "#"}},
+        },
+    }
+    item = {
+        "$schema": DRAFT_07,
+        "type": "object",
+        "required": ["id", "geometry"],
+        "properties": {
+            "id": {"type": "string", "description": "Item id"},
+            "geometry": {
+                "$ref": f"{tmp_path / 'geometry.json'}",
+                "description": "Item geometry",
+            },
+            "tree": {"$ref": f"{tmp_path / 'tree.json'}"},
+        },
+    }
+    for name, schema in (
+        ("geometry.json", geometry),
+        ("tree.json", tree),
+        ("item.json", item),
+    ):
+        (tmp_path / name).write_text(json.dumps(schema))
+    return tmp_path
+
+
+def errors(validator, instance):
+    return sorted(
+        (error.message, list(error.absolute_path), error.validator)
+        for error in validator.iter_errors(instance)
+    )
+
+
+def test_flattened_schema_has_no_remote_refs(schemas):
+    flattened = get_flattened_schema(str(schemas / "item.json"))
+    text = json.dumps(flattened)
+    assert f'"$ref": "{schemas / "geometry.json"}' not in text
+    assert f'"$ref": "{schemas / "tree.json"}' not in text
+    assert flattened["properties"]["geometry"]["description"] == "Item geometry"
+    # The recursive reference is kept as a local definition
+    assert len(flattened["$defs"]) == 1
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [
+        {"id": "a", "geometry": {"type": "Point", "coordinates": [1, 2]}},
+        {"id": 1, "geometry": {"type": "Line", "coordinates": [1]}},
+        {"id": "a"},
+        {
+            "id": "a",
+            "geometry": {"type": "Point", "coordinates": [1, 2]},
+            "tree": {"name": "root", "children": [{"name": 1, "children": [{}]}]},
+        },
+    ],
+)
+def test_flattened_schema_gives_identical_errors(schemas, instance):
+    schema_path = str(schemas / "item.json")
+    original = build_validator(schema_path)
+    flattened = build_validator(schema_path, flatten=True)
+    assert errors(flattened, instance) == errors(original, instance)
+
+
+def test_flatten_schemas_option():
+    stac = stac_validator.StacValidate(
+        "tests/test_data/v100/extended-item-no-extensions.json",
+        custom="tests/test_data/schema/v1.0.0/projection.json",
+        flatten_schemas=True,
+    )
+    stac.run()
+    assert stac.message[0]["valid_stac"] is True
+
+
+def test_flattened_schema_reports_the_same_error_message(tmp_path):
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "type": "object",
+        "properties": {"id": {"$ref": "#/$defs/id", "minLength": 5}},
+        "$defs": {"id": {"type": "string", "maxLength": 1}},
+    }
+    (tmp_path / "schema.json").write_text(json.dumps(schema))
+    item = {
+        "stac_version": "1.0.0",
+        "type": "Feature",
+        "id": "abc",
+        "stac_extensions": [],
+    }
+    (tmp_path / "item.json").write_text(json.dumps(item))
+
+    messages = []
+    for flatten_schemas in (False, True):
+        stac = stac_validator.StacValidate(
+            str(tmp_path / "item.json"),
+            custom=str(tmp_path / "schema.json"),
+            flatten_schemas=flatten_schemas,
+        )
+        stac.run()
+        assert stac.message[0]["valid_stac"] is False
+        messages.append(stac.message[0]["error_message"])
+    assert messages[0] == messages[1]
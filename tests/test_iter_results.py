@@ -0,0 +1,101 @@
+"""
+Description: Test streaming validation results with StacValidate.iter_results
+
+"""
+
+import json
+
+import pytest
+
+from tests.helpers import LOWERCASE_ID_SCHEMA, catalog, item, validator
+
+
+@pytest.fixture
+def tree(stac_tree):
+    objects = {
+        "catalog.json": catalog(
+            "root",
+            [("child", "a/catalog.json")]
+            + [("item", f"item-{i}.json") for i in range(3)],
+        ),
+        "a/catalog.json": catalog("a", [("item", f"a-{i}.json") for i in range(4)]),
+        "items.json": {
+            "type": "FeatureCollection",
+            "features": [item(f"feature-{i}") for i in range(5)],
+        },
+    }
+    objects.update({f"item-{i}.json": item(f"item-{i}") for i in range(3)})
+    objects.update({f"a/a-{i}.json": item(f"a-{i}") for i in range(4)})
+    return stac_tree(objects, LOWERCASE_ID_SCHEMA, LOWERCASE_ID_SCHEMA)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"workers": 4},
+        {"async_crawl": True},
+        {"processes": 2},
+    ],
+)
+def test_iter_results_recursive(tree, kwargs):
+    root, schema_map = tree
+    options = dict(recursive=True, trace_recursion=True, **kwargs)
+    expected = validator(root / "catalog.json", schema_map, **options)
+    expected.run()
+
+    stac = validator(root / "catalog.json", schema_map, **options)
+    results = list(stac.iter_results())
+    assert results == expected.message
+    assert len(results) == 9
+    assert stac.valid
+    assert stac.message == []
+
+
+def test_iter_results_single_object(tree):
+    root, schema_map = tree
+    results = list(validator(root / "item-0.json", schema_map).iter_results())
+    assert [message["valid_stac"] for message in results] == [True]
+
+    results = list(validator(root / "missing.json", schema_map).iter_results())
+    assert results[0]["error_type"] == "FileNotFoundError"
+
+
+def test_iter_results_item_collection(tree):
+    root, schema_map = tree
+    stac = validator(root / "items.json", schema_map, item_collection=True)
+    results = list(stac.iter_results())
+    assert [message["path"] for message in results] == [
+        f"{root / 'items.json'}/feature-{i}" for i in range(5)
+    ]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"workers": 4}, {"async_crawl": True}])
+def test_iter_results_yields_before_the_end(tree, kwargs):
+    root, schema_map = tree
+    stac = validator(root / "catalog.json", schema_map, recursive=True, **kwargs)
+    results = stac.iter_results(buffer_size=1)
+    first = next(results)
+    assert first["path"] == str(root / "catalog.json")
+    # Closing the generator stops the validation
+    results.close()
+    assert stac._sink is None
+
+
+def test_iter_results_writes_log(tree):
+    root, schema_map = tree
+    log = root / "log.json"
+    stac = validator(root / "catalog.json", schema_map, recursive=True, log=str(log))
+    results = list(stac.iter_results())
+    assert log.read_text() == json.dumps(results, indent=4)
+
+
+def test_iter_results_invalid_item_ends_recursion(tree):
+    root, schema_map = tree
+    (root / "a" / "a-1.json").write_text(json.dumps(item("1")))
+    stac = validator(root / "catalog.json", schema_map, recursive=True)
+    results = list(stac.iter_results())
+    assert not stac.valid
+    # Messages of valid objects are yielded before the error
+    assert results[0]["valid_stac"]
+    assert results[-1]["error_type"] == "JSONSchemaValidationError"
@@ -0,0 +1,303 @@
+"""
+Description: Test checking the links and assets of STAC objects concurrently
+
+"""
+
+import json
+import os
+import threading
+
+import pytest
+import requests_mock
+
+from stac_validator import stac_validator
+from stac_validator.link_checker import LinkCache, LinkChecker, local_path
+
+BASE_URL = "https://example.com/data/"
+
+
+def empty_message():
+    return {
+        "format_valid": [],
+        "format_invalid": [],
+        "request_valid": [],
+        "request_invalid": [],
+    }
+
+
+@pytest.fixture
+def server():
+    with requests_mock.Mocker() as mock:
+        mock.head(BASE_URL + "ok.tif", status_code=200)
+        mock.head(BASE_URL + "missing.tif", status_code=404)
+        mock.head(BASE_URL + "created.tif", status_code=201)
+        yield mock
+
+
+def test_check_links_message(server):
+    checker = LinkChecker()
+    message = empty_message()
+    links = [
+        {"href": BASE_URL + "ok.tif"},
+        {"href": BASE_URL + "missing.tif"},
+        {"href": BASE_URL + "created.tif"},
+        {"href": "./relative.tif"},
+        {"href": BASE_URL + "ok.tif"},
+    ]
+    checker.check_links(links, message)
+    assert message == {
+        "format_valid": [
+            BASE_URL + "ok.tif",
+            BASE_URL + "missing.tif",
+            BASE_URL + "created.tif",
+            BASE_URL + "ok.tif",
+        ],
+        "format_invalid": ["./relative.tif"],
+        "request_valid": [BASE_URL + "ok.tif", BASE_URL + "ok.tif"],
+        "request_invalid": [BASE_URL + "missing.tif", "./relative.tif"],
+    }
+    # Each href is requested once
+    assert server.call_count == 3
+
+
+def test_check_links_without_opening_urls(server):
+    message = empty_message()
+    LinkChecker().check_links(
+        [{"href": BASE_URL + "ok.tif"}, {"href": "relative.tif"}],
+        message,
+        open_urls=False,
+    )
+    assert message["format_valid"] == [BASE_URL + "ok.tif"]
+    assert message["request_valid"] == []
+    assert message["request_invalid"] == ["relative.tif"]
+    assert server.call_count == 0
+
+
+def test_check_links_sends_headers(server):
+    LinkChecker(headers={"Authorization": "token"}).check([BASE_URL + "ok.tif"])
+    assert server.last_request.headers["Authorization"] == "token"
+
+
+def test_failed_requests_are_invalid(server):
+    server.head(BASE_URL + "down.tif", exc=ConnectionError)
+    assert LinkChecker().check([BASE_URL + "down.tif"]) == {
+        BASE_URL + "down.tif": False
+    }
+
+
+def test_hrefs_are_probed_with_head(server):
+    assert LinkChecker().check([BASE_URL + "ok.tif"]) == {BASE_URL + "ok.tif": True}
+    assert [request.method for request in server.request_history] == ["HEAD"]
+
+
+@pytest.mark.parametrize(
+    "get_status, valid", [(206, True), (200, True), (404, False), (416, False)]
+)
+def test_range_request_without_head_support(server, get_status, valid):
+    href = BASE_URL + "no-head.tif"
+    server.head(href, status_code=405)
+    server.get(href, status_code=get_status)
+    assert LinkChecker().check([href]) == {href: valid}
+    assert [request.method for request in server.request_history] == ["HEAD", "GET"]
+    assert server.last_request.headers["Range"] == "bytes=0-0"
+
+
+def test_s3_hrefs_are_not_verified(server):
+    href = "https://my.bucket.s3.amazonaws.com/ok.tif"
+    server.head(href, status_code=200)
+    assert LinkChecker().check([href]) == {href: True}
+    assert server.last_request.verify is False
+
+
+def test_links_are_checked_concurrently(monkeypatch):
+    hrefs = [BASE_URL + f"{i}.tif" for i in range(4)]
+    # Every check waits for the others, which only succeeds if all are concurrent
+    barrier = threading.Barrier(len(hrefs), timeout=5)
+
+    def open_href(href):
+        barrier.wait()
+        return True
+
+    checker = LinkChecker(max_workers=len(hrefs))
+    monkeypatch.setattr(checker, "_open", open_href)
+    assert checker.check(hrefs) == {href: True for href in hrefs}
+    checker.close()
+
+
+def test_assets_validator_uses_the_link_checker(server):
+    stac = stac_validator.StacValidate(assets=True, link_workers=2)
+    stac.stac_content = {
+        "assets": {
+            "data": {"href": BASE_URL + "ok.tif"},
+            "thumbnail": {"href": BASE_URL + "missing.tif"},
+        }
+    }
+    message = stac.assets_validator()
+    assert message["request_valid"] == [BASE_URL + "ok.tif"]
+    assert message["request_invalid"] == [BASE_URL + "missing.tif"]
+    assert stac.link_checker.max_workers == 2
+
+
+def test_hrefs_are_checked_once_per_run(server):
+    checker = LinkChecker()
+    for _ in range(3):
+        message = empty_message()
+        checker.check_links(
+            [{"href": BASE_URL + "ok.tif"}, {"href": BASE_URL + "missing.tif"}],
+            message,
+        )
+        assert message["request_valid"] == [BASE_URL + "ok.tif"]
+        assert message["request_invalid"] == [BASE_URL + "missing.tif"]
+    assert server.call_count == 2
+    assert checker.requested == 2
+    assert checker.reused == 4
+    assert checker.saved == 4
+
+
+def test_concurrent_checks_of_an_href_share_one_request(server):
+    checker = LinkChecker()
+    threads = [
+        threading.Thread(target=checker.check, args=([BASE_URL + "ok.tif"],))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.call_count == 1
+    assert checker.reused == 7
+
+
+def test_link_cache_is_reused_by_the_next_run(server, tmp_path):
+    path = str(tmp_path / "links.sqlite")
+    hrefs = [BASE_URL + "ok.tif", BASE_URL + "created.tif", BASE_URL + "missing.tif"]
+    first = LinkChecker(cache=LinkCache(path))
+    results = first.check(hrefs)
+    assert first.requested == 3
+    first.close()
+
+    second = LinkChecker(cache=LinkCache(path))
+    assert second.check(hrefs) == results
+    # Failing links are checked again
+    assert second.cached == 2
+    assert second.requested == 1
+    second.close()
+
+    # Results are kept for the headers they were checked with
+    other = LinkChecker({"Authorization": "token"}, cache=LinkCache(path))
+    other.check(hrefs)
+    assert other.cached == 0
+    other.close()
+
+
+def test_link_cache_results_expire(server, tmp_path):
+    path = str(tmp_path / "links.sqlite")
+    LinkChecker(cache=LinkCache(path)).check([BASE_URL + "ok.tif"])
+    checker = LinkChecker(cache=LinkCache(path, ttl=0))
+    checker.check([BASE_URL + "ok.tif"])
+    assert checker.cached == 0
+    assert checker.requested == 1
+
+
+def local_item(assets, links=()):
+    return {
+        "type": "Feature",
+        "stac_version": "1.0.0",
+        "id": "item",
+        "properties": {},
+        "links": list(links),
+        "assets": assets,
+    }
+
+
+@pytest.mark.parametrize(
+    "href, base, expected",
+    [
+        ("./data/b1.tif", "/catalog/items/item.json", "/catalog/items/./data/b1.tif"),
+        ("../b1.tif", "items/item.json", "items/../b1.tif"),
+        ("file:///data/my%20b1.tif", None, "/data/my b1.tif"),
+        ("file://localhost/data/b1.tif", BASE_URL + "item.json", "/data/b1.tif"),
+        ("b1.tif", "file:///catalog/item.json", "/catalog/b1.tif"),
+        ("/data/b1.tif", "/catalog/item.json", "/data/b1.tif"),
+        ("/data/b1.tif", None, None),
+        ("/data/b1.tif", BASE_URL + "item.json", None),
+        ("b1.tif", None, None),
+        ("b1.tif", "https://example.com/item.json", None),
+        ("file://server/b1.tif", None, None),
+        ("mailto:someone@example.com", "item.json", None),
+    ],
+)
+def test_local_path(href, base, expected):
+    assert local_path(href, base) == expected
+
+
+def test_local_assets_are_checked_against_the_document(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "b1.tif").write_bytes(b"1234")
+    (tmp_path / "data" / "b2.tif").write_bytes(b"12")
+    (tmp_path / "data" / "cube.zarr").mkdir()
+    item_path = tmp_path / "item.json"
+    item_path.write_text(
+        json.dumps(
+            local_item(
+                {
+                    "b1": {"href": "./data/b1.tif", "file:size": 4},
+                    "b2": {"href": "data/b2.tif", "file:size": 4},
+                    "cube": {"href": "data/cube.zarr"},
+                    "b3": {"href": (tmp_path / "data" / "b3.tif").as_uri()},
+                    "b4": {"href": "missing/b4.tif"},
+                },
+                links=[{"rel": "self", "href": "./item.json"}],
+            )
+        )
+    )
+    stac = stac_validator.StacValidate(str(item_path), links=True, assets=True)
+    stac.stac_content = json.loads(item_path.read_text())
+    message = stac.assets_validator()
+    assert message["format_invalid"] == []
+    assert message["request_valid"] == ["./data/b1.tif", "data/cube.zarr"]
+    assert message["request_invalid"] == [
+        "data/b2.tif",
+        (tmp_path / "data" / "b3.tif").as_uri(),
+        "missing/b4.tif",
+    ]
+    assert stac.links_validator()["request_valid"] == ["./item.json"]
+    # One listing per directory, however many hrefs are in it
+    assert stac.link_checker.listings.scanned == 3
+    assert stac.link_checker.local == 6
+
+
+def test_directories_are_listed_once(tmp_path, monkeypatch):
+    for i in range(50):
+        (tmp_path / f"{i}.tif").write_bytes(b"")
+    scans = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        scans.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    checker = LinkChecker()
+    links = [{"href": f"{i}.tif"} for i in range(60)]
+    message = empty_message()
+    checker.check_links(links, message, base=str(tmp_path / "item.json"))
+    assert len(message["request_valid"]) == 50
+    assert len(message["request_invalid"]) == 10
+    assert scans == [str(tmp_path)]
+
+
+def test_file_urls_are_checked_on_disk(server, tmp_path):
+    (tmp_path / "b1.tif").write_bytes(b"")
+    links = [
+        {"href": f"file://localhost{tmp_path}/b1.tif"},
+        {"href": f"file://localhost{tmp_path}/b2.tif"},
+        {"href": "/b3.tif"},
+    ]
+    checker = LinkChecker()
+    message = empty_message()
+    checker.check_links(links, message, base=BASE_URL + "item.json")
+    assert server.call_count == 0
+    assert message["request_valid"] == [links[0]["href"]]
+    assert message["request_invalid"] == [links[1]["href"], "/b3.tif"]
+    assert checker.local == 2
@@ -0,0 +1,118 @@
+"""
+Description: Test the manifest of recursive validation results reused between runs
+
+"""
+
+import os
+import pathlib
+
+import pytest
+
+from stac_validator import manifest
+from tests.helpers import (
+    ITEM_SCHEMA,
+    catalog,
+    item,
+    recursive_validator,
+    write_json,
+    write_schemas,
+    write_tree,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "catalog"
+    objects = {
+        "catalog.json": catalog(
+            "root",
+            [("child", "a/catalog.json")]
+            + [("item", f"item-{i}.json") for i in range(3)],
+        ),
+        "a/catalog.json": catalog("a", [("item", f"a-{i}.json") for i in range(2)]),
+    }
+    objects.update({f"item-{i}.json": item(f"item-{i}") for i in range(3)})
+    objects.update({f"a/a-{i}.json": item(f"a-{i}") for i in range(2)})
+    write_tree(root, objects)
+    return root, write_schemas(tmp_path), str(tmp_path / "manifest.sqlite")
+
+
+def run(root, schema_map, manifest_path, **kwargs):
+    stac = recursive_validator(root, schema_map, manifest=manifest_path, **kwargs)
+    valid = stac.run()
+    return valid, stac.message, stac.manifest
+
+
+def test_manifest_reuses_unchanged_results(tree):
+    root, schema_map, manifest_path = tree
+    first = run(root, schema_map, manifest_path)
+    assert first[0]
+    assert (first[2].reused, first[2].recorded) == (0, 7)
+
+    second = run(root, schema_map, manifest_path)
+    assert second[:2] == first[:2]
+    assert (second[2].reused, second[2].recorded) == (7, 0)
+    assert len(second[2]) == 7
+
+
+def test_manifest_revalidates_changed_objects(tree):
+    root, schema_map, manifest_path = tree
+    run(root, schema_map, manifest_path)
+    changed = item("item-1")
+    changed["properties"] = {"datetime": None}
+    write_json(root / "item-1.json", changed)
+
+    _, _, result = run(root, schema_map, manifest_path)
+    assert (result.reused, result.recorded) == (6, 1)
+
+
+def test_schema_set_hash_covers_mapped_schema_files(tree):
+    _, schema_map, _ = tree
+    settings = {"engine": "jsonschema"}
+    before = manifest.schema_set_hash(settings, schema_map)
+    assert manifest.schema_set_hash(settings, dict(schema_map)) == before
+    assert manifest.schema_set_hash({"engine": "compiled"}, schema_map) != before
+
+    write_json(
+        pathlib.Path(schema_map[ITEM_SCHEMA]),
+        {"$schema": "http://json-schema.org/draft-07/schema#", "required": ["id"]},
+    )
+    assert manifest.schema_set_hash(settings, schema_map) != before
+
+
+def test_manifest_ignores_results_of_another_schema_set(tree):
+    root, schema_map, manifest_path = tree
+    run(root, schema_map, manifest_path)
+    schema_map = dict(schema_map, **{"https://example.com/unused.json": "unused"})
+    _, _, result = run(root, schema_map, manifest_path)
+    assert (result.reused, result.recorded) == (0, 7)
+
+
+def test_manifest_skips_hashing_unchanged_files(tree, monkeypatch):
+    root, schema_map, manifest_path = tree
+    for path in root.rglob("*.json"):
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    run(root, schema_map, manifest_path)
+
+    def fail(stac_content):
+        raise AssertionError("unchanged file hashed")
+
+    monkeypatch.setattr(manifest, "content_hash", fail)
+    _, _, result = run(root, schema_map, manifest_path)
+    assert result.reused == 7
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"workers": 4}, {"processes": 2}, {"async_crawl": True, "processes": 2}]
+)
+def test_manifest_with_concurrent_validation(tree, kwargs):
+    root, schema_map, manifest_path = tree
+    serial = run(root, schema_map, manifest_path)
+    manifest_path = str(root.parent / "concurrent.sqlite")
+    first = run(root, schema_map, manifest_path, **kwargs)
+    assert first[:2] == serial[:2]
+    assert first[2].recorded == 7
+
+    second = run(root, schema_map, manifest_path, **kwargs)
+    assert second[:2] == serial[:2]
+    assert second[2].reused == 7
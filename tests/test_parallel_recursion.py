@@ -0,0 +1,126 @@
+"""
+Description: Test parallel recursive validation with a pool of workers
+
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from stac_validator import stac_validator, validate
+from tests.helpers import ID_SCHEMA, LOWERCASE_ID_SCHEMA, catalog, item, run
+
+
+@pytest.fixture
+def tree(stac_tree):
+    objects = {
+        "catalog.json": catalog(
+            "root",
+            [("child", "a/catalog.json"), ("child", "b/catalog.json")]
+            + [("item", f"item-{i}.json") for i in range(3)],
+        ),
+        "a/catalog.json": catalog(
+            "a",
+            [("item", "a-item.json"), ("child", "c/catalog.json")],
+        ),
+        "a/c/catalog.json": catalog("c", [("item", f"c-{i}.json") for i in range(5)]),
+        # Invalid, so its children are not validated
+        "b/catalog.json": catalog(5, [("child", "d/catalog.json")]),
+        "a/a-item.json": item("a-item"),
+    }
+    objects.update({f"item-{i}.json": item(f"item-{i}") for i in range(3)})
+    objects.update({f"a/c/c-{i}.json": item(f"c-{i}") for i in range(5)})
+    return stac_tree(objects, ID_SCHEMA, LOWERCASE_ID_SCHEMA)
+
+
+@pytest.mark.parametrize("max_depth", [None, 1, 2, 3])
+def test_parallel_recursion_matches_serial(tree, max_depth):
+    root, schema_map = tree
+    serial = run(root, schema_map, max_depth=max_depth)
+    parallel = run(root, schema_map, max_depth=max_depth, workers=4)
+    assert parallel == serial
+    # The invalid catalog is only reached without a maximum depth
+    assert serial[0] is (max_depth is not None)
+
+
+def test_parallel_recursion_invalid_item(tree):
+    root, schema_map = tree
+    (root / "a" / "c" / "c-2.json").write_text(json.dumps(item("2")))
+    serial = run(root, schema_map)
+    parallel = run(root, schema_map, workers=4)
+    assert parallel == serial
+    assert serial[1][-1]["path"] == str(root / "a" / "c" / "c-2.json")
+    assert serial[1][-1]["error_type"] == "JSONSchemaValidationError"
+
+
+def test_parallel_recursion_missing_object(tree):
+    root, schema_map = tree
+    (root / "a" / "c" / "c-3.json").unlink()
+    serial = run(root, schema_map)
+    parallel = run(root, schema_map, workers=4)
+    assert parallel == serial
+    assert serial[1][-1]["error_type"] == "FileNotFoundError"
+
+
+def test_parallel_recursion_requires_a_worker():
+    with pytest.raises(ValueError):
+        stac_validator.StacValidate(recursive=True, workers=0)
+
+
+def test_parallel_recursion_is_concurrent(tree, monkeypatch):
+    # Every fetch of a top-level item waits for the other two, which only succeeds
+    # if they are fetched at the same time
+    root, schema_map = tree
+    barrier = threading.Barrier(3, timeout=5)
+    fetch = validate.fetch_and_parse_file
+
+    def fetch_and_wait(path, headers=None):
+        if os.path.basename(path).startswith("item-"):
+            barrier.wait()
+        return fetch(path, headers)
+
+    monkeypatch.setattr(validate, "fetch_and_parse_file", fetch_and_wait)
+    valid, messages = run(root, schema_map, max_depth=1, workers=3)
+    assert valid
+    assert len(messages) == 4
+
+
+def test_recursion_in_processes_matches_serial(tree):
+    root, schema_map = tree
+    (root / "a" / "c" / "c-2.json").write_text(json.dumps(item("2")))
+    serial = run(root, schema_map)
+    processes = run(root, schema_map, processes=2)
+    assert processes == serial
+    assert serial[1][-1]["error_type"] == "JSONSchemaValidationError"
+
+    (root / "a" / "c" / "c-2.json").write_text(json.dumps(item("c-2")))
+    serial = run(root, schema_map, max_depth=2)
+    processes = run(root, schema_map, max_depth=2, processes=2, workers=4)
+    assert processes == serial
+
+
+def test_item_collection_in_processes_matches_serial(tree):
+    root, schema_map = tree
+    item_collection = {
+        "type": "FeatureCollection",
+        "features": [item(f"i-{i}") for i in range(40)] + [item("1")],
+    }
+
+    def validate(**kwargs):
+        stac = stac_validator.StacValidate(
+            "https://example.com/search",
+            item_collection=True,
+            schema_map=schema_map,
+            schema_cache=False,
+            **kwargs,
+        )
+        stac.validate_item_collection_dict(item_collection)
+        return stac.valid, stac.message
+
+    serial = validate()
+    processes = validate(processes=2)
+    assert processes == serial
+    assert len(serial[1]) == 41
+    assert serial[1][-1]["valid_stac"] is False
@@ -0,0 +1,123 @@
+"""
+Description: Test the concurrent prefetch of extension schemas
+
+"""
+
+import json
+import threading
+
+import pytest
+import requests_mock
+
+from stac_validator import stac_validator
+from stac_validator.schema_cache import configure_schema_cache
+from stac_validator.utilities import (
+    SCHEMA_STORE,
+    clear_prefetched_schemas,
+    prefetch_schemas,
+)
+
+BASE_URL = "https://example.com/extensions/"
+EXTENSIONS = [BASE_URL + name for name in ("a.json", "b.json", "c.json")]
+COMMON = {"definitions": {"id": {"type": "string"}}}
+
+
+def extension_schema(name):
+    return {
+        "$id": BASE_URL + name,
+        "properties": {"id": {"$ref": "common.json#/definitions/id"}},
+    }
+
+
+@pytest.fixture
+def schema_server():
+    configure_schema_cache(enabled=False)
+    SCHEMA_STORE.clear()
+    clear_prefetched_schemas()
+    with requests_mock.Mocker() as mock:
+        mock.get(BASE_URL + "common.json", json=COMMON)
+        yield mock
+    configure_schema_cache(enabled=False)
+    SCHEMA_STORE.clear()
+    clear_prefetched_schemas()
+
+
+def test_prefetch_fetches_schemas_and_refs(schema_server):
+    for url in EXTENSIONS:
+        schema_server.get(url, json=extension_schema(url.rsplit("/", 1)[1]))
+
+    prefetch_schemas(EXTENSIONS)
+    for url in EXTENSIONS + [BASE_URL + "common.json"]:
+        assert url in SCHEMA_STORE
+    assert schema_server.call_count == 4
+
+    # Already prefetched, nothing is requested again
+    prefetch_schemas(EXTENSIONS)
+    assert schema_server.call_count == 4
+
+
+def test_prefetch_is_concurrent(schema_server, monkeypatch):
+    # Every load waits for the other two, which only succeeds if all three
+    # extension schemas are fetched at the same time
+    barrier = threading.Barrier(len(EXTENSIONS), timeout=5)
+
+    def load(url):
+        if url not in EXTENSIONS:
+            return json.dumps(COMMON).encode()
+        barrier.wait()
+        return json.dumps(extension_schema(url.rsplit("/", 1)[1])).encode()
+
+    monkeypatch.setattr(SCHEMA_STORE, "loader", load)
+    prefetch_schemas(EXTENSIONS)
+    for url in EXTENSIONS:
+        assert url in SCHEMA_STORE
+
+
+def test_prefetch_ignores_failures(schema_server):
+    schema_server.get(EXTENSIONS[0], status_code=404)
+    schema_server.get(EXTENSIONS[1], json=extension_schema("b.json"))
+
+    prefetch_schemas(EXTENSIONS[:2])
+    assert EXTENSIONS[0] not in SCHEMA_STORE
+    assert EXTENSIONS[1] in SCHEMA_STORE
+
+
+def test_prefetch_retries_failures(schema_server):
+    schema_server.get(EXTENSIONS[0], status_code=404)
+    assert not prefetch_schemas(EXTENSIONS[:1])
+    assert EXTENSIONS[0] not in SCHEMA_STORE
+
+    # Once the failure is no longer cached, the next prefetch fetches it again
+    schema_server.get(EXTENSIONS[0], json=extension_schema("a.json"))
+    SCHEMA_STORE.clear()
+    assert prefetch_schemas(EXTENSIONS[:1])
+    assert EXTENSIONS[0] in SCHEMA_STORE
+
+
+def test_failed_prefetch_is_retried_by_the_validation_plan(schema_server):
+    schema_server.get(EXTENSIONS[0], status_code=404)
+    stac = stac_validator.StacValidate(extensions=True, schema_cache=False)
+    stac.version = "1.0.0"
+    stac.stac_content = {"type": "Feature", "stac_extensions": EXTENSIONS[:1]}
+    stac.extensions_validator("ITEM")
+    plan = stac._validation_plan("ITEM")
+    assert not plan.prefetched
+
+    schema_server.get(EXTENSIONS[0], json=extension_schema("a.json"))
+    SCHEMA_STORE.clear()
+    stac.extensions_validator("ITEM")
+    assert plan.prefetched
+
+
+def test_prefetch_extension_schemas_of_object(schema_server):
+    core = "https://schemas.stacspec.org/v1.0.0/item-spec/json-schema/item.json"
+    projection = "https://cdn.staclint.com/v1.0.0/extension/projection.json"
+    for url in (core, projection, EXTENSIONS[0]):
+        schema_server.get(url, json={})
+
+    stac = stac_validator.StacValidate(schema_cache=False)
+    stac.version = "1.0.0"
+    stac.stac_content = {"stac_extensions": ["proj", EXTENSIONS[0], "local.json"]}
+    stac._prefetch_schemas("Item", core=True)
+    for url in (core, projection, EXTENSIONS[0]):
+        assert url in SCHEMA_STORE
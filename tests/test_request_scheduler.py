@@ -0,0 +1,170 @@
+"""
+Description: Test the per-host rate limits, timeouts and retries of HTTP requests
+
+"""
+
+import email.utils
+import threading
+import time
+
+import pytest
+import requests_mock
+
+from stac_validator import request_scheduler, stac_validator
+from stac_validator.request_scheduler import (
+    RequestScheduler,
+    TokenBucket,
+    parse_retry_after,
+)
+from stac_validator.utilities import fetch_and_parse_file
+
+URL = "https://example.com/catalog.json"
+
+
+@pytest.fixture
+def server():
+    with requests_mock.Mocker() as mock:
+        yield mock
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Record the waits of the scheduler instead of sleeping."""
+    waits = []
+    monkeypatch.setattr(request_scheduler.time, "sleep", waits.append)
+    return waits
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= parse_retry_after(date) <= 30
+
+
+def test_throttled_requests_are_retried_after_retry_after(server, no_sleep):
+    server.get(
+        URL,
+        [
+            {"status_code": 429, "headers": {"Retry-After": "2"}},
+            {"status_code": 503, "headers": {"Retry-After": "1"}},
+            {"status_code": 200, "json": {"id": "catalog"}},
+        ],
+    )
+    scheduler = RequestScheduler()
+    response = scheduler.get(URL)
+    assert response.status_code == 200
+    assert server.call_count == 3
+    assert scheduler.retries == 2
+    assert len(no_sleep) == 2 and 1 < no_sleep[0] <= 2
+
+
+def test_retries_stop_after_max_retries(server, no_sleep):
+    server.get(URL, status_code=429, headers={"Retry-After": "1"})
+    response = RequestScheduler(max_retries=2).get(URL)
+    assert response.status_code == 429
+    assert server.call_count == 3
+
+
+def test_long_retry_after_and_other_errors_are_not_retried(server, no_sleep):
+    server.get(URL, status_code=503, headers={"Retry-After": "3600"})
+    assert RequestScheduler().get(URL).status_code == 503
+    server.get(URL, status_code=500)
+    assert RequestScheduler().get(URL).status_code == 500
+    assert server.call_count == 2
+
+
+def test_requests_have_timeouts(server):
+    server.get(URL, json={})
+    RequestScheduler(connect_timeout=2, read_timeout=5).get(URL)
+    assert server.last_request.timeout == (2, 5)
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1
+    assert 0.19 < bucket.reserve() <= 0.2
+
+
+def test_rate_limit_is_per_host(server, no_sleep):
+    server.get(requests_mock.ANY, json={})
+    scheduler = RequestScheduler(rate=1)
+    scheduler.get("https://a.example.com/1.json")
+    scheduler.get("https://b.example.com/1.json")
+    assert no_sleep == []
+    scheduler.get("https://a.example.com/2.json")
+    assert len(no_sleep) == 1 and 0.9 < no_sleep[0] <= 1
+
+
+def test_connections_per_host_are_limited():
+    scheduler = RequestScheduler(max_connections=2)
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def request():
+        with scheduler.slot(URL):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 2
+
+
+def test_fetch_and_parse_file_goes_through_the_scheduler(server, no_sleep):
+    server.get(
+        URL,
+        [
+            {"status_code": 429, "headers": {"Retry-After": "1"}},
+            {"json": {"id": "catalog"}},
+        ],
+    )
+    assert fetch_and_parse_file(URL) == {"id": "catalog"}
+    assert server.call_count == 2
+    assert server.last_request.timeout == request_scheduler.SCHEDULER.timeout
+
+
+def test_later_validators_reset_the_scheduler():
+    scheduler = request_scheduler.SCHEDULER
+    try:
+        stac_validator.StacValidate(
+            rate_limit=2, max_host_connections=1, read_timeout=5
+        )
+        assert (scheduler.rate, scheduler.max_connections) == (2, 1)
+        assert scheduler.timeout == (request_scheduler.DEFAULT_CONNECT_TIMEOUT, 5)
+        stac_validator.StacValidate()
+        assert (scheduler.rate, scheduler.max_connections) == (None, None)
+        assert scheduler.timeout == (
+            request_scheduler.DEFAULT_CONNECT_TIMEOUT,
+            request_scheduler.DEFAULT_READ_TIMEOUT,
+        )
+    finally:
+        request_scheduler.configure_request_scheduler()
+
+
+def test_streamed_responses_hold_their_connection_until_closed(server):
+    server.get(URL, content=b"{}")
+    scheduler = RequestScheduler(max_connections=1)
+    connections = scheduler._host(URL).connections
+    response = scheduler.get(URL, stream=True)
+    assert not connections.acquire(blocking=False)
+    response.close()
+    response.close()
+    assert connections.acquire(blocking=False)
+    connections.release()
+    with scheduler.get(URL, stream=True):
+        assert not connections.acquire(blocking=False)
+    scheduler.get(URL)
+    assert connections.acquire(blocking=False)
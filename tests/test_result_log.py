@@ -0,0 +1,100 @@
+"""
+Description: Test logging recursive validation results as JSON Lines
+
+"""
+
+import json
+
+import pytest
+
+from stac_validator import stac_validator
+from stac_validator.result_log import JsonArrayLog, ResultCounter
+from tests.helpers import ID_SCHEMA, catalog, item, recursive_validator
+
+
+@pytest.fixture
+def tree(stac_tree):
+    objects = {
+        "catalog.json": catalog(
+            "root",
+            [("child", "a/catalog.json"), ("child", "b/catalog.json")]
+            + [("item", f"item-{i}.json") for i in range(3)],
+        ),
+        "a/catalog.json": catalog("a", [("item", f"a-{i}.json") for i in range(3)]),
+        # Invalid, so its items are not validated
+        "b/catalog.json": catalog(5, [("item", "b-0.json")]),
+    }
+    objects.update({f"item-{i}.json": item(f"item-{i}") for i in range(3)})
+    objects.update({f"a/a-{i}.json": item(f"a-{i}") for i in range(3)})
+    return stac_tree(objects, ID_SCHEMA, ID_SCHEMA)
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_jsonl_log_keeps_only_counts(tree):
+    root, schema_map = tree
+    expected = recursive_validator(root, schema_map, trace_recursion=True)
+    expected.run()
+
+    log = root / "results.jsonl"
+    stac = recursive_validator(root, schema_map, log=str(log), log_format="jsonl")
+    assert not stac.run()
+    assert read_lines(log) == expected.message
+    assert stac.message == []
+    assert stac.results.total == len(expected.message) == 9
+    assert stac.results.valid == 8
+    assert stac.results.by_type["catalog"] == {"valid": 2, "total": 3}
+
+
+def test_jsonl_log_records_errors(tree):
+    root, schema_map = tree
+    (root / "a" / "a-1.json").unlink()
+    log = root / "results.jsonl"
+    stac = recursive_validator(root, schema_map, log=str(log), log_format="jsonl")
+    assert not stac.run()
+    lines = read_lines(log)
+    assert lines[-1]["error_type"] == "FileNotFoundError"
+    assert stac.message == []
+    assert stac.results.total == len(lines)
+
+
+def test_jsonl_log_with_iter_results(tree):
+    root, schema_map = tree
+    log = root / "results.jsonl"
+    stac = recursive_validator(root, schema_map, log=str(log), log_format="jsonl")
+    results = list(stac.iter_results())
+    assert read_lines(log) == results
+
+
+def test_json_array_log_matches_json_dumps(tmp_path):
+    messages = [{"a": [1, 2]}, {"b": {"c": None}}]
+    for count in (0, 1, 2):
+        path = tmp_path / f"log-{count}.json"
+        with JsonArrayLog(str(path)) as log:
+            for message in messages[:count]:
+                log.write(message)
+        assert path.read_text() == json.dumps(messages[:count], indent=4)
+
+
+def test_summary_from_counters(capsys):
+    messages = [
+        {"asset_type": "CATALOG", "valid_stac": True},
+        {"asset_type": "ITEM", "valid_stac": True},
+        {"asset_type": "ITEM", "valid_stac": False},
+    ]
+    stac_validator.recursive_validation_summary(messages)
+    from_messages = capsys.readouterr().out
+
+    results = ResultCounter()
+    for message in messages:
+        results.add(message)
+    stac_validator.recursive_validation_summary([], results=results)
+    assert capsys.readouterr().out == from_messages
+    assert "passed: 2/3" in from_messages
+
+
+def test_unknown_log_format():
+    with pytest.raises(ValueError):
+        stac_validator.StacValidate(log_format="xml")
@@ -0,0 +1,213 @@
+"""
+Description: Test validating a sample of the items of catalogs and item collections
+
+"""
+
+import pytest
+from click.testing import CliRunner
+
+from stac_validator import stac_validator
+from stac_validator.sampling import Sampler, wilson_interval
+from tests.helpers import LOWERCASE_ID_SCHEMA, catalog, item, validator
+
+
+@pytest.fixture
+def tree(stac_tree):
+    # Items whose id starts with a digit are invalid
+    objects = {
+        "catalog.json": catalog(
+            "root",
+            [("child", "a/catalog.json")]
+            + [("item", f"item-{i}.json") for i in range(20)],
+        ),
+        "a/catalog.json": catalog("a", [("item", f"a-{i}.json") for i in range(20)]),
+    }
+    objects.update(
+        {
+            f"item-{i}.json": item(f"item-{i}" if i % 4 else f"{i}-item")
+            for i in range(20)
+        }
+    )
+    objects.update({f"a/a-{i}.json": item(f"a-{i}") for i in range(20)})
+    objects["items.json"] = {
+        "type": "FeatureCollection",
+        "features": [item(f"feature-{i}") for i in range(30)],
+    }
+    return stac_tree(objects, LOWERCASE_ID_SCHEMA, LOWERCASE_ID_SCHEMA)
+
+
+def item_paths(messages):
+    return [
+        message["path"]
+        for message in messages
+        if not message["path"].endswith("catalog.json")
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"workers": 4},
+        {"async_crawl": True},
+        {"processes": 2},
+    ],
+)
+def test_sample_is_the_same_for_every_engine(tree, kwargs):
+    root, schema_map = tree
+    options = dict(recursive=True, trace_recursion=True, sample_rate=0.5)
+    expected = validator(root / "catalog.json", schema_map, **options)
+    expected.run()
+
+    stac = validator(root / "catalog.json", schema_map, **options, **kwargs)
+    stac.run()
+    assert stac.message == expected.message
+    assert stac.sampler.dump() == expected.sampler.dump()
+
+
+def test_sample_rate(tree):
+    root, schema_map = tree
+    stac = validator(
+        root / "catalog.json",
+        schema_map,
+        recursive=True,
+        trace_recursion=True,
+        sample_rate=0.5,
+    )
+    stac.run()
+    assert stac.sampler.population == 40
+    assert 0 < stac.sampler.sampled < 40
+    assert len(item_paths(stac.message)) == stac.sampler.sampled
+    # The same seed samples the same items, another seed other items
+    again = validator(
+        root / "catalog.json",
+        schema_map,
+        recursive=True,
+        trace_recursion=True,
+        sample_rate=0.5,
+    )
+    again.run()
+    assert again.message == stac.message
+    other = validator(
+        root / "catalog.json",
+        schema_map,
+        recursive=True,
+        trace_recursion=True,
+        sample_rate=0.5,
+        sample_seed=1,
+    )
+    other.run()
+    assert item_paths(other.message) != item_paths(stac.message)
+
+
+def test_sample_per_collection(tree):
+    root, schema_map = tree
+    stac = validator(
+        root / "catalog.json",
+        schema_map,
+        recursive=True,
+        trace_recursion=True,
+        sample_per_collection=3,
+    )
+    stac.run()
+    paths = item_paths(stac.message)
+    assert len([path for path in paths if "/a/" in path]) == 3
+    assert len(paths) == 6
+    assert stac.sampler.population == 40
+
+
+def test_items_left_out_are_not_fetched(tree):
+    root, schema_map = tree
+    options = dict(recursive=True, trace_recursion=True, sample_per_collection=2)
+    stac = validator(root / "catalog.json", schema_map, **options)
+    stac.run()
+    sampled = set(item_paths(stac.message))
+    for path in list(root.glob("item-*.json")) + list(root.glob("a/a-*.json")):
+        if str(path) not in sampled:
+            path.unlink()
+
+    stac = validator(root / "catalog.json", schema_map, **options)
+    stac.run()
+    assert set(item_paths(stac.message)) == sampled
+    assert stac.sampler.validated == 4
+    assert "FileNotFoundError" not in {
+        message.get("error_type") for message in stac.message
+    }
+
+
+def test_invalid_items_are_counted(tree):
+    root, schema_map = tree
+    stac = validator(
+        root / "catalog.json",
+        schema_map,
+        recursive=True,
+        trace_recursion=True,
+        sample_rate=1,
+    )
+    assert not stac.run()
+    # Invalid items are reported and the validation goes on
+    assert stac.sampler.validated == 40
+    assert stac.sampler.failed == 5
+    assert stac.sampler.failure_rate == 5 / 40
+    errors = [message for message in stac.message if not message["valid_stac"]]
+    assert len(errors) == 5
+    assert {error["error_type"] for error in errors} == {"JSONSchemaValidationError"}
+
+
+def test_item_collection_sample(tree):
+    root, schema_map = tree
+    stac = validator(
+        root / "items.json",
+        schema_map,
+        item_collection=True,
+        sample_per_collection=4,
+    )
+    stac.validate_item_collection()
+    assert len(stac.message) == 4
+    assert stac.sampler.population == 30
+    assert stac.sampler.validated == 4
+    assert stac.sampler.failed == 0
+
+    processes = validator(
+        root / "items.json",
+        schema_map,
+        item_collection=True,
+        sample_per_collection=4,
+        processes=2,
+    )
+    processes.validate_item_collection()
+    assert processes.message == stac.message
+
+
+def test_sampling_is_not_supported_with_collections(tree):
+    root, schema_map = tree
+    with pytest.raises(ValueError):
+        validator(root / "items.json", schema_map, collections=True, sample_rate=0.5)
+
+
+def test_cli_rejects_sampling_with_collections(tree):
+    root, _ = tree
+    result = CliRunner().invoke(
+        stac_validator.main,
+        [str(root / "items.json"), "--collections", "--sample-rate", "0.5"],
+    )
+    assert result.exit_code == 2
+    assert "sampling is only supported" in result.output
+
+
+def test_sampler_options():
+    with pytest.raises(ValueError):
+        Sampler(rate=1.5)
+    with pytest.raises(ValueError):
+        Sampler(per_collection=0)
+    assert Sampler(rate=0).sample(["a", "b"], str) == []
+    assert Sampler(rate=1).sample(["a", "b"], str) == ["a", "b"]
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(0, 100)
+    assert low == 0.0
+    assert high == pytest.approx(0.037, abs=1e-3)
+    low, high = wilson_interval(10, 100)
+    assert low == pytest.approx(0.0552, abs=1e-3)
+    assert high == pytest.approx(0.1744, abs=1e-3)
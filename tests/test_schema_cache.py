@@ -0,0 +1,95 @@
+"""
+Description: Test the persistent on-disk schema cache
+
+"""
+
+import json
+
+import pytest
+import requests
+import requests_mock
+
+from stac_validator import stac_validator
+from stac_validator.schema_cache import (
+    SchemaDiskCache,
+    configure_schema_cache,
+    get_schema_cache,
+)
+
+SCHEMA_URL = "https://example.com/schemas/v1.0.0/schema.json"
+SCHEMA = {"$schema": "http://json-schema.org/draft-07/schema#", "type": "object"}
+
+
+def test_schema_cache_stores_and_serves_fresh_entries(tmp_path):
+    cache = SchemaDiskCache(cache_dir=str(tmp_path), ttl=3600)
+    with requests_mock.Mocker() as mock:
+        mock.get(SCHEMA_URL, json=SCHEMA, headers={"ETag": '"abc"'})
+        assert json.loads(cache.fetch(SCHEMA_URL)) == SCHEMA
+        assert json.loads(cache.fetch(SCHEMA_URL)) == SCHEMA
+        assert mock.call_count == 1
+
+    entry = cache.load(SCHEMA_URL)
+    assert entry.etag == '"abc"'
+
+
+def test_schema_cache_revalidates_with_conditional_get(tmp_path):
+    cache = SchemaDiskCache(cache_dir=str(tmp_path), ttl=0)
+    with requests_mock.Mocker() as mock:
+        mock.get(SCHEMA_URL, json=SCHEMA, headers={"ETag": '"abc"'})
+        cache.fetch(SCHEMA_URL)
+
+        mock.get(SCHEMA_URL, status_code=304)
+        assert json.loads(cache.fetch(SCHEMA_URL)) == SCHEMA
+        assert mock.last_request.headers["If-None-Match"] == '"abc"'
+
+
+def test_schema_cache_serves_stale_entries_offline(tmp_path):
+    cache = SchemaDiskCache(cache_dir=str(tmp_path), ttl=0)
+    with requests_mock.Mocker() as mock:
+        mock.get(SCHEMA_URL, json=SCHEMA)
+        cache.fetch(SCHEMA_URL)
+
+        mock.get(SCHEMA_URL, exc=requests.exceptions.ConnectionError)
+        assert json.loads(cache.fetch(SCHEMA_URL)) == SCHEMA
+
+
+def test_schema_cache_serves_stale_entries_on_server_errors_only(tmp_path):
+    cache = SchemaDiskCache(cache_dir=str(tmp_path), ttl=0)
+    with requests_mock.Mocker() as mock:
+        mock.get(SCHEMA_URL, json=SCHEMA)
+        cache.fetch(SCHEMA_URL)
+
+        mock.get(SCHEMA_URL, status_code=500)
+        assert json.loads(cache.fetch(SCHEMA_URL)) == SCHEMA
+        mock.get(SCHEMA_URL, status_code=404)
+        with pytest.raises(requests.exceptions.HTTPError):
+            cache.fetch(SCHEMA_URL)
+
+
+def test_schema_cache_raises_without_cached_copy(tmp_path):
+    cache = SchemaDiskCache(cache_dir=str(tmp_path))
+    with requests_mock.Mocker() as mock:
+        mock.get(SCHEMA_URL, status_code=404)
+        with pytest.raises(requests.exceptions.HTTPError):
+            cache.fetch(SCHEMA_URL)
+    assert cache.load(SCHEMA_URL) is None
+
+
+def test_schema_cache_is_skipped_when_not_writable(tmp_path):
+    # A file where the cache directory should be cannot be written to
+    (tmp_path / "cache").write_text("")
+    cache = SchemaDiskCache(cache_dir=str(tmp_path / "cache"))
+    with requests_mock.Mocker() as mock:
+        mock.get(SCHEMA_URL, json=SCHEMA)
+        assert json.loads(cache.fetch(SCHEMA_URL)) == SCHEMA
+    assert cache.load(SCHEMA_URL) is None
+
+
+def test_schema_cache_is_only_enabled_on_request(tmp_path):
+    try:
+        stac_validator.StacValidate()
+        assert get_schema_cache() is None
+        stac_validator.StacValidate(schema_cache=True, schema_cache_dir=str(tmp_path))
+        assert get_schema_cache().cache_dir == str(tmp_path)
+    finally:
+        configure_schema_cache(enabled=False)
@@ -0,0 +1,99 @@
+"""
+Description: Test the SQLite schema store shared between processes
+
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from stac_validator import stac_validator
+from stac_validator.schema_db import SqliteSchemaStore
+from stac_validator.schema_store import SchemaStore
+from stac_validator.utilities import (
+    SCHEMA_STORE,
+    cached_retrieve,
+    configure_schema_db,
+)
+
+URL = "https://example.com/schema.json"
+SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "properties": {"id": {"type": "string"}},
+}
+
+
+def store_schema(path):
+    SqliteSchemaStore(path).put(URL, json.dumps(SCHEMA).encode(), SCHEMA)
+
+
+def test_schema_db_roundtrip(tmp_path):
+    db = SqliteSchemaStore(str(tmp_path / "schemas.sqlite"))
+    raw = json.dumps(SCHEMA).encode()
+    db.put(URL, raw, SCHEMA)
+    assert db.get(URL) == (raw, SCHEMA)
+    assert len(db) == 1
+
+    # Local schemas are never shared
+    db.put("local/schema.json", raw, SCHEMA)
+    assert db.get("local/schema.json") is None
+    assert len(db) == 1
+
+
+def test_schema_db_expires_entries(tmp_path):
+    db = SqliteSchemaStore(str(tmp_path / "schemas.sqlite"), ttl=0)
+    db.put(URL, json.dumps(SCHEMA).encode(), SCHEMA)
+    assert db.get(URL) is None
+
+
+def test_schema_db_shared_between_processes(tmp_path):
+    path = str(tmp_path / "schemas.sqlite")
+    process = multiprocessing.get_context("spawn").Process(
+        target=store_schema, args=(path,)
+    )
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+    def fail(uri):
+        raise AssertionError(f"{uri} fetched again")
+
+    store = SchemaStore(loader=fail, shared=SqliteSchemaStore(path))
+    assert store.get(URL) == SCHEMA
+    assert store.info().shared_hits == 1
+
+
+def test_schema_store_writes_to_schema_db(tmp_path):
+    db = SqliteSchemaStore(str(tmp_path / "schemas.sqlite"))
+    store = SchemaStore(loader=lambda uri: json.dumps(SCHEMA).encode(), shared=db)
+    assert store.get(URL) == SCHEMA
+    assert store.info().shared_hits == 0
+    assert db.get(URL)[1] == SCHEMA
+
+
+@pytest.fixture
+def schema_db(tmp_path):
+    SCHEMA_STORE.clear()
+    yield configure_schema_db(str(tmp_path / "schemas.sqlite"))
+    configure_schema_db(enabled=False)
+    SCHEMA_STORE.clear()
+
+
+def test_configure_schema_db(schema_db):
+    schema_db.put(URL, json.dumps(SCHEMA).encode(), SCHEMA)
+    assert cached_retrieve(URL).contents == SCHEMA
+    assert SCHEMA_STORE.info().shared_hits == 1
+
+
+def test_later_validators_stop_sharing_schemas(tmp_path):
+    try:
+        stac_validator.StacValidate(
+            schema_db=str(tmp_path / "schemas.sqlite"), schema_cache=False
+        )
+        assert SCHEMA_STORE.shared is not None
+        stac_validator.StacValidate(schema_cache=False)
+        assert SCHEMA_STORE.shared is None
+    finally:
+        configure_schema_db(enabled=False)
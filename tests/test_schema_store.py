@@ -0,0 +1,167 @@
+"""
+Description: Test the size-aware schema store
+
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from stac_validator.schema_store import SchemaStore
+
+CORE_SCHEMA = "https://schemas.stacspec.org/v1.0.0/item-spec/json-schema/item.json"
+
+
+def make_store(**kwargs):
+    calls = []
+
+    def loader(schema_path):
+        calls.append(schema_path)
+        return json.dumps({"$id": schema_path}).encode("utf-8")
+
+    return SchemaStore(loader=loader, **kwargs), calls
+
+
+def test_schema_store_counts_hits_and_misses():
+    store, calls = make_store()
+    assert store.get("a.json") == {"$id": "a.json"}
+    assert store.get("a.json") == {"$id": "a.json"}
+    info = store.info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.entries == 1
+    assert info.bytes == len(json.dumps({"$id": "a.json"}))
+    assert calls == ["a.json"]
+
+
+def test_schema_store_evicts_by_entries():
+    store, calls = make_store(max_entries=2)
+    for schema_path in ("a.json", "b.json", "c.json"):
+        store.get(schema_path)
+    assert "a.json" not in store
+    assert store.info().evictions == 1
+
+    store.get("a.json")
+    assert calls == ["a.json", "b.json", "c.json", "a.json"]
+
+
+def test_schema_store_evicts_by_bytes():
+    store, _ = make_store(max_bytes=20)
+    store.get("a.json")
+    store.get("b.json")
+    info = store.info()
+    assert info.entries == 1
+    assert info.bytes <= 20
+
+
+def test_schema_store_pins_core_schemas():
+    store, _ = make_store(max_entries=1)
+    store.get(CORE_SCHEMA)
+    store.get("a.json")
+    store.get("b.json")
+    assert CORE_SCHEMA in store
+    assert store.info().pinned == 1
+
+
+def test_schema_store_resize():
+    store, _ = make_store()
+    for schema_path in ("a.json", "b.json", "c.json"):
+        store.get(schema_path)
+    store.pin("a.json")
+    store.resize(max_entries=1)
+    assert "a.json" in store
+    assert "c.json" not in store
+
+
+def test_schema_store_caches_failures():
+    calls = []
+
+    def loader(schema_path):
+        calls.append(schema_path)
+        raise FileNotFoundError(schema_path)
+
+    store = SchemaStore(loader=loader)
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            store.get("missing.json")
+    assert calls == ["missing.json"]
+    info = store.info()
+    assert info.failure_hits == 2
+    assert info.failures == 1
+
+    # Once the failure expires, the schema is requested again
+    store.resize(failure_ttl=0)
+    store.clear()
+    with pytest.raises(FileNotFoundError):
+        store.get("missing.json")
+    with pytest.raises(FileNotFoundError):
+        store.get("missing.json")
+    assert len(calls) == 3
+
+
+def test_schema_store_single_flight():
+    calls = []
+    release = threading.Event()
+
+    def loader(schema_path):
+        calls.append(schema_path)
+        release.wait(5)
+        return b'{"type": "object"}'
+
+    store = SchemaStore(loader=loader)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.get("a.json")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while store.info().coalesced < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["a.json"]
+    assert results == [{"type": "object"}] * 4
+    assert store.info().misses == 1
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def test_schema_store_single_flight_interrupted():
+    release = threading.Event()
+
+    def loader(schema_path):
+        release.wait(5)
+        raise Interrupted()
+
+    store = SchemaStore(loader=loader)
+    errors = []
+
+    def get():
+        try:
+            store.get("a.json")
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=get, daemon=True) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while store.info().coalesced < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(errors) == 2 and all(isinstance(e, Interrupted) for e in errors)
+    # Interruptions are not remembered as failures of the schema
+    store.loader = lambda schema_path: b"{}"
+    assert store.get("a.json") == {}
@@ -0,0 +1,65 @@
+"""
+Description: Test the registry shared between core and extension validation
+
+"""
+
+import json
+
+import jsonschema
+import pytest
+
+from stac_validator.utilities import (
+    build_validator,
+    clear_shared_registries,
+    get_shared_registry,
+)
+
+DRAFT_07 = "http://json-schema.org/draft-07/schema#"
+
+
+@pytest.fixture
+def schemas(tmp_path):
+    common_ref = f"{tmp_path / 'common.json'}#/definitions/id"
+    common = {"$schema": DRAFT_07, "definitions": {"id": {"type": "string"}}}
+    extension_a = {
+        "$schema": DRAFT_07,
+        "properties": {"a": {"$ref": common_ref}},
+    }
+    extension_b = {
+        "$schema": DRAFT_07,
+        "properties": {"b": {"$ref": common_ref}},
+    }
+    for name, schema in (
+        ("common.json", common),
+        ("a.json", extension_a),
+        ("b.json", extension_b),
+    ):
+        (tmp_path / name).write_text(json.dumps(schema))
+    clear_shared_registries()
+    yield tmp_path
+    clear_shared_registries()
+
+
+def test_shared_registry_retrieves_each_ref_once(schemas):
+    validator_a = build_validator(str(schemas / "a.json"))
+    validator_b = build_validator(str(schemas / "b.json"))
+    validator_a.validate({"a": "x"})
+    validator_b.validate({"b": "y"})
+
+    # a.json, b.json and common.json, with common.json wrapped only once
+    assert get_shared_registry().retrievals == 3
+
+
+def test_shared_registry_reports_errors(schemas):
+    validator_a = build_validator(str(schemas / "a.json"))
+    validator_b = build_validator(str(schemas / "b.json"))
+    validator_a.validate({"a": "x"})
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validator_b.validate({"b": 1})
+
+
+def test_shared_registry_per_schema_map(schemas):
+    mapped = get_shared_registry(
+        {"https://example.com/a.json": str(schemas / "a.json")}
+    )
+    assert mapped is not get_shared_registry()
@@ -0,0 +1,136 @@
+"""
+Description: Test the validation plans shared by objects with the same extensions
+
+"""
+
+import pytest
+
+from stac_validator import stac_validator
+from stac_validator.schema_store import DEFAULT_MAX_ENTRIES
+from stac_validator.utilities import SCHEMA_STORE, VALIDATOR_CACHE
+from stac_validator.validation_plan import (
+    PLAN_CACHE,
+    ValidationPlan,
+    ValidationPlanCache,
+)
+from tests import helpers
+from tests.helpers import ITEM_SCHEMA
+
+EXTENSION_A = "https://example.com/extensions/a/v1.0.0/schema.json"
+EXTENSION_B = "https://example.com/extensions/b/v1.0.0/schema.json"
+
+
+def item(id, extensions, **properties):
+    return dict(helpers.item(id), stac_extensions=extensions, properties=properties)
+
+
+@pytest.fixture
+def schemas(tmp_path):
+    schema_map = {}
+    for url, required in (
+        (ITEM_SCHEMA, "id"),
+        (EXTENSION_A, "a"),
+        (EXTENSION_B, "b"),
+    ):
+        path = tmp_path / f"{url.split('/')[-3]}.schema"
+        schema = dict(helpers.ANY_SCHEMA)
+        if required == "id":
+            schema["required"] = ["id"]
+        else:
+            schema["properties"] = {"properties": {"required": [required]}}
+        helpers.write_json(path, schema)
+        schema_map[url] = str(path)
+    PLAN_CACHE.clear()
+    yield tmp_path, schema_map
+    PLAN_CACHE.clear()
+
+
+def validate(content, schema_map, **kwargs):
+    stac = stac_validator.StacValidate(
+        schema_map=schema_map, schema_cache=False, **kwargs
+    )
+    stac.validate_dict(content)
+    return stac.message[0]
+
+
+def test_items_with_the_same_extensions_share_a_plan(schemas):
+    _, schema_map = schemas
+    for i in range(5):
+        message = validate(item(f"item-{i}", [EXTENSION_A], a=i), schema_map)
+        assert message["valid_stac"]
+        assert schema_map[EXTENSION_A] in message["schema"]
+    assert PLAN_CACHE.misses == 1
+    assert PLAN_CACHE.hits >= 4
+
+    message = validate(item("other", [EXTENSION_A, EXTENSION_B], a=1, b=2), schema_map)
+    assert message["valid_stac"]
+    assert PLAN_CACHE.misses == 2
+
+
+def test_plan_reports_the_failing_extension(schemas):
+    _, schema_map = schemas
+    assert validate(item("valid", [EXTENSION_A, EXTENSION_B], a=1, b=2), schema_map)[
+        "valid_stac"
+    ]
+    message = validate(item("invalid", [EXTENSION_A, EXTENSION_B], a=1), schema_map)
+    assert not message["valid_stac"]
+    assert message["failed_schema"] == schema_map[EXTENSION_B]
+
+
+def test_plan_maps_legacy_extension_names(schemas):
+    _, schema_map = schemas
+    plan = PLAN_CACHE.get("1.0.0", "item", ["proj", "eo"])
+    assert plan.extensions == ("projection", "eo")
+    assert plan.extension_schema(0) == (
+        "https://cdn.staclint.com/v1.0.0/extension/projection.json"
+    )
+    assert PLAN_CACHE.get("1.0.0", "ITEM", ("projection", "eo")) is plan
+
+    legacy = PLAN_CACHE.get("1.0.0-beta.2", "item", ["eo"])
+    assert legacy.extension_schema(0) == (
+        "https://cdn.staclint.com/v1.0.0-beta.1/extension/eo.json"
+    )
+
+
+def test_plan_keeps_local_extensions_relative_to_each_object(schemas):
+    root, schema_map = schemas
+    for name in ("a", "b"):
+        helpers.write_json(
+            root / name / "local.json",
+            {"properties": {"properties": {"required": [name]}}},
+        )
+        helpers.write_json(root / name / "item.json", item(name, ["local.json"], a=1))
+    assert helpers.validator(root / "a" / "item.json", schema_map).run()
+    assert not helpers.validator(root / "b" / "item.json", schema_map).run()
+
+
+def test_plans_are_dropped_with_the_validators(schemas):
+    _, schema_map = schemas
+    cache = ValidationPlanCache()
+    plan = cache.get("1.0.0", "item", [EXTENSION_A], schema_map=schema_map)
+    assert cache.get("1.0.0", "item", [EXTENSION_A], schema_map=schema_map) is plan
+    VALIDATOR_CACHE.clear()
+    assert cache.get("1.0.0", "item", [EXTENSION_A], schema_map=schema_map) is not plan
+
+
+def test_malformed_extensions_are_not_cached(schemas):
+    cache = ValidationPlanCache()
+    cache.get("1.0.0", "item", [{"not": "a string"}])
+    cache.get("1.0.0", "item", 42)
+    assert cache.misses == 1
+    assert cache.hits == 0
+
+
+def test_plan_pins_the_mapped_core_schema(schemas):
+    _, schema_map = schemas
+    SCHEMA_STORE.clear()
+    VALIDATOR_CACHE.clear()
+    ValidationPlan("1.0.0", "item", schema_map=schema_map).core_validator()
+    pinned = schema_map[ITEM_SCHEMA]
+    assert pinned in SCHEMA_STORE
+    SCHEMA_STORE.resize(max_entries=0)
+    try:
+        assert pinned in SCHEMA_STORE
+    finally:
+        SCHEMA_STORE.resize(max_entries=DEFAULT_MAX_ENTRIES)
+        SCHEMA_STORE.clear()
@@ -0,0 +1,50 @@
+"""
+Description: Test the compiled validator cache
+
+"""
+
+from stac_validator import stac_validator
+from stac_validator.utilities import VALIDATOR_CACHE, ValidatorCache
+
+SCHEMA = "tests/test_data/schema/v1.0.0/projection.json"
+
+
+def test_validator_cache_reuses_validator():
+    cache = ValidatorCache(maxsize=4)
+    first = cache.get(SCHEMA)
+    second = cache.get(SCHEMA)
+    assert first is second
+    info = cache.info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+def test_validator_cache_keyed_by_schema_map():
+    cache = ValidatorCache(maxsize=4)
+    plain = cache.get(SCHEMA)
+    mapped = cache.get(SCHEMA, schema_map={"https://example.com/a.json": SCHEMA})
+    assert plain is not mapped
+    assert cache.info().misses == 2
+
+
+def test_validator_cache_evicts_least_recently_used():
+    cache = ValidatorCache(maxsize=1)
+    cache.get(SCHEMA)
+    cache.get(SCHEMA, schema_map={"https://example.com/a.json": SCHEMA})
+    info = cache.info()
+    assert info.evictions == 1
+    assert info.currsize == 1
+
+
+def test_validator_cache_shared_across_items():
+    VALIDATOR_CACHE.clear()
+    for _ in range(3):
+        stac = stac_validator.StacValidate(
+            "tests/test_data/v100/extended-item-no-extensions.json", custom=SCHEMA
+        )
+        stac.run()
+        assert stac.valid
+    info = VALIDATOR_CACHE.info()
+    assert info.misses == 1
+    assert info.hits == 2
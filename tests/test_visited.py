@@ -0,0 +1,112 @@
+"""
+Description: Test the deduplication of links visited by recursive validation
+
+"""
+
+import os
+
+import pytest
+
+from stac_validator.visited import FingerprintSet, VisitedLinks, normalize_href
+from tests.helpers import catalog, item, recursive_validator
+
+
+@pytest.fixture
+def tree(stac_tree):
+    return stac_tree(
+        {
+            "catalog.json": catalog(
+                "root",
+                [
+                    ("child", "a/catalog.json"),
+                    ("child", "b/catalog.json"),
+                    ("item", "shared.json"),
+                ],
+            ),
+            # Links back to the root, and to an item already linked from the root
+            "a/catalog.json": catalog(
+                "a",
+                [
+                    ("child", "../catalog.json"),
+                    ("item", "../shared.json"),
+                    ("item", "a-item.json"),
+                ],
+            ),
+            # Links to its sibling through a different spelling of its path
+            "b/catalog.json": catalog(
+                "b",
+                [("child", "./../a/./catalog.json"), ("item", "b-item.json")],
+            ),
+            "shared.json": item("shared"),
+            "a/a-item.json": item("a-item"),
+            "b/b-item.json": item("b-item"),
+        }
+    )
+
+
+def run(root, schema_map, **kwargs):
+    stac = recursive_validator(root, schema_map, trace_recursion=True, **kwargs)
+    valid = stac.run()
+    return valid, stac.message, stac.visited
+
+
+def test_normalize_href():
+    assert (
+        normalize_href("HTTPS://Example.COM:443/a/./b/../c.json#frag")
+        == "https://example.com/a/c.json"
+    )
+    assert normalize_href("http://example.com:8080/a/") == (
+        "http://example.com:8080/a/"
+    )
+    assert normalize_href("http://example.com") == "http://example.com/"
+    assert normalize_href("a/../b.json") == os.path.abspath("b.json")
+
+
+def test_fingerprint_set_grows():
+    fingerprints = FingerprintSet(capacity=4)
+    assert all(fingerprints.add(value) for value in range(1, 1001))
+    assert not fingerprints.add(500)
+    assert len(fingerprints) == 1000
+    assert 1000 in fingerprints
+    assert 1001 not in fingerprints
+
+
+def test_visited_links_counts_cycles():
+    visited = VisitedLinks()
+    assert visited.visit("http://example.com/catalog.json")
+    with visited.within("http://example.com/catalog.json"):
+        assert visited.visit("http://example.com/a/catalog.json")
+        with visited.within("http://example.com/a/catalog.json"):
+            assert not visited.visit("http://EXAMPLE.com/a/../catalog.json")
+    assert not visited.visit("http://example.com/a/catalog.json")
+    assert (visited.duplicates, visited.cycles) == (2, 1)
+    assert len(visited) == 2
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"workers": 4}, {"async_crawl": True}])
+def test_recursion_skips_duplicate_links(tree, kwargs):
+    root, schema_map = tree
+    valid, message, visited = run(root, schema_map, **kwargs)
+    assert valid
+    paths = [entry["path"] for entry in message]
+    # Every object is validated once, in depth-first order
+    assert paths == [
+        str(root / "catalog.json"),
+        str(root / "a" / "catalog.json"),
+        str(root / "a" / "../shared.json"),
+        str(root / "a" / "a-item.json"),
+        str(root / "b" / "catalog.json"),
+        str(root / "b" / "b-item.json"),
+    ]
+    assert (visited.duplicates, visited.cycles) == (3, 1)
+
+
+def test_parallel_recursion_skips_duplicates_like_serial(tree):
+    root, schema_map = tree
+    serial = run(root, schema_map)
+    parallel = run(root, schema_map, workers=4)
+    assert parallel[:2] == serial[:2]
+    assert (parallel[2].duplicates, parallel[2].cycles) == (
+        serial[2].duplicates,
+        serial[2].cycles,
+    )